@@ -5,8 +5,11 @@ Provides grid-based scheduling interface with intelligent buffering and presence
 """
 from __future__ import annotations
 
+import inspect
+import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 import voluptuous as vol
 
@@ -27,12 +30,24 @@ from .const import (
     REQUIRED_DOMAINS,
     OPTIONAL_DOMAINS,
     MODE_HOME,
-    MODE_AWAY
+    MODE_AWAY,
+    CONF_MAX_CONCURRENT_APPLIES,
+    CONF_SAVE_DELAY_SECONDS,
+    CONF_STORAGE_FORMAT,
+    CONF_JOURNAL_ENABLED,
+    CONF_STORAGE_SHARDED,
+    DEFAULT_MAX_CONCURRENT_APPLIES,
+    DEFAULT_SAVE_DELAY_SECONDS,
+    DEFAULT_STORAGE_FORMAT,
+    DEFAULT_JOURNAL_ENABLED,
+    DEFAULT_STORAGE_SHARDED,
+    UPGRADE_MANAGER_KEY
 )
 from .schedule_manager import ScheduleManager
 from .storage import StorageService
 from .version import VersionInfo, validate_manifest_version
 from .migration import UninstallManager
+from .upgrade_manager import UpgradeManager
 from .logging_config import LoggingManager
 
 _LOGGER = logging.getLogger(__name__)
@@ -80,6 +95,18 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     if not _validate_dependencies(hass):
         return False
     
+    # Load and migrate every entry's store concurrently in the background;
+    # each entry's setup waits only for its own store to become ready
+    try:
+        upgrade_manager = UpgradeManager(hass)
+        upgrade_manager.async_schedule_upgrades(
+            entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)
+        )
+        hass.data[UPGRADE_MANAGER_KEY] = upgrade_manager
+    except Exception as e:
+        # Not fatal: each entry's storage still migrates when first loaded
+        _LOGGER.warning("Failed to start startup upgrades, entries will migrate on load: %s", e)
+    
     return True
 
 
@@ -331,7 +358,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Initialize storage service with enhanced error handling and fallbacks
         storage_service = None
         try:
-            storage_service = StorageService(hass, entry.entry_id)
+            storage_service = StorageService(
+                hass, entry.entry_id,
+                save_delay=entry.options.get(CONF_SAVE_DELAY_SECONDS, DEFAULT_SAVE_DELAY_SECONDS),
+                storage_format=entry.options.get(CONF_STORAGE_FORMAT, DEFAULT_STORAGE_FORMAT),
+                journal=entry.options.get(CONF_JOURNAL_ENABLED, DEFAULT_JOURNAL_ENABLED),
+                sharded=entry.options.get(CONF_STORAGE_SHARDED, DEFAULT_STORAGE_SHARDED)
+            )
             setup_diagnostics["components_initialized"].append("storage_service")
             _LOGGER.debug("Storage service initialized successfully")
         except Exception as e:
@@ -409,7 +442,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Initialize schedule manager with error handling
         schedule_manager = None
         try:
-            schedule_manager = ScheduleManager(hass, storage_service, presence_manager, buffer_manager)
+            schedule_manager = ScheduleManager(
+                hass, storage_service, presence_manager, buffer_manager,
+                max_concurrent_applies=entry.options.get(
+                    CONF_MAX_CONCURRENT_APPLIES, DEFAULT_MAX_CONCURRENT_APPLIES
+                )
+            )
             setup_diagnostics["components_initialized"].append("schedule_manager")
             _LOGGER.debug("Schedule manager initialized successfully")
         except Exception as e:
@@ -487,6 +525,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             ])
             # Continue setup even if dashboard service fails - not critical for core functionality
 
+        # Wait for the startup upgrade of this entry's store, if one is running
+        upgrade_manager = hass.data.get(UPGRADE_MANAGER_KEY)
+        if isinstance(upgrade_manager, UpgradeManager):
+            upgrade_result = await upgrade_manager.async_wait_ready(entry.entry_id)
+            if upgrade_result is not None and upgrade_result["errors"]:
+                _LOGGER.warning("Startup upgrade of entry %s reported errors: %s",
+                               entry.entry_id, upgrade_result["errors"])
+                setup_diagnostics["warnings"].append(
+                    f"Startup upgrade reported errors: {'; '.join(upgrade_result['errors'])}"
+                )
+        
         # Load existing schedules with error handling
         try:
             await storage_service.load_schedules()
@@ -607,6 +656,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             setup_diagnostics["warnings"].append("WebSocket handlers failed - real-time updates unavailable")
             # WebSocket failures are not critical - continue without real-time updates
         
+        # Arm the slot boundary timer so schedules apply automatically
+        try:
+            await schedule_manager.async_start_boundary_timer()
+            setup_diagnostics["components_initialized"].append("boundary_timer")
+            _LOGGER.info("Started slot boundary timer for entry %s", entry.entry_id)
+        except Exception as e:
+            _LOGGER.warning("Failed to start slot boundary timer for entry %s: %s", entry.entry_id, e)
+            setup_diagnostics["components_failed"].append({"component": "boundary_timer", "error": str(e)})
+            setup_diagnostics["warnings"].append("Slot boundary timer failed - schedules will only apply on demand")
+        
         # Final setup validation with comprehensive checks including dashboard integration
         try:
             validation_results = await _validate_setup(hass, entry, dashboard_integration_status)
@@ -763,7 +822,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Clean up data
     if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        
+        # Stop the slot boundary timer
+        schedule_manager = entry_data.get("schedule_manager")
+        if schedule_manager:
+            schedule_manager.cancel_boundary_timer()
+        
+        # Write any pending schedule changes before the entry goes away
+        storage_service = entry_data.get("storage_service")
+        if storage_service:
+            try:
+                await storage_service.flush()
+            except Exception as e:
+                _LOGGER.error("Failed to flush schedule data for entry %s: %s", entry.entry_id, e)
     
     return True
 
@@ -844,6 +916,27 @@ async def _register_services(hass: HomeAssistant, schedule_manager: ScheduleMana
                 SERVICE_APPLY_SLOT, SERVICE_APPLY_GRID_NOW, SERVICE_MIGRATE_RESOLUTION)
 
 
+@lru_cache(maxsize=None)
+def _result_message_takes_bytes() -> bool:
+    """Return whether construct_result_message declares a bytes payload."""
+    construct = websocket_api.messages.construct_result_message
+    payload_param = list(inspect.signature(construct).parameters.values())[1]
+    return payload_param.annotation in (bytes, "bytes")
+
+
+def _construct_raw_result_message(iden: int, payload: str) -> str | bytes:
+    """
+    Wrap an already-serialized JSON payload in a websocket result message.
+    
+    construct_result_message takes a str payload in older Home Assistant
+    releases and bytes in newer ones; pass the type the installed one declares.
+    """
+    construct = websocket_api.messages.construct_result_message
+    if _result_message_takes_bytes():
+        return construct(iden, payload.encode())
+    return construct(iden, payload)
+
+
 def _register_websocket_handlers(hass: HomeAssistant) -> None:
     """Register WebSocket API handlers for real-time communication."""
     
@@ -868,21 +961,23 @@ def _register_websocket_handlers(hass: HomeAssistant) -> None:
                 connection.send_error(msg["id"], "no_schedule_manager", "No schedule manager found")
                 return
             
-            # Get schedule grid for both modes
-            home_grid = await schedule_manager.get_schedule_grid(entity_id, "home")
-            away_grid = await schedule_manager.get_schedule_grid(entity_id, "away")
+            # Get pre-serialized schedule grids for both modes
+            home_grid = await schedule_manager.get_schedule_grid_json(entity_id, "home")
+            away_grid = await schedule_manager.get_schedule_grid_json(entity_id, "away")
             
             # Get current presence mode
             current_mode = await schedule_manager.presence_manager.get_current_mode()
             
-            connection.send_result(msg["id"], {
-                "schedules": {
-                    "home": home_grid,
-                    "away": away_grid
-                },
-                "current_mode": current_mode,
-                "entity_id": entity_id
-            })
+            payload = "".join((
+                '{"schedules":{"home":', home_grid,
+                ',"away":', away_grid,
+                '},"current_mode":', json.dumps(current_mode),
+                ',"entity_id":', json.dumps(entity_id),
+                "}"
+            ))
+            connection.send_message(
+                _construct_raw_result_message(msg["id"], payload)
+            )
             
         except Exception as e:
             _LOGGER.error("Error handling get_schedule_grid: %s", e)
@@ -944,41 +1039,25 @@ def _register_websocket_handlers(hass: HomeAssistant) -> None:
                     })
                     return
             
-            # Apply each change
-            successful_changes = []
-            failed_changes = []
-            
-            for change in changes:
-                try:
-                    success = await schedule_manager.update_slot(
-                        entity_id=entity_id,
-                        mode=mode,
-                        day=change["day"],
-                        time=change["time"],
-                        target={"temperature": change["value"]}
-                    )
-                    if success:
-                        successful_changes.append(change)
-                    else:
-                        failed_changes.append(change)
-                except Exception as e:
-                    _LOGGER.error("Failed to apply change %s: %s", change, e)
-                    failed_changes.append(change)
-            
-            # Broadcast the update to all connected clients (excluding the sender)
-            hass.bus.async_fire(f"{DOMAIN}_schedule_updated", {
-                "entity_id": entity_id,
-                "mode": mode,
-                "changes": successful_changes,
-                "update_id": update_id,
-                "timestamp": datetime.now().isoformat(),
-                "sender_connection_id": connection.id if hasattr(connection, 'id') else None
-            })
+            # Apply all changes as one transaction; the manager fires a single
+            # schedule_updated event that other clients use to refresh
+            result = await schedule_manager.update_slots(
+                entity_id,
+                mode,
+                changes,
+                event_data={
+                    "update_id": update_id,
+                    "timestamp": datetime.now().isoformat(),
+                    "sender_connection_id": connection.id if hasattr(connection, 'id') else None
+                }
+            )
             
             connection.send_result(msg["id"], {
-                "success": len(failed_changes) == 0,
-                "successful_changes": successful_changes,
-                "failed_changes": failed_changes,
+                "success": result["success"],
+                "successful_changes": result["applied"],
+                "failed_changes": [] if result["success"] else changes,
+                "errors": result["errors"],
+                "revision": result["revision"],
                 "update_id": update_id
             })
             
@@ -1035,10 +1114,58 @@ def _register_websocket_handlers(hass: HomeAssistant) -> None:
         
         connection.send_result(msg["id"], {"subscribed": True})
     
+    @websocket_api.websocket_command({
+        vol.Required("type"): "roost_scheduler/get_change_history",
+    })
+    @websocket_api.async_response
+    async def handle_get_change_history(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+        """Handle get_change_history WebSocket command."""
+        try:
+            storage_service = None
+            for entry_id, data in hass.data.get(DOMAIN, {}).items():
+                if isinstance(data, dict) and "storage_service" in data:
+                    storage_service = data["storage_service"]
+                    break
+            
+            if not storage_service:
+                connection.send_error(msg["id"], "no_storage_service", "No storage service found")
+                return
+            
+            connection.send_result(msg["id"], {"changes": storage_service.get_change_history()})
+            
+        except Exception as e:
+            _LOGGER.error("Error handling get_change_history: %s", e)
+            connection.send_error(msg["id"], "get_change_history_error", str(e))
+    
+    @websocket_api.websocket_command({
+        vol.Required("type"): "roost_scheduler/undo_change",
+    })
+    @websocket_api.async_response
+    async def handle_undo_change(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict) -> None:
+        """Handle undo_change WebSocket command."""
+        try:
+            schedule_manager = None
+            for entry_id, data in hass.data.get(DOMAIN, {}).items():
+                if isinstance(data, dict) and "schedule_manager" in data:
+                    schedule_manager = data["schedule_manager"]
+                    break
+            
+            if not schedule_manager:
+                connection.send_error(msg["id"], "no_schedule_manager", "No schedule manager found")
+                return
+            
+            connection.send_result(msg["id"], await schedule_manager.undo_last_change())
+            
+        except Exception as e:
+            _LOGGER.error("Error handling undo_change: %s", e)
+            connection.send_error(msg["id"], "undo_change_error", str(e))
+    
     # Register all handlers
     hass.components.websocket_api.async_register_command(handle_get_schedule_grid)
     hass.components.websocket_api.async_register_command(handle_update_schedule)
     hass.components.websocket_api.async_register_command(handle_subscribe_updates)
+    hass.components.websocket_api.async_register_command(handle_get_change_history)
+    hass.components.websocket_api.async_register_command(handle_undo_change)
     
     _LOGGER.info("Registered Roost Scheduler WebSocket handlers")
 
@@ -1405,6 +1532,13 @@ async def _cleanup_entry_data(hass: HomeAssistant, entry: ConfigEntry) -> None:
                 except Exception as e:
                     _LOGGER.debug("Error cleaning up logging manager: %s", e)
             
+            # Stop the slot boundary timer
+            if "schedule_manager" in entry_data:
+                try:
+                    entry_data["schedule_manager"].cancel_boundary_timer()
+                except Exception as e:
+                    _LOGGER.debug("Error stopping boundary timer: %s", e)
+            
             # Remove entry data
             hass.data[DOMAIN].pop(entry.entry_id, None)
             
@@ -7,9 +7,17 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 
 from .models import BufferConfig, EntityState, GlobalBufferConfig
-from .const import DEFAULT_BUFFER_TIME_MINUTES, DEFAULT_BUFFER_VALUE_DELTA
+from .const import (
+    COMMANDED_SAVE_DELAY_SECONDS,
+    COMMANDED_STORAGE_SUFFIX,
+    DEFAULT_BUFFER_TIME_MINUTES,
+    DEFAULT_BUFFER_VALUE_DELTA,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,6 +50,15 @@ class BufferManager:
             enabled=True,
             apply_to="climate"
         )
+        # Last value commanded and acknowledged per entity, used to skip redundant writes
+        self._last_commanded: Dict[str, Dict[str, Any]] = {}
+        self._redundant_writes_skipped = 0
+        # Persisted per config entry so the records survive a restart
+        entry_id = getattr(storage_service, "entry_id", None)
+        self._commanded_store: Optional[Store] = (
+            Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{entry_id}{COMMANDED_STORAGE_SUFFIX}")
+            if isinstance(entry_id, str) else None
+        )
     
     def should_suppress_change(self, entity_id: str, target_value: float, 
                               slot_config: Dict[str, Any], force_apply: bool = False) -> bool:
@@ -70,6 +87,13 @@ class BufferManager:
                 _LOGGER.debug("Force apply enabled for %s, bypassing all buffer logic", entity_id)
             return False
         
+        # Skip writes that would not change anything on the device
+        if self.is_redundant_write(entity_id, target_value):
+            self._redundant_writes_skipped += 1
+            if DEBUG_BUFFER_LOGIC:
+                _LOGGER.debug("Skipping redundant write for %s: %.1f already commanded", entity_id, target_value)
+            return True
+        
         entity_state = self._entity_states.get(entity_id)
         if not entity_state:
             # No state tracked yet, don't suppress (Requirement 2.3)
@@ -140,6 +164,10 @@ class BufferManager:
             
         now = datetime.now()
         
+        # The device no longer holds what we last commanded
+        if self._last_commanded.pop(entity_id, None) is not None:
+            self._schedule_commanded_save()
+        
         if entity_id in self._entity_states:
             entity_state = self._entity_states[entity_id]
             old_value = entity_state.current_value
@@ -179,6 +207,9 @@ class BufferManager:
             
         now = datetime.now()
         
+        self._last_commanded[entity_id] = {"value": value, "timestamp": now}
+        self._schedule_commanded_save()
+        
         if entity_id in self._entity_states:
             entity_state = self._entity_states[entity_id]
             old_value = entity_state.current_value
@@ -205,6 +236,57 @@ class BufferManager:
                 entity_id, value, now.strftime("%H:%M:%S")
             )
     
+    def is_redundant_write(self, entity_id: str, target_value: float) -> bool:
+        """
+        Check whether writing a value would resend what was last commanded.
+        
+        A write is redundant when the last acknowledged command for the entity
+        had the same value, no manual change has been seen since and the entity
+        reports that value. A device still showing anything else, for example
+        a valve that never applied the command, gets the write again.
+        """
+        record = self._last_commanded.get(entity_id)
+        entity_state = self._entity_states.get(entity_id)
+        if not record or not entity_state:
+            return False
+        
+        return record["value"] == target_value and entity_state.current_value == target_value
+    
+    def get_last_commanded_value(self, entity_id: str) -> float | None:
+        """Get the last value commanded and acknowledged for an entity."""
+        record = self._last_commanded.get(entity_id)
+        return record["value"] if record else None
+    
+    async def load_last_commanded(self) -> None:
+        """Restore the last commanded values persisted before a restart."""
+        if self._commanded_store is None:
+            return
+        
+        try:
+            stored = await self._commanded_store.async_load() or {}
+            for entity_id, record in stored.items():
+                self._last_commanded.setdefault(entity_id, {
+                    "value": float(record["value"]),
+                    "timestamp": datetime.fromisoformat(record["timestamp"])
+                })
+        except Exception as e:
+            _LOGGER.warning("Failed to load last commanded values, they will be rewritten: %s", e)
+            return
+        
+        _LOGGER.debug("Restored last commanded values for %d entities", len(self._last_commanded))
+    
+    def _schedule_commanded_save(self) -> None:
+        """Persist the last commanded values after a short delay."""
+        if self._commanded_store is not None:
+            self._commanded_store.async_delay_save(self._commanded_data, COMMANDED_SAVE_DELAY_SECONDS)
+    
+    def _commanded_data(self) -> Dict[str, Any]:
+        """Return the last commanded values in their stored form."""
+        return {
+            entity_id: {"value": record["value"], "timestamp": record["timestamp"].isoformat()}
+            for entity_id, record in self._last_commanded.items()
+        }
+    
     def get_buffer_config(self, slot_config: Dict[str, Any], entity_id: str = None) -> BufferConfig:
         """
         Get the effective buffer configuration for a slot.
@@ -400,6 +482,8 @@ class BufferManager:
             await self._initialize_default_configuration()
             return
         
+        await self.load_last_commanded()
+        
         try:
             await self._detect_and_migrate_configuration()
             duration = time.time() - start_time
@@ -429,6 +513,7 @@ class BufferManager:
             return
         
         try:
+            # The storage service hands out its shared in-memory copy; patch it and persist once
             load_start = time.time()
             schedule_data = await self.storage_service.load_schedules()
             load_duration = time.time() - load_start
@@ -544,7 +629,8 @@ class BufferManager:
                 "storage_available": self.storage_service is not None,
                 "entities_tracked": len(self._entity_states),
                 "global_buffer_enabled": self._global_buffer_config.enabled,
-                "entity_overrides_count": len(self._global_buffer_config.entity_overrides)
+                "entity_overrides_count": len(self._global_buffer_config.entity_overrides),
+                "redundant_writes_skipped": self._redundant_writes_skipped
             },
             "configuration": self.get_configuration_summary(),
             "entity_states": {},
@@ -565,6 +651,7 @@ class BufferManager:
                 "last_manual_change": entity_state.last_manual_change.isoformat() if entity_state.last_manual_change else None,
                 "last_scheduled_change": entity_state.last_scheduled_change.isoformat() if entity_state.last_scheduled_change else None,
                 "buffer_config": entity_state.buffer_config.to_dict() if entity_state.buffer_config else None,
+                "last_commanded_value": self.get_last_commanded_value(entity_id),
                 "ha_state": ha_state.state if ha_state else "not_found",
                 "ha_domain": ha_state.domain if ha_state else None,
                 "ha_last_updated": ha_state.last_updated.isoformat() if ha_state and ha_state.last_updated else None
@@ -75,6 +75,10 @@ class ConfigFlowRegistrationFixer:
         current_file = Path(__file__)
         return current_file.parent
 
+    def _get_backup_root(self) -> Path:
+        """Get the directory registration fix backups are written under."""
+        return self._integration_path
+
     async def diagnose_registration_issues(self) -> List[RegistrationIssue]:
         """Identify specific config flow registration problems.
         
@@ -703,7 +707,7 @@ class ConfigFlowRegistrationFixer:
         from datetime import datetime
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_dir = self._integration_path / f"backup_registration_fix_{timestamp}"
+        backup_dir = self._get_backup_root() / f"backup_registration_fix_{timestamp}"
         backup_dir.mkdir(exist_ok=True)
         
         files_to_backup = [
@@ -29,10 +29,74 @@ DEFAULT_BUFFER_TIME_MINUTES = 15
 DEFAULT_BUFFER_VALUE_DELTA = 2.0
 DEFAULT_PRESENCE_TIMEOUT_SECONDS = 600
 DEFAULT_PRESENCE_RULE = "anyone_home"
+DEFAULT_MAX_CONCURRENT_APPLIES = 5
+DEFAULT_SAVE_DELAY_SECONDS = 10
+SAVE_RETRY_DELAY_SECONDS = 30
+DEFAULT_STORAGE_FORMAT = "legacy"
+DEFAULT_JOURNAL_ENABLED = False
+DEFAULT_STORAGE_SHARDED = False
+
+# Config entry option keys
+CONF_MAX_CONCURRENT_APPLIES = "max_concurrent_applies"
+CONF_SAVE_DELAY_SECONDS = "save_delay_seconds"
+CONF_STORAGE_FORMAT = "storage_format"
+CONF_JOURNAL_ENABLED = "journal_enabled"
+CONF_STORAGE_SHARDED = "storage_sharded"
 
 # Storage keys
 STORAGE_KEY = "roost_scheduler"
 STORAGE_VERSION = 1
+STORAGE_CHECKSUM_KEY = "content_checksum"
+
+# hass.data key for the UpgradeManager that migrates every entry at startup
+UPGRADE_MANAGER_KEY = f"{DOMAIN}_upgrade_manager"
+
+# Storage layouts: legacy stores one dict per slot, columnar stores parallel
+# arrays per mode/day with buffer overrides referenced by table index
+STORAGE_FORMAT_KEY = "storage_format"
+STORAGE_FORMAT_LEGACY = "legacy"
+STORAGE_FORMAT_COLUMNAR = "columnar"
+STORAGE_FORMATS = (STORAGE_FORMAT_LEGACY, STORAGE_FORMAT_COLUMNAR)
+STORAGE_OVERRIDE_TABLE_KEY = "override_table"
+
+# Sharded storage: the core config stays under the entry's storage key with a
+# manifest of the generation and checksum of each shard, which is kept in its
+# own store (STORAGE_KEY_<entry_id>_<shard>_<generation>)
+STORAGE_SHARDS_KEY = "shards"
+STORAGE_SHARD_HOME = "home"
+STORAGE_SHARD_AWAY = "away"
+STORAGE_SHARD_OVERRIDES = "overrides"
+STORAGE_SHARDS = (STORAGE_SHARD_HOME, STORAGE_SHARD_AWAY, STORAGE_SHARD_OVERRIDES)
+
+# Journaled persistence: edits are appended as per-section deltas to a
+# separate journal store and folded into the snapshot by compaction
+JOURNAL_STORAGE_SUFFIX = "_journal"
+JOURNAL_COMPACT_DELAY_SECONDS = 300
+JOURNAL_COMPACT_MAX_RECORDS = 50
+JOURNAL_UNDO_DEPTH = 20
+
+# Last value commanded to each entity, kept in its own store so redundant
+# writes are still skipped after a restart
+COMMANDED_STORAGE_SUFFIX = "_commanded"
+COMMANDED_SAVE_DELAY_SECONDS = 30
+
+# Nightly backups store content once under objects/, named by its SHA-256,
+# and reference it from a small per-day manifest
+BACKUP_OBJECTS_DIR = "objects"
+BACKUP_MANIFEST_SUFFIX = ".manifest.json"
+DEFAULT_BACKUP_RETENTION_DAYS = 90
+MIN_NIGHTLY_BACKUPS = 7
+
+# Optional backup export compression and the file names that carry it
+BACKUP_COMPRESSION_SUFFIXES = {"gzip": ".json.gz", "lzma": ".json.xz"}
+BACKUP_FILE_SUFFIXES = (".json", ".json.gz", ".json.xz")
+
+# Per-entry index of backup files, kept under index/ so backup globs skip it
+BACKUP_INDEX_DIR = "index"
+BACKUP_INDEX_VERSION = 1
+
+# Recovery verifies this many backups concurrently before importing the newest good one
+RECOVERY_VERIFY_BATCH_SIZE = 4
 
 # Service names
 SERVICE_APPLY_SLOT = "apply_slot"
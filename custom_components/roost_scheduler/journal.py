@@ -0,0 +1,234 @@
+"""Append-only change journal for Roost Scheduler schedule data."""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_dumps_sorted
+from homeassistant.helpers.storage import Store
+
+from .const import JOURNAL_STORAGE_SUFFIX, JOURNAL_UNDO_DEPTH, STORAGE_KEY, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEDULES_SECTION = "schedules"
+
+
+def journal_sections(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Split legacy-layout schedule data into independently journaled sections.
+    
+    Every top-level key is a section, except the schedules, which get one
+    section per mode/day ("schedules/home/monday") so that editing a day only
+    journals that day's slots. A mode without days is kept as "schedules/<mode>".
+    """
+    sections = {key: value for key, value in data.items() if key != SCHEDULES_SECTION}
+    for mode, days in (data.get(SCHEDULES_SECTION) or {}).items():
+        if not days:
+            sections[f"{SCHEDULES_SECTION}/{mode}"] = {}
+        for day, slots in days.items():
+            sections[f"{SCHEDULES_SECTION}/{mode}/{day}"] = slots
+    return sections
+
+
+def apply_journal_changes(data: Dict[str, Any], changes: Dict[str, Any], removed: Iterable[str]) -> None:
+    """Apply one journal delta to legacy-layout schedule data in place."""
+    for section, value in changes.items():
+        parts = section.split("/", 2)
+        if parts[0] == SCHEDULES_SECTION and len(parts) > 1:
+            mode_schedules = data.setdefault(SCHEDULES_SECTION, {}).setdefault(parts[1], {})
+            if len(parts) == 3:
+                mode_schedules[parts[2]] = value
+        else:
+            data[section] = value
+    
+    for section in removed:
+        parts = section.split("/", 2)
+        if parts[0] == SCHEDULES_SECTION and len(parts) > 1:
+            schedules = data.get(SCHEDULES_SECTION, {})
+            if len(parts) == 3:
+                schedules.get(parts[1], {}).pop(parts[2], None)
+            elif not schedules.get(parts[1]):
+                schedules.pop(parts[1], None)
+        else:
+            data.pop(section, None)
+
+
+class ScheduleJournal:
+    """
+    Journal of schedule deltas recorded on top of a snapshot store.
+    
+    Each record holds only the sections that changed since the previous one.
+    The journal is tied to the snapshot it applies to by that snapshot's
+    content checksum: after compaction writes a new snapshot, records written
+    against the old one are ignored, so a crash between the two writes never
+    replays a delta twice. An undo stack of inverse deltas survives
+    compaction.
+    """
+    
+    def __init__(self, hass: HomeAssistant, entry_id: str, undo_depth: int = JOURNAL_UNDO_DEPTH) -> None:
+        """Initialize the journal."""
+        self.entry_id = entry_id
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{entry_id}{JOURNAL_STORAGE_SUFFIX}")
+        self._undo_depth = undo_depth
+        # Checksum of the snapshot the records apply to; None until started
+        self._base_checksum: Optional[str] = None
+        self._records: List[Dict[str, Any]] = []
+        self._undo: List[Dict[str, Any]] = []
+        self._seq = 0
+        # Canonical JSON of each section as of the last journaled state
+        self._sections: Dict[str, str] = {}
+    
+    @property
+    def started(self) -> bool:
+        """Return True once the journal is tracking a snapshot."""
+        return self._base_checksum is not None
+    
+    @property
+    def pending_records(self) -> int:
+        """Return the number of records not yet folded into the snapshot."""
+        return len(self._records)
+    
+    @property
+    def can_undo(self) -> bool:
+        """Return True if there is a change that can be undone."""
+        return bool(self._undo)
+    
+    async def async_load(self, snapshot_checksum: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Load the journal and return the records to replay onto the snapshot.
+        
+        Records written against a different snapshot were already folded into
+        it by a compaction and are dropped. The undo history is kept either way.
+        """
+        stored = await self._store.async_load() or {}
+        self._undo = list(stored.get("undo") or [])[-self._undo_depth:]
+        self._seq = int(stored.get("seq") or 0)
+        
+        records = list(stored.get("records") or [])
+        if records and (snapshot_checksum is None or stored.get("base") != snapshot_checksum):
+            _LOGGER.debug("Ignoring %d journal records for entry %s written against an older snapshot",
+                         len(records), self.entry_id)
+            records = []
+        
+        self._records = records
+        return records
+    
+    def discard_records(self) -> None:
+        """Drop the loaded records; the next append replaces them on disk."""
+        self._records = []
+    
+    def start(self, sections: Dict[str, str], snapshot_checksum: str) -> None:
+        """Track a snapshot whose serialized sections (see serialize_sections) are given."""
+        self._base_checksum = snapshot_checksum
+        self._sections = sections
+    
+    def stop(self) -> None:
+        """Stop tracking; the next write must be a full snapshot."""
+        self._base_checksum = None
+    
+    async def async_reset(self, sections: Dict[str, str], snapshot_checksum: str) -> None:
+        """Start over on a freshly written snapshot that includes every record."""
+        self._records = []
+        self.start(sections, snapshot_checksum)
+        try:
+            await self._async_save()
+        except Exception:
+            self.stop()
+            raise
+    
+    async def async_append(self, data: Dict[str, Any], undoing: bool = False) -> bool:
+        """
+        Append the sections of data that changed since the last record.
+        
+        Unless undoing, the inverse delta is pushed onto the undo stack;
+        when undoing, the undo entry being applied is popped instead. Returns
+        False if nothing changed.
+        """
+        sections = journal_sections(data)
+        serialized = self.serialize_sections(data)
+        changed = [section for section, text in serialized.items() if self._sections.get(section) != text]
+        removed = [section for section in self._sections if section not in serialized]
+        if not changed and not removed:
+            return False
+        
+        seq = self._seq + 1
+        timestamp = datetime.now().isoformat()
+        record = {
+            "seq": seq,
+            "timestamp": timestamp,
+            "set": {section: copy.deepcopy(sections[section]) for section in changed},
+            "unset": removed,
+        }
+        
+        undo = list(self._undo)
+        if undoing:
+            if undo:
+                undo.pop()
+        else:
+            previous = {
+                section: self._sections[section] for section in changed + removed if section in self._sections
+            }
+            undo.append({
+                "seq": seq,
+                "timestamp": timestamp,
+                "sections": sorted(changed + removed),
+                "set": previous,
+                "unset": [section for section in changed if section not in self._sections],
+            })
+            undo = undo[-self._undo_depth:]
+        
+        records = self._records + [record]
+        await self._async_save(records=records, undo=undo, seq=seq)
+        
+        self._records = records
+        self._undo = undo
+        self._seq = seq
+        self._sections = serialized
+        return True
+    
+    def peek_undo(self) -> Optional[Dict[str, Any]]:
+        """Return the inverse delta of the most recent undoable change."""
+        if not self._undo:
+            return None
+        entry = self._undo[-1]
+        return {
+            "set": {section: json.loads(text) for section, text in entry["set"].items()},
+            "unset": list(entry["unset"]),
+        }
+    
+    def get_history(self) -> List[Dict[str, Any]]:
+        """Return the undoable changes, newest first, without their contents."""
+        return [
+            {"seq": entry["seq"], "timestamp": entry["timestamp"], "sections": entry["sections"]}
+            for entry in reversed(self._undo)
+        ]
+    
+    async def _async_save(
+        self,
+        records: Optional[List[Dict[str, Any]]] = None,
+        undo: Optional[List[Dict[str, Any]]] = None,
+        seq: Optional[int] = None,
+    ) -> None:
+        """Write the journal store."""
+        await self._store.async_save({
+            "base": self._base_checksum,
+            "seq": self._seq if seq is None else seq,
+            "records": self._records if records is None else records,
+            "undo": self._undo if undo is None else undo,
+        })
+    
+    @staticmethod
+    def serialize_sections(data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Return the canonical JSON of every section of legacy-layout data.
+        
+        Call this before awaiting a snapshot write: the data shares lists and
+        dicts with the live ScheduleData, which may change during the write.
+        """
+        return {section: json_dumps_sorted(value) for section, value in journal_sections(data).items()}
+
@@ -1,18 +1,30 @@
 """Migration system for Roost Scheduler version upgrades."""
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
 import logging
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable, Optional
 
 import aiofiles
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, STORAGE_KEY
+from .const import (
+    DOMAIN,
+    STORAGE_FORMAT_COLUMNAR,
+    STORAGE_FORMAT_KEY,
+    STORAGE_FORMAT_LEGACY,
+    STORAGE_FORMATS,
+    STORAGE_KEY,
+    STORAGE_OVERRIDE_TABLE_KEY,
+)
 from .version import VERSION, get_migration_path, is_version_supported
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,7 +34,11 @@ MIGRATIONS: dict[str, Callable[[dict], dict]] = {}
 
 
 def migration(version: str) -> Callable:
-    """Decorator to register a migration function for a specific version."""
+    """Decorator to register a migration function for a specific version.
+    
+    Migration functions transform the data in place and return it;
+    migrate_if_needed hands the whole chain one private deep copy.
+    """
     def decorator(func: Callable[[dict], dict]) -> Callable:
         MIGRATIONS[version] = func
         _LOGGER.debug("Registered migration for version %s", version)
@@ -30,6 +46,12 @@ def migration(version: str) -> Callable:
     return decorator
 
 
+@lru_cache(maxsize=None)
+def _migration_path(from_version: str) -> tuple[str, ...]:
+    """Return get_migration_path(from_version), resolved once per source version."""
+    return tuple(get_migration_path(from_version))
+
+
 # Async file utility functions for safe file operations
 async def async_read_json_file(file_path: Path) -> dict[str, Any]:
     """Safely read JSON data from a file using async I/O with comprehensive error logging."""
@@ -282,6 +304,17 @@ async def async_file_exists(file_path: Path) -> bool:
         return False
 
 
+def _write_migration_backup(backup_path: Path, backup_data: dict[str, Any]) -> tuple[int, str]:
+    """Write a pre-migration backup file; runs in the executor.
+    
+    Returns the file size and the SHA-256 of its content.
+    """
+    content = json.dumps(backup_data, indent=2, default=str)
+    backup_path.parent.mkdir(parents=True, exist_ok=True)
+    backup_path.write_text(content, encoding="utf-8")
+    return backup_path.stat().st_size, hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 async def async_ensure_directory(dir_path: Path) -> None:
     """Ensure a directory exists using async-safe operations."""
     try:
@@ -296,10 +329,20 @@ async def async_ensure_directory(dir_path: Path) -> None:
 class MigrationManager:
     """Manages data migration between versions."""
     
-    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
-        """Initialize migration manager."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        backup_indexer: Optional[Callable[[str, dict[str, Any]], Awaitable[None]]] = None,
+    ) -> None:
+        """Initialize migration manager.
+        
+        backup_indexer, if given, is awaited with the file name and index
+        entry of every pre-migration backup (see StorageService.async_index_backup).
+        """
         self.hass = hass
         self.entry_id = entry_id
+        self._backup_indexer = backup_indexer
         self._store = Store(hass, 1, f"{STORAGE_KEY}_{entry_id}")
         
     async def migrate_if_needed(self, data: dict[str, Any]) -> dict[str, Any]:
@@ -335,94 +378,80 @@ class MigrationManager:
         await self._create_migration_backup(data, stored_version)
         
         # Get migration path
-        migration_path = get_migration_path(stored_version)
+        migration_path = list(_migration_path(stored_version))
         _LOGGER.info("Migration path for entry %s: %s -> %s (steps: %s)", 
                     self.entry_id, stored_version, VERSION, migration_path)
         
+        # One deep copy up front; the steps then transform it in place, so
+        # the caller's data is never modified
+        migrated_data = copy.deepcopy(data)
+        step_durations: dict[str, float] = {}
+        
         if not migration_path:
             _LOGGER.warning("No migration path found from %s to %s for entry %s, updating version only", 
                           stored_version, VERSION, self.entry_id)
-            # Still update the version even if no migration path exists
-            updated_data = data.copy()
-            updated_data["version"] = VERSION
             
             # Add metadata about the version update
-            if "metadata" not in updated_data:
-                updated_data["metadata"] = {}
-            
-            updated_data["metadata"]["version_update"] = {
+            migrated_data.setdefault("metadata", {})["version_update"] = {
                 "from_version": stored_version,
                 "to_version": VERSION,
                 "timestamp": datetime.now().isoformat(),
                 "update_type": "direct_version_update"
             }
-            
-            _LOGGER.info("Updated version directly from %s to %s for entry %s", 
-                        stored_version, VERSION, self.entry_id)
-            return updated_data
         
         # Apply migrations in sequence
-        migrated_data = data.copy()
-        
         for target_version in migration_path:
-            if target_version in MIGRATIONS:
+            step = MIGRATIONS.get(target_version)
+            step_start = time.perf_counter()
+            if step is not None:
                 _LOGGER.info("Applying migration to version %s", target_version)
                 try:
-                    migrated_data = MIGRATIONS[target_version](migrated_data)
-                    migrated_data["version"] = target_version
-                    
-                    # Update metadata for this migration step
-                    if "metadata" not in migrated_data:
-                        migrated_data["metadata"] = {}
-                    
-                    migrated_data["metadata"]["last_migration"] = {
-                        "from_version": stored_version,
-                        "to_version": target_version,
-                        "timestamp": datetime.now().isoformat(),
-                        "migration_id": f"{stored_version}_to_{target_version}"
-                    }
-                    
+                    migrated_data = step(migrated_data)
                 except Exception as e:
                     _LOGGER.error("Migration to version %s failed: %s", target_version, e)
                     raise
             else:
                 _LOGGER.info("No migration function found for version %s, updating version metadata", target_version)
-                # Even without a migration function, update the version to indicate successful migration
-                migrated_data["version"] = target_version
-                
-                # Update metadata to track version update
-                if "metadata" not in migrated_data:
-                    migrated_data["metadata"] = {}
-                
-                migrated_data["metadata"]["last_migration"] = {
-                    "from_version": stored_version,
-                    "to_version": target_version,
-                    "timestamp": datetime.now().isoformat(),
-                    "migration_id": f"{stored_version}_to_{target_version}",
-                    "migration_type": "version_update_only"
-                }
+            
+            # Even without a migration function, update the version to indicate successful migration
+            migrated_data["version"] = target_version
+            step_durations[target_version] = round((time.perf_counter() - step_start) * 1000, 3)
+        
+        metadata = migrated_data.setdefault("metadata", {})
+        if migration_path:
+            # Recorded once for the chain rather than after every step
+            final_step = migration_path[-1]
+            metadata["last_migration"] = {
+                "from_version": stored_version,
+                "to_version": final_step,
+                "timestamp": datetime.now().isoformat(),
+                "migration_id": f"{stored_version}_to_{final_step}"
+            }
+            if final_step not in MIGRATIONS:
+                metadata["last_migration"]["migration_type"] = "version_update_only"
         
         # Ensure final version is set to current VERSION
         migrated_data["version"] = VERSION
         
         # Update final migration metadata
-        if "metadata" not in migrated_data:
-            migrated_data["metadata"] = {}
-        
-        migrated_data["metadata"]["migration_completed"] = {
+        metadata["migration_completed"] = {
             "from_version": stored_version,
             "to_version": VERSION,
             "timestamp": datetime.now().isoformat(),
-            "migration_path": migration_path
+            "migration_path": migration_path,
+            "step_durations_ms": step_durations
         }
         
         # Log migration statistics
-        await self._log_migration_statistics(stored_version, VERSION, migration_path, migrated_data)
+        await self._log_migration_statistics(
+            stored_version, VERSION, migration_path, migrated_data, step_durations
+        )
         
         _LOGGER.info("Migration completed successfully from %s to %s for entry %s", 
                     stored_version, VERSION, self.entry_id)
         
-        # Validate migrated data
+        # Validate migrated data, once, for the whole chain. Callers only need
+        # to validate data this method returned unchanged.
         _LOGGER.info("Validating migrated data for entry %s", self.entry_id)
         validation_start_time = datetime.now()
         
@@ -437,6 +466,27 @@ class MigrationManager:
         
         return migrated_data
     
+    def convert_storage_format(self, data: dict[str, Any], storage_format: str) -> dict[str, Any]:
+        """Convert stored data between the legacy and columnar layouts.
+        
+        Data already in the requested layout is returned unchanged (the same
+        object). Version migrations and validate_migrated_data work on the
+        legacy layout, so columnar data is converted back before them.
+        """
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Unknown storage format: {storage_format}")
+        
+        if not data or data.get(STORAGE_FORMAT_KEY, STORAGE_FORMAT_LEGACY) == storage_format:
+            return data
+        
+        _LOGGER.debug("Converting stored data for entry %s to %s layout", self.entry_id, storage_format)
+        try:
+            if storage_format == STORAGE_FORMAT_COLUMNAR:
+                return to_columnar_layout(data)
+            return to_legacy_layout(data)
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+            raise ValueError(f"Cannot convert schedule data to {storage_format} layout: {e}") from e
+    
     async def _create_migration_backup(self, data: dict[str, Any], from_version: str) -> None:
         """Create a backup before migration with comprehensive error logging."""
         backup_start_time = datetime.now()
@@ -455,16 +505,6 @@ class MigrationManager:
             backup_dir = Path(self.hass.config.config_dir) / "roost_scheduler_backups"
             _LOGGER.debug("Backup directory path: %s", backup_dir)
             
-            # Ensure backup directory exists with detailed logging
-            try:
-                await async_ensure_directory(backup_dir)
-                _LOGGER.debug("Backup directory ready: %s", backup_dir)
-            except Exception as dir_error:
-                _LOGGER.error("Failed to create backup directory %s: %s (type: %s)", 
-                             backup_dir, dir_error, type(dir_error).__name__)
-                backup_context["directory_error"] = str(dir_error)
-                raise
-            
             # Generate backup filename with detailed metadata
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_filename = f"pre_migration_{from_version}_to_{VERSION}_{self.entry_id}_{timestamp}.json"
@@ -508,9 +548,13 @@ class MigrationManager:
             
             backup_data["backup_metadata"] = backup_metadata
             
-            # Use async file operations to write the backup
+            # Directory creation, serialization and the write all run in the
+            # executor, so migrating several entries at startup never blocks
+            # the event loop on backup I/O
             try:
-                await async_write_json_file(backup_path, backup_data)
+                backup_size, backup_checksum = await self.hass.async_add_executor_job(
+                    _write_migration_backup, backup_path, backup_data
+                )
                 _LOGGER.debug("Backup file written successfully: %s", backup_path)
             except Exception as write_error:
                 _LOGGER.error("Failed to write backup file %s: %s (type: %s)", 
@@ -518,30 +562,30 @@ class MigrationManager:
                 backup_context["write_error"] = str(write_error)
                 raise
             
-            # Verify backup file was created successfully
             backup_duration = datetime.now() - backup_start_time
-            try:
-                if backup_path.exists():
-                    backup_size = backup_path.stat().st_size
-                    _LOGGER.info("Migration backup created successfully:")
-                    _LOGGER.info("  - Entry ID: %s", self.entry_id)
-                    _LOGGER.info("  - File: %s", backup_path)
-                    _LOGGER.info("  - Size: %d bytes", backup_size)
-                    _LOGGER.info("  - Duration: %s", backup_duration)
-                    _LOGGER.info("  - Version: %s -> %s", from_version, VERSION)
-                    
-                    backup_context["success"] = True
-                    backup_context["backup_size"] = backup_size
-                    backup_context["duration"] = str(backup_duration)
-                else:
-                    _LOGGER.error("Backup file was not created: %s", backup_path)
-                    backup_context["verification_error"] = "file_not_found"
-                    raise FileNotFoundError(f"Backup file was not created: {backup_path}")
-                    
-            except OSError as verify_error:
-                _LOGGER.error("Cannot verify backup file %s: %s", backup_path, verify_error)
-                backup_context["verification_error"] = str(verify_error)
-                # Don't fail if we can't verify, the write might have succeeded
+            _LOGGER.info("Migration backup created successfully:")
+            _LOGGER.info("  - Entry ID: %s", self.entry_id)
+            _LOGGER.info("  - File: %s", backup_path)
+            _LOGGER.info("  - Size: %d bytes", backup_size)
+            _LOGGER.info("  - Duration: %s", backup_duration)
+            _LOGGER.info("  - Version: %s -> %s", from_version, VERSION)
+            
+            backup_context["success"] = True
+            backup_context["backup_size"] = backup_size
+            backup_context["duration"] = str(backup_duration)
+            
+            if self._backup_indexer is not None:
+                try:
+                    await self._backup_indexer(backup_filename, {
+                        "size": backup_size,
+                        "created": backup_metadata["created_at"],
+                        "checksum": backup_checksum,
+                        "schema_version": from_version,
+                    })
+                except Exception as index_error:
+                    # The file is still found by async_rebuild_backup_index()
+                    _LOGGER.warning("Failed to add migration backup %s to the backup index: %s",
+                                    backup_filename, index_error)
                 
         except Exception as e:
             backup_duration = datetime.now() - backup_start_time
@@ -919,8 +963,9 @@ class MigrationManager:
         return analysis
 
     async def _log_migration_statistics(self, from_version: str, to_version: str, 
-                                      migration_path: list[str], migrated_data: dict[str, Any]) -> None:
-        """Log detailed migration statistics."""
+                                      migration_path: list[str], migrated_data: dict[str, Any],
+                                      step_durations: dict[str, float] | None = None) -> None:
+        """Log detailed migration statistics, including the time each step took."""
         try:
             # Count data elements
             schedules = migrated_data.get("schedules", {})
@@ -938,6 +983,8 @@ class MigrationManager:
             _LOGGER.info("  - Source version: %s", from_version)
             _LOGGER.info("  - Target version: %s", to_version)
             _LOGGER.info("  - Migration path: %s", " -> ".join([from_version] + migration_path))
+            for step_version, duration_ms in (step_durations or {}).items():
+                _LOGGER.info("  - Step to %s: %.3f ms", step_version, duration_ms)
             _LOGGER.info("  - Total schedule slots: %d", total_schedules)
             _LOGGER.info("  - Entities tracked: %d", len(entities_tracked))
             _LOGGER.info("  - Schedule modes: %s", list(schedules.keys()))
@@ -964,7 +1011,7 @@ def migrate_to_0_2_0(data: dict[str, Any]) -> dict[str, Any]:
     """Migrate from 0.1.0 to 0.2.0 - Add presence management."""
     _LOGGER.info("Migrating to version 0.2.0: Adding presence management")
     
-    migrated = data.copy()
+    migrated = data
     
     # Add presence configuration if not present
     if "presence_entities" not in migrated:
@@ -997,7 +1044,7 @@ def migrate_to_0_3_0(data: dict[str, Any]) -> dict[str, Any]:
     """Migrate from 0.2.0 to 0.3.0 - Add buffer system and HACS support."""
     _LOGGER.info("Migrating to version 0.3.0: Adding buffer system")
     
-    migrated = data.copy()
+    migrated = data
     
     # Add buffer configuration
     if "buffer" not in migrated:
@@ -1052,7 +1099,7 @@ def migrate_to_0_3_1(data: dict[str, Any]) -> dict[str, Any]:
     """Migrate from 0.3.0 to 0.3.1 - Add manager configuration storage."""
     _LOGGER.info("Migrating to version 0.3.1: Adding manager configuration storage")
     
-    migrated = data.copy()
+    migrated = data
     
     # Add presence_config if not present
     if "presence_config" not in migrated:
@@ -1098,6 +1145,88 @@ def migrate_to_0_3_1(data: dict[str, Any]) -> dict[str, Any]:
     return migrated
 
 
+# Storage layout conversions, independent of the data version
+def _time_to_minute(value: str) -> int:
+    """Convert an HH:MM slot time to minutes since midnight."""
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _minute_to_time(value: int) -> str:
+    """Convert minutes since midnight to an HH:MM slot time."""
+    return f"{value // 60:02d}:{value % 60:02d}"
+
+
+def to_columnar_layout(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert legacy per-slot dicts to parallel arrays per mode/day."""
+    converted = {key: value for key, value in data.items() if key != "schedules"}
+    override_table: list[dict[str, Any]] = []
+    override_index: dict[str, int] = {}
+    schedules: dict[str, Any] = {}
+    
+    for mode, mode_schedules in data.get("schedules", {}).items():
+        schedules[mode] = {}
+        for day, day_schedule in mode_schedules.items():
+            columns = {"start": [], "end": [], "target": [], "domain": [], "override": []}
+            for slot in day_schedule:
+                target = slot.get("target", {})
+                if not isinstance(target, dict):
+                    # Pre-0.3.0 numeric target
+                    target = {"domain": "climate", "temperature": float(target)}
+                
+                override = slot.get("buffer_override")
+                index = -1
+                if override:
+                    key = json.dumps(override, sort_keys=True)
+                    if key not in override_index:
+                        override_index[key] = len(override_table)
+                        override_table.append(override)
+                    index = override_index[key]
+                
+                columns["start"].append(_time_to_minute(slot.get("start", "00:00")))
+                columns["end"].append(_time_to_minute(slot.get("end", "23:59")))
+                columns["target"].append(target.get("temperature", 20.0))
+                columns["domain"].append(target.get("domain", "climate"))
+                columns["override"].append(index)
+            schedules[mode][day] = columns
+    
+    converted["schedules"] = schedules
+    converted[STORAGE_FORMAT_KEY] = STORAGE_FORMAT_COLUMNAR
+    converted[STORAGE_OVERRIDE_TABLE_KEY] = override_table
+    return converted
+
+
+def to_legacy_layout(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert columnar schedule arrays back to legacy per-slot dicts."""
+    converted = {
+        key: value for key, value in data.items()
+        if key not in ("schedules", STORAGE_FORMAT_KEY, STORAGE_OVERRIDE_TABLE_KEY)
+    }
+    override_table = data.get(STORAGE_OVERRIDE_TABLE_KEY, [])
+    schedules: dict[str, Any] = {}
+    
+    for mode, mode_schedules in data.get("schedules", {}).items():
+        schedules[mode] = {}
+        for day, columns in mode_schedules.items():
+            overrides = columns.get("override") or [-1] * len(columns["start"])
+            day_schedule = []
+            for start, end, target, domain, index in zip(
+                columns["start"], columns["end"], columns["target"], columns["domain"], overrides
+            ):
+                slot = {
+                    "start": _minute_to_time(start),
+                    "end": _minute_to_time(end),
+                    "target": {"domain": domain, "temperature": target},
+                }
+                if index >= 0:
+                    slot["buffer_override"] = override_table[index]
+                day_schedule.append(slot)
+            schedules[mode][day] = day_schedule
+    
+    converted["schedules"] = schedules
+    return converted
+
+
 class ConfigurationMigrationManager:
     """Manages configuration migration for managers."""
     
@@ -2,10 +2,58 @@
 from __future__ import annotations
 
 import json
-import re
+import logging
+import weakref
 from dataclasses import dataclass, asdict, field
-from datetime import datetime, time
-from typing import Any, Dict, Optional, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, List
+
+from .const import (
+    HOURS_PER_DAY,
+    MINUTES_PER_HOUR,
+    STORAGE_FORMAT_COLUMNAR,
+    STORAGE_FORMAT_KEY,
+    STORAGE_OVERRIDE_TABLE_KEY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+MINUTES_PER_DAY = MINUTES_PER_HOUR * HOURS_PER_DAY
+
+# Canonical "HH:MM" string for every minute of the day, shared by all slots
+_MINUTE_STRINGS = tuple(f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(MINUTES_PER_DAY))
+
+# Accepted time strings (zero-padded or single-digit hour) mapped to minutes
+_TIME_MINUTES = {text: minute for minute, text in enumerate(_MINUTE_STRINGS)}
+_TIME_MINUTES.update({
+    f"{minute // 60}:{minute % 60:02d}": minute for minute in range(10 * 60)
+})
+
+
+def _parse_slot_time(value: str, field_name: str) -> int:
+    """Convert an HH:MM slot time to minutes since midnight."""
+    minute = _TIME_MINUTES.get(value) if isinstance(value, str) else None
+    if minute is None:
+        raise ValueError(f"{field_name} must be in HH:MM format, got {value}")
+    return minute
+
+
+def time_to_minutes(value: str) -> int:
+    """Convert an HH:MM string to minutes since midnight."""
+    return _parse_slot_time(value, "time")
+
+
+# Identical buffer overrides loaded from storage share a single instance
+_BUFFER_CONFIGS: "weakref.WeakValueDictionary[tuple, BufferConfig]" = weakref.WeakValueDictionary()
+
+
+def _intern_buffer_config(config: BufferConfig) -> BufferConfig:
+    """Return a shared, read-only instance for an identical buffer configuration."""
+    key = (config.time_minutes, config.value_delta, config.enabled, config.apply_to)
+    shared = _BUFFER_CONFIGS.setdefault(key, config)
+    object.__setattr__(shared, "_interned", True)
+    return shared
 
 
 @dataclass
@@ -101,6 +149,14 @@ class BufferConfig:
         """Validate buffer configuration after initialization."""
         self.validate()
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse changes to an interned instance, which other slots share."""
+        if self.__dict__.get("_interned"):
+            raise AttributeError(
+                f"Cannot set {name} on a shared BufferConfig; assign a new BufferConfig instead"
+            )
+        super().__setattr__(name, value)
+    
     def validate(self) -> None:
         """Validate buffer configuration values."""
         if not isinstance(self.time_minutes, int) or self.time_minutes < 0:
@@ -232,41 +288,118 @@ class GlobalBufferConfig:
         )
 
 
-@dataclass
 class ScheduleSlot:
-    """Represents a single schedule time slot."""
-    day: str  # monday, tuesday, etc.
-    start_time: str  # "06:00"
-    end_time: str   # "08:30"
-    target_value: float
-    entity_domain: str
-    buffer_override: Optional[BufferConfig] = None
+    """Represents a single schedule time slot.
+    
+    Start and end are held as integer minutes since midnight, parsed once at
+    construction. The "HH:MM" forms exposed as start_time/end_time are looked
+    up from a precomputed table rather than stored per slot.
+    """
+    
+    __slots__ = ("day", "start_minute", "end_minute", "target_value", "entity_domain", "buffer_override")
     
     # Valid days of the week
     VALID_DAYS = {"monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"}
     VALID_DOMAINS = {"climate", "input_number", "number"}
     
-    def __post_init__(self):
-        """Validate schedule slot after initialization."""
+    # Canonical string instances so every slot shares the same day/domain objects
+    _DAY_NAMES = {day: day for day in VALID_DAYS}
+    _DOMAIN_NAMES = {domain: domain for domain in VALID_DOMAINS}
+    
+    def __init__(
+        self,
+        day: str,
+        start_time: str,
+        end_time: str,
+        target_value: float,
+        entity_domain: str,
+        buffer_override: Optional[BufferConfig] = None,
+    ) -> None:
+        """Initialize and validate the slot."""
+        self.day = day
+        self.start_minute = _parse_slot_time(start_time, "start_time")
+        self.end_minute = _parse_slot_time(end_time, "end_time")
+        self.target_value = target_value
+        self.entity_domain = entity_domain
+        self.buffer_override = buffer_override
         self.validate()
     
+    @classmethod
+    def from_minutes(
+        cls,
+        day: str,
+        start_minute: int,
+        end_minute: int,
+        target_value: float,
+        entity_domain: str,
+        buffer_override: Optional[BufferConfig] = None,
+    ) -> ScheduleSlot:
+        """Create a slot directly from minutes since midnight."""
+        slot = cls.__new__(cls)
+        slot.day = day
+        slot.start_minute = start_minute
+        slot.end_minute = end_minute
+        slot.target_value = target_value
+        slot.entity_domain = entity_domain
+        slot.buffer_override = buffer_override
+        slot.validate()
+        return slot
+    
+    @classmethod
+    def from_trusted_minutes(
+        cls,
+        day: str,
+        start_minute: int,
+        end_minute: int,
+        target_value: float,
+        entity_domain: str,
+        buffer_override: Optional[BufferConfig] = None,
+    ) -> ScheduleSlot:
+        """Create a slot from minutes that were validated when they were stored.
+        
+        No validation is performed; an unknown day or domain raises KeyError.
+        """
+        slot = cls.__new__(cls)
+        slot.day = cls._DAY_NAMES[day]
+        slot.start_minute = start_minute
+        slot.end_minute = end_minute
+        slot.target_value = target_value
+        slot.entity_domain = cls._DOMAIN_NAMES[entity_domain]
+        slot.buffer_override = buffer_override
+        return slot
+    
+    @property
+    def start_time(self) -> str:
+        """Return the start time as HH:MM."""
+        return _MINUTE_STRINGS[self.start_minute]
+    
+    @start_time.setter
+    def start_time(self, value: str) -> None:
+        self.start_minute = _parse_slot_time(value, "start_time")
+    
+    @property
+    def end_time(self) -> str:
+        """Return the end time as HH:MM."""
+        return _MINUTE_STRINGS[self.end_minute]
+    
+    @end_time.setter
+    def end_time(self, value: str) -> None:
+        self.end_minute = _parse_slot_time(value, "end_time")
+    
     def validate(self) -> None:
         """Validate schedule slot values."""
         # Validate day
-        if not isinstance(self.day, str) or self.day.lower() not in self.VALID_DAYS:
+        day = self._DAY_NAMES.get(self.day.lower()) if isinstance(self.day, str) else None
+        if day is None:
             raise ValueError(f"day must be one of {self.VALID_DAYS}, got {self.day}")
-        self.day = self.day.lower()
-        
-        # Validate time format
-        if not self._is_valid_time_format(self.start_time):
-            raise ValueError(f"start_time must be in HH:MM format, got {self.start_time}")
-        if not self._is_valid_time_format(self.end_time):
-            raise ValueError(f"end_time must be in HH:MM format, got {self.end_time}")
+        self.day = day
         
         # Validate time range
-        start = self._parse_time(self.start_time)
-        end = self._parse_time(self.end_time)
-        if start >= end:
+        for name in ("start_minute", "end_minute"):
+            minute = getattr(self, name)
+            if not isinstance(minute, int) or not 0 <= minute < MINUTES_PER_DAY:
+                raise ValueError(f"{name} must be an integer between 0 and {MINUTES_PER_DAY - 1}, got {minute}")
+        if self.start_minute >= self.end_minute:
             raise ValueError(f"start_time ({self.start_time}) must be before end_time ({self.end_time})")
         
         # Validate target value
@@ -276,45 +409,54 @@ class ScheduleSlot:
             raise ValueError(f"target_value must be between -50 and 50, got {self.target_value}")
         
         # Validate entity domain
-        if not isinstance(self.entity_domain, str) or self.entity_domain not in self.VALID_DOMAINS:
+        domain = self._DOMAIN_NAMES.get(self.entity_domain) if isinstance(self.entity_domain, str) else None
+        if domain is None:
             raise ValueError(f"entity_domain must be one of {self.VALID_DOMAINS}, got {self.entity_domain}")
+        self.entity_domain = domain
         
         # Validate buffer override if present
         if self.buffer_override is not None:
             self.buffer_override.validate()
     
-    def _is_valid_time_format(self, time_str: str) -> bool:
-        """Check if time string is in valid HH:MM format."""
-        if not isinstance(time_str, str):
-            return False
-        pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
-        return bool(re.match(pattern, time_str))
-    
-    def _parse_time(self, time_str: str) -> time:
-        """Parse time string to time object."""
-        try:
-            hour, minute = map(int, time_str.split(':'))
-            return time(hour, minute)
-        except (ValueError, AttributeError):
-            raise ValueError(f"Invalid time format: {time_str}")
+    def minute_bounds(self) -> tuple[int, int]:
+        """Return the (start, end) of the slot in minutes since midnight."""
+        return self.start_minute, self.end_minute
     
     def overlaps_with(self, other: 'ScheduleSlot') -> bool:
         """Check if this slot overlaps with another slot."""
         if self.day != other.day:
             return False
         
-        start1 = self._parse_time(self.start_time)
-        end1 = self._parse_time(self.end_time)
-        start2 = other._parse_time(other.start_time)
-        end2 = other._parse_time(other.end_time)
-        
-        return start1 < end2 and start2 < end1
+        return self.start_minute < other.end_minute and other.start_minute < self.end_minute
+    
+    def __eq__(self, other: object) -> bool:
+        """Compare slots field by field."""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.day == other.day
+            and self.start_minute == other.start_minute
+            and self.end_minute == other.end_minute
+            and self.target_value == other.target_value
+            and self.entity_domain == other.entity_domain
+            and self.buffer_override == other.buffer_override
+        )
+    
+    __hash__ = None  # Mutable, like the dataclass it replaces
+    
+    def __repr__(self) -> str:
+        """Return a dataclass-style representation."""
+        return (
+            f"ScheduleSlot(day={self.day!r}, start_time={self.start_time!r}, "
+            f"end_time={self.end_time!r}, target_value={self.target_value!r}, "
+            f"entity_domain={self.entity_domain!r}, buffer_override={self.buffer_override!r})"
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         result = {
-            "start": self.start_time,
-            "end": self.end_time,
+            "start": _MINUTE_STRINGS[self.start_minute],
+            "end": _MINUTE_STRINGS[self.end_minute],
             "target": {
                 "domain": self.entity_domain,
                 "temperature": self.target_value
@@ -324,12 +466,30 @@ class ScheduleSlot:
             result["buffer_override"] = self.buffer_override.to_dict()
         return result
     
+    @classmethod
+    def from_trusted_dict(cls, day: str, data: Dict[str, Any]) -> ScheduleSlot:
+        """Create from a dictionary that was validated when it was stored.
+        
+        No validation is performed; malformed times raise KeyError.
+        """
+        target = data.get("target", {})
+        buffer_data = data.get("buffer_override")
+        
+        slot = cls.__new__(cls)
+        slot.day = cls._DAY_NAMES[day]
+        slot.start_minute = _TIME_MINUTES[data.get("start", "00:00")]
+        slot.end_minute = _TIME_MINUTES[data.get("end", "23:59")]
+        slot.target_value = target.get("temperature", 20.0)
+        slot.entity_domain = cls._DOMAIN_NAMES[target.get("domain", "climate")]
+        slot.buffer_override = _intern_buffer_config(BufferConfig.from_dict(buffer_data)) if buffer_data else None
+        return slot
+    
     @classmethod
     def from_dict(cls, day: str, data: Dict[str, Any]) -> ScheduleSlot:
         """Create from dictionary."""
         target = data.get("target", {})
         buffer_data = data.get("buffer_override")
-        buffer_override = BufferConfig.from_dict(buffer_data) if buffer_data else None
+        buffer_override = _intern_buffer_config(BufferConfig.from_dict(buffer_data)) if buffer_data else None
         
         return cls(
             day=day,
@@ -444,8 +604,12 @@ class ScheduleData:
         """Validate schedule data after initialization."""
         self.validate()
     
-    def validate(self) -> None:
-        """Validate complete schedule data integrity."""
+    def validate(self, validate_slots: bool = True) -> None:
+        """Validate complete schedule data integrity.
+        
+        With validate_slots=False only the structure is checked; individual
+        slots and their overlaps are assumed valid (see from_dict(trusted=True)).
+        """
         # Validate version format
         if not isinstance(self.version, str) or not self.version:
             raise ValueError("version must be a non-empty string")
@@ -502,22 +666,22 @@ class ScheduleData:
                 if not isinstance(slots, list):
                     raise ValueError(f"schedules[{mode}][{day}] must be a list")
                 
-                # Validate each slot and check for overlaps
-                validated_slots = []
+                if not validate_slots:
+                    continue
+                
                 for slot in slots:
                     if not isinstance(slot, ScheduleSlot):
                         raise ValueError(f"All slots must be ScheduleSlot instances")
                     slot.validate()
-                    
-                    # Check for overlaps with previously validated slots
-                    for existing_slot in validated_slots:
-                        if slot.overlaps_with(existing_slot):
-                            raise ValueError(
-                                f"Overlapping slots found in {mode}/{day}: "
-                                f"{slot.start_time}-{slot.end_time} overlaps with "
-                                f"{existing_slot.start_time}-{existing_slot.end_time}"
-                            )
-                    validated_slots.append(slot)
+                
+                overlap = self._find_overlap(slots)
+                if overlap is not None:
+                    slot, existing_slot = overlap
+                    raise ValueError(
+                        f"Overlapping slots found in {mode}/{day}: "
+                        f"{slot.start_time}-{slot.end_time} overlaps with "
+                        f"{existing_slot.start_time}-{existing_slot.end_time}"
+                    )
         
         # Validate metadata
         if not isinstance(self.metadata, dict):
@@ -535,6 +699,30 @@ class ScheduleData:
                 raise ValueError("buffer_config must be GlobalBufferConfig instance or None")
             self.buffer_config.validate()
     
+    @staticmethod
+    def _find_overlap(slots: List[ScheduleSlot]) -> Optional[tuple[ScheduleSlot, ScheduleSlot]]:
+        """Find an overlapping pair of slots using a sort-and-sweep.
+        
+        Slots are sorted by start minute and swept once while tracking the
+        furthest end seen so far; a slot starting before that end overlaps the
+        slot that produced it. Returns (later, earlier) in input order, or None.
+        """
+        if len(slots) < 2:
+            return None
+        
+        intervals = sorted(
+            (slot.minute_bounds() + (index,) for index, slot in enumerate(slots))
+        )
+        
+        _, furthest_end, furthest_index = intervals[0]
+        for start, end, index in intervals[1:]:
+            if start < furthest_end:
+                first, second = sorted((index, furthest_index))
+                return slots[second], slots[first]
+            if end > furthest_end:
+                furthest_end, furthest_index = end, index
+        return None
+    
     def validate_schedule_integrity(self) -> List[str]:
         """Validate schedule integrity and return list of warnings."""
         warnings = []
@@ -571,13 +759,21 @@ class ScheduleData:
         
         return warnings
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        schedules_dict = {}
-        for mode, mode_schedules in self.schedules.items():
-            schedules_dict[mode] = {}
-            for day, slots in mode_schedules.items():
-                schedules_dict[mode][day] = [slot.to_dict() for slot in slots]
+    def to_dict(self, columnar: bool = False) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization.
+        
+        With columnar=True each mode/day is written as parallel arrays (see
+        _schedules_to_columns) instead of one dict per slot. from_dict reads
+        either layout.
+        """
+        if columnar:
+            schedules_dict, override_table = self._schedules_to_columns()
+        else:
+            schedules_dict = {}
+            for mode, mode_schedules in self.schedules.items():
+                schedules_dict[mode] = {}
+                for day, slots in mode_schedules.items():
+                    schedules_dict[mode][day] = [slot.to_dict() for slot in slots]
         
         buffer_dict = {}
         for key, config in self.buffer.items():
@@ -595,6 +791,10 @@ class ScheduleData:
             "metadata": self.metadata
         }
         
+        if columnar:
+            result[STORAGE_FORMAT_KEY] = STORAGE_FORMAT_COLUMNAR
+            result[STORAGE_OVERRIDE_TABLE_KEY] = override_table
+        
         if self.presence_config is not None:
             result["presence_config"] = self.presence_config.to_dict()
         
@@ -603,23 +803,116 @@ class ScheduleData:
         
         return result
     
+    def _schedules_to_columns(self) -> tuple[Dict[str, Dict[str, Dict[str, list]]], List[Dict[str, Any]]]:
+        """Encode the schedules as parallel arrays per mode/day.
+        
+        Each day becomes {"start": [...], "end": [...], "target": [...],
+        "domain": [...], "override": [...]} with start/end in minutes since
+        midnight. Buffer overrides are stored once in the returned table and
+        referenced by index, -1 meaning no override.
+        """
+        override_table: List[Dict[str, Any]] = []
+        override_index: Dict[tuple, int] = {}
+        schedules_dict: Dict[str, Dict[str, Dict[str, list]]] = {}
+        
+        for mode, mode_schedules in self.schedules.items():
+            schedules_dict[mode] = {}
+            for day, slots in mode_schedules.items():
+                overrides = []
+                for slot in slots:
+                    config = slot.buffer_override
+                    if not config:
+                        overrides.append(-1)
+                        continue
+                    key = (config.time_minutes, config.value_delta, config.enabled, config.apply_to)
+                    if key not in override_index:
+                        override_index[key] = len(override_table)
+                        override_table.append(config.to_dict())
+                    overrides.append(override_index[key])
+                
+                schedules_dict[mode][day] = {
+                    "start": [slot.start_minute for slot in slots],
+                    "end": [slot.end_minute for slot in slots],
+                    "target": [slot.target_value for slot in slots],
+                    "domain": [slot.entity_domain for slot in slots],
+                    "override": overrides,
+                }
+        
+        return schedules_dict, override_table
+    
+    @staticmethod
+    def _slots_from_columns(
+        day: str,
+        columns: Dict[str, list],
+        overrides: List[BufferConfig],
+        slot_factory: Callable[..., ScheduleSlot],
+    ) -> List[ScheduleSlot]:
+        """Build the slots of one day from its columnar arrays."""
+        try:
+            starts = columns["start"]
+            ends = columns["end"]
+            targets = columns["target"]
+            domains = columns["domain"]
+        except KeyError as e:
+            raise ValueError(f"Columnar schedule for {day} is missing the {e} array") from e
+        override_indexes = columns.get("override") or [-1] * len(starts)
+        
+        if not len(starts) == len(ends) == len(targets) == len(domains) == len(override_indexes):
+            raise ValueError(f"Columnar schedule arrays for {day} have different lengths")
+        
+        slots = []
+        for start, end, target, domain, index in zip(starts, ends, targets, domains, override_indexes):
+            if index >= len(overrides):
+                raise ValueError(f"Buffer override index {index} out of range for {day}")
+            slots.append(slot_factory(day, start, end, target, domain, overrides[index] if index >= 0 else None))
+        return slots
+    
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> ScheduleData:
-        """Create from dictionary."""
+    def from_dict(cls, data: Dict[str, Any], trusted: bool = False) -> ScheduleData:
+        """Create from dictionary.
+        
+        Pass trusted=True only for data that was validated when it was written
+        (our own store). Slots are then built without per-slot validation and
+        only the overall structure is checked; anything that does not parse
+        falls back to the strict path. Imports and websocket input must use the
+        default strict path.
+        """
+        if trusted:
+            try:
+                return cls._from_dict(data, trusted=True)
+            except (KeyError, TypeError, AttributeError, ValueError, IndexError) as e:
+                _LOGGER.debug("Trusted schedule data failed to parse, using strict validation: %s", e)
+        
+        return cls._from_dict(data, trusted=False)
+    
+    @classmethod
+    def from_parsed_slots(
+        cls, data: Dict[str, Any], schedules: Dict[str, Dict[str, List[ScheduleSlot]]]
+    ) -> ScheduleData:
+        """Create from a dictionary whose schedules were already parsed into slots.
+        
+        For validators that build slots while checking raw data. The rest of
+        the dictionary is parsed as in from_dict and the result is fully
+        validated, slot overlaps included.
+        """
+        return cls._from_dict(data, trusted=False, schedules=schedules)
+    
+    @classmethod
+    def _from_dict(
+        cls,
+        data: Dict[str, Any],
+        trusted: bool,
+        schedules: Optional[Dict[str, Dict[str, List[ScheduleSlot]]]] = None,
+    ) -> ScheduleData:
+        """Build ScheduleData from either storage layout."""
         # Parse buffer configs
         buffer = {}
         for key, config_data in data.get("buffer", {}).items():
             buffer[key] = BufferConfig.from_dict(config_data)
         
-        # Parse schedules
-        schedules = {}
-        for mode, mode_data in data.get("schedules", {}).items():
-            schedules[mode] = {}
-            for day, slots_data in mode_data.items():
-                schedules[mode][day] = [
-                    ScheduleSlot.from_dict(day, slot_data) 
-                    for slot_data in slots_data
-                ]
+        # Parse schedules unless the caller already did
+        if schedules is None:
+            schedules = cls._parse_schedules(data, trusted)
         
         # Parse presence_config if present
         presence_config = None
@@ -631,7 +924,7 @@ class ScheduleData:
         if "buffer_config" in data:
             buffer_config = GlobalBufferConfig.from_dict(data["buffer_config"])
         
-        return cls(
+        fields = dict(
             version=data.get("version", "0.3.0"),
             entities_tracked=data.get("entities_tracked", []),
             presence_entities=data.get("presence_entities", []),
@@ -644,6 +937,41 @@ class ScheduleData:
             presence_config=presence_config,
             buffer_config=buffer_config
         )
+        
+        if not trusted:
+            return cls(**fields)
+        
+        # Bypass __post_init__ so the slots are not validated again
+        schedule_data = cls.__new__(cls)
+        for name, value in fields.items():
+            setattr(schedule_data, name, value)
+        schedule_data.validate(validate_slots=False)
+        return schedule_data
+    
+    @classmethod
+    def _parse_schedules(cls, data: Dict[str, Any], trusted: bool) -> Dict[str, Dict[str, List[ScheduleSlot]]]:
+        """Parse the schedules of either storage layout into slots."""
+        schedules = {}
+        if data.get(STORAGE_FORMAT_KEY) == STORAGE_FORMAT_COLUMNAR:
+            overrides = [
+                _intern_buffer_config(BufferConfig.from_dict(config_data))
+                for config_data in data.get(STORAGE_OVERRIDE_TABLE_KEY, [])
+            ]
+            slot_factory = ScheduleSlot.from_trusted_minutes if trusted else ScheduleSlot.from_minutes
+            for mode, mode_data in data.get("schedules", {}).items():
+                schedules[mode] = {}
+                for day, columns in mode_data.items():
+                    schedules[mode][day] = cls._slots_from_columns(day, columns, overrides, slot_factory)
+        else:
+            slot_factory = ScheduleSlot.from_trusted_dict if trusted else ScheduleSlot.from_dict
+            for mode, mode_data in data.get("schedules", {}).items():
+                schedules[mode] = {}
+                for day, slots_data in mode_data.items():
+                    schedules[mode][day] = [
+                        slot_factory(day, slot_data) 
+                        for slot_data in slots_data
+                    ]
+        return schedules
     
     def to_json(self) -> str:
         """Convert to JSON string."""
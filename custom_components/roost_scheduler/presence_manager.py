@@ -584,7 +584,7 @@ class PresenceManager:
             _LOGGER.debug("Updated PresenceConfig with current values: entities=%d, rule=%s", 
                          len(self._presence_entities), self._presence_rule)
             
-            # Load existing schedule data or create new
+            # Patch the shared in-memory schedule data, or create it if there is none
             load_start = time.time()
             schedule_data = await self.storage_service.load_schedules()
             load_duration = time.time() - load_start
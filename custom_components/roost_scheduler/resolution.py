@@ -0,0 +1,146 @@
+"""Minute-level occupancy arrays used to re-grid schedules to a new resolution."""
+from __future__ import annotations
+
+from collections import Counter
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import MINUTES_PER_DAY, ScheduleSlot
+from .timeline import slot_bounds
+
+# Cell value for minutes not covered by any slot
+EMPTY = -1
+
+# (start_minute, end_minute, palette index) with an exclusive end
+Run = Tuple[int, int, int]
+
+
+def _slot_key(slot: ScheduleSlot) -> tuple:
+    """Return the key under which slots share a palette entry."""
+    override = slot.buffer_override
+    override_key = None
+    if override is not None:
+        override_key = (override.time_minutes, override.value_delta, override.enabled, override.apply_to)
+    return slot.target_value, slot.entity_domain, override_key
+
+
+class DayCells:
+    """A single day's schedule as one palette index per minute.
+
+    The palette holds one representative slot per distinct target (value,
+    domain and buffer override); cells refer to it by index, or hold EMPTY.
+    """
+
+    def __init__(self, slots: List[ScheduleSlot]) -> None:
+        """Rasterise the slots. Later slots win where slots overlap."""
+        self.palette: List[ScheduleSlot] = []
+        self.cells: List[int] = [EMPTY] * MINUTES_PER_DAY
+
+        index_by_key: Dict[tuple, int] = {}
+        for slot in slots:
+            key = _slot_key(slot)
+            index = index_by_key.get(key)
+            if index is None:
+                index = index_by_key[key] = len(self.palette)
+                self.palette.append(slot)
+
+            start, end = slot_bounds(slot)
+            self.cells[start:end] = [index] * (end - start)
+
+    def regrid(self, resolution: int) -> List[int]:
+        """Return one palette index per cell of the given resolution.
+
+        A cell is occupied if any of its minutes is. Within a mixed cell the
+        target covering the most minutes wins, ties going to the one that
+        appears first in the cell.
+        """
+        coarse = []
+        cells = self.cells
+        for offset in range(0, MINUTES_PER_DAY, resolution):
+            block = cells[offset:offset + resolution]
+            first = block[0]
+            if block.count(first) == len(block):
+                coarse.append(first)
+                continue
+
+            counts = Counter(value for value in block if value != EMPTY)
+            best = max(counts.values())
+            coarse.append(next(value for value in block if counts.get(value) == best))
+        return coarse
+
+
+def expand(coarse: List[int], resolution: int) -> List[int]:
+    """Expand per-resolution cells back to one value per minute."""
+    cells: List[int] = []
+    for value in coarse:
+        cells.extend([value] * resolution)
+    return cells[:MINUTES_PER_DAY]
+
+
+def runs(cells: List[int], width: int = 1) -> List[Run]:
+    """Collapse consecutive equal occupied cells into (start, end, index) runs."""
+    result = []
+    position = 0
+    for value, group in groupby(cells):
+        length = sum(1 for _ in group)
+        if value != EMPTY:
+            result.append((position * width, (position + length) * width, value))
+        position += length
+    return result
+
+
+def diff_runs(before: List[Run], after: List[Run]) -> List[Tuple[Run, Optional[Run]]]:
+    """Pair each changed original run with the migrated run that replaced it.
+
+    The replacement is the run with the same palette index that overlaps the
+    original the most, or None if the original was lost entirely.
+    """
+    unchanged = set(after)
+    changes = []
+    for run in before:
+        if run in unchanged:
+            continue
+
+        start, end, index = run
+        best: Optional[Run] = None
+        best_overlap = 0
+        for candidate in after:
+            if candidate[2] != index:
+                continue
+            overlap = min(end, candidate[1]) - max(start, candidate[0])
+            if overlap > best_overlap:
+                best, best_overlap = candidate, overlap
+        changes.append((run, best))
+    return changes
+
+
+def changed_minutes(before: List[int], after: List[int]) -> int:
+    """Count the minutes whose target differs between two arrays."""
+    return sum(1 for old, new in zip(before, after) if old != new)
+
+
+def build_slots(day: str, cell_runs: List[Run], palette: List[ScheduleSlot]) -> List[ScheduleSlot]:
+    """Create schedule slots for the given runs."""
+    slots = []
+    for start, end, index in cell_runs:
+        template = palette[index]
+        slots.append(ScheduleSlot.from_minutes(
+            day,
+            start,
+            min(end, MINUTES_PER_DAY - 1),
+            template.target_value,
+            template.entity_domain,
+            template.buffer_override,
+        ))
+    return slots
+
+
+def run_bounds(run: Optional[Run]) -> Optional[Dict[str, Any]]:
+    """Return the start/end strings of a run, as shown in migration previews."""
+    if run is None:
+        return None
+    start, end, _ = run
+    return {
+        "start": f"{start // 60:02d}:{start % 60:02d}",
+        "end": "23:59" if end >= MINUTES_PER_DAY else f"{end // 60:02d}:{end % 60:02d}",
+    }
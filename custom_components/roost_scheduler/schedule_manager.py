@@ -1,18 +1,25 @@
 """Schedule management for the Roost Scheduler integration."""
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from datetime import datetime, time
-from typing import Any, Dict, Optional, List
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any, Callable, Dict, Optional, List
 
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
-from .models import ScheduleSlot, ScheduleData
+from .models import MINUTES_PER_DAY, ScheduleSlot, ScheduleData, time_to_minutes
 from .storage import StorageService
 from .presence_manager import PresenceManager
 from .buffer_manager import BufferManager
-from .const import MODE_HOME, MODE_AWAY, WEEKDAYS
+from .timeline import WeekTimeline, END_OF_DAY_TIME, minute_of_week
+from .resolution import DayCells, build_slots, changed_minutes, diff_runs, expand, run_bounds, runs
+from .const import MODE_HOME, MODE_AWAY, WEEKDAYS, DEFAULT_MAX_CONCURRENT_APPLIES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,18 +28,84 @@ DEBUG_SCHEDULE_EVALUATION = False
 DEBUG_BUFFER_DECISIONS = False
 DEBUG_SERVICE_CALLS = False
 
+# Service and data key used to set the target value for each supported domain
+DOMAIN_SERVICES = {
+    "climate": ("set_temperature", "temperature"),
+    "input_number": ("set_value", "value"),
+    "number": ("set_value", "value"),
+}
+
+
+@dataclass
+class PendingWrite:
+    """A schedule value waiting to be written to an entity."""
+    entity_id: str
+    mode: str
+    force: bool = False
+    slot: Optional[ScheduleSlot] = None
+    target_value: Optional[float] = None
+    # Final outcome when no service call is needed (no slot, suppressed, ...)
+    result: Optional[bool] = None
+
 
 class ScheduleManager:
     """Manages schedule evaluation and execution."""
     
     def __init__(self, hass: HomeAssistant, storage_service: StorageService, 
-                 presence_manager: PresenceManager, buffer_manager: BufferManager) -> None:
+                 presence_manager: PresenceManager, buffer_manager: BufferManager,
+                 max_concurrent_applies: int = DEFAULT_MAX_CONCURRENT_APPLIES) -> None:
         """Initialize the schedule manager."""
         self.hass = hass
         self.storage_service = storage_service
         self.presence_manager = presence_manager
         self.buffer_manager = buffer_manager
-        self._schedule_data: Optional[ScheduleData] = None
+        # Upper bound on entities applied in parallel during bulk application
+        self.max_concurrent_applies = max(1, int(max_concurrent_applies))
+        # The storage service's shared ScheduleData, see the _schedule_data property
+        self._shared_schedule_data: Optional[ScheduleData] = None
+        # Storage service revision the shared instance was last checked at
+        self._seen_storage_revision: Optional[int] = None
+        # Compiled per-mode timelines and the schedule data they were built from
+        self._timelines: Dict[str, WeekTimeline] = {}
+        self._timelines_source: Optional[ScheduleData] = None
+        # Monotonic revision of the in-memory schedule, bumped on every write
+        self._revision = 0
+        # Per-mode grid payloads cached under the revision they were built at
+        self._grid_cache: Dict[str, Dict[str, Any]] = {}
+        # Coverage analysis per (mode, day), recomputed only for touched days
+        self._day_coverage: Dict[tuple, Dict[str, Any]] = {}
+        self._coverage_source: Optional[ScheduleData] = None
+        # Slot boundary timer state
+        self._boundary_timer_active = False
+        self._boundary_unsub: Optional[Callable[[], None]] = None
+        self._next_boundary: Optional[datetime] = None
+    
+    @property
+    def _schedule_data(self) -> Optional[ScheduleData]:
+        """
+        Return the shared schedule data.
+        
+        The storage service installs a new instance on import, recovery,
+        reload and undo. Whenever its revision moves on, the current instance
+        is fetched again so a stale one is never served or saved back.
+        """
+        revision = self._storage_revision()
+        if revision is not None and revision != self._seen_storage_revision:
+            self._seen_storage_revision = revision
+            shared = self.storage_service.get_schedule_data()
+            if shared is not None and shared is not self._shared_schedule_data:
+                self._shared_schedule_data = shared
+                self._mark_schedule_changed()
+        return self._shared_schedule_data
+    
+    @_schedule_data.setter
+    def _schedule_data(self, schedule_data: Optional[ScheduleData]) -> None:
+        self._shared_schedule_data = schedule_data
+    
+    def _storage_revision(self) -> Optional[int]:
+        """Return the storage service's schedule data revision, if it has one."""
+        revision = getattr(self.storage_service, "revision", None)
+        return revision if isinstance(revision, int) else None
     
     async def evaluate_current_slot(self, entity_id: str, mode: str = None) -> Optional[ScheduleSlot]:
         """
@@ -66,32 +139,33 @@ class ScheduleManager:
         if mode is None:
             mode = await self.presence_manager.get_current_mode()
         
-        now = datetime.now()
+        # Same clock as the boundary timer, so a boundary evaluates the slot it starts
+        now = dt_util.now()
         current_day = WEEKDAYS[now.weekday()]
         current_time = now.time()
         
         _LOGGER.debug("Evaluating schedule for %s: day=%s, time=%s, mode=%s", 
                      entity_id, current_day, current_time.strftime("%H:%M"), mode)
         
-        # Get schedules for the current mode and day (Requirement 1.2)
-        mode_schedules = self._schedule_data.schedules.get(mode, {})
-        day_schedules = mode_schedules.get(current_day, [])
+        # Get the compiled timeline for the current mode (Requirement 1.2)
+        timeline = self._get_timeline(mode)
         
-        if not day_schedules:
-            _LOGGER.debug("No schedules found for %s on %s in %s mode", entity_id, current_day, mode)
+        if not timeline:
+            _LOGGER.debug("No schedules found for %s in %s mode", entity_id, mode)
             return None
         
         # Find the slot that contains the current time (Requirement 1.3)
-        for slot in day_schedules:
-            if self._time_in_slot(current_time, slot.start_time, slot.end_time):
-                _LOGGER.debug("Found matching slot for %s: %s-%s (target: %.1f)", 
-                             entity_id, slot.start_time, slot.end_time, slot.target_value)
-                return slot
-        
-        _LOGGER.debug("No matching time slot found for %s at %s", entity_id, current_time.strftime("%H:%M"))
+        slot = timeline.slot_at(minute_of_week(now))
+        if slot:
+            _LOGGER.debug("Found matching slot for %s: %s-%s (target: %.1f)", 
+                         entity_id, slot.start_time, slot.end_time, slot.target_value)
+            return slot
+        
+        _LOGGER.debug("No matching time slot found for %s on %s at %s", 
+                     entity_id, current_day, current_time.strftime("%H:%M"))
         return None
     
-    async def apply_schedule(self, entity_id: str, force: bool = False) -> bool:
+    async def apply_schedule(self, entity_id: str, force: bool = False, mode: Optional[str] = None) -> bool:
         """
         Apply the current schedule for an entity with buffer manager integration.
         
@@ -102,6 +176,8 @@ class ScheduleManager:
         Args:
             entity_id: The entity to apply schedule to
             force: If True, bypass buffer logic and force application
+            mode: Presence mode already evaluated by the caller. If None, will get
+                current mode from presence manager
             
         Returns:
             True if schedule was applied successfully, False otherwise
@@ -109,99 +185,16 @@ class ScheduleManager:
         start_time = datetime.now()
         
         try:
-            if DEBUG_SCHEDULE_EVALUATION:
-                _LOGGER.debug("Starting schedule evaluation for %s (force=%s)", entity_id, force)
-            
-            # Get current presence mode
-            current_mode = await self.presence_manager.get_current_mode()
-            
-            if DEBUG_SCHEDULE_EVALUATION:
-                _LOGGER.debug("Current presence mode: %s", current_mode)
-            
-            # Evaluate current schedule slot
-            current_slot = await self.evaluate_current_slot(entity_id, current_mode)
-            
-            if not current_slot:
-                if DEBUG_SCHEDULE_EVALUATION:
-                    _LOGGER.debug("No active schedule slot for %s in %s mode at %s", 
-                                 entity_id, current_mode, datetime.now().strftime("%H:%M"))
-                return False
-            
-            if DEBUG_SCHEDULE_EVALUATION:
-                _LOGGER.debug("Found active slot for %s: %s-%s (target: %.1f)", 
-                             entity_id, current_slot.start_time, current_slot.end_time, current_slot.target_value)
-            
-            # Get current entity state
-            entity_state = self.hass.states.get(entity_id)
-            if not entity_state:
-                _LOGGER.error("Entity %s not found in Home Assistant", entity_id)
-                return False
-            
-            # Check if entity is available
-            if entity_state.state in ["unavailable", "unknown"]:
-                _LOGGER.warning("Entity %s is %s, skipping schedule application", 
-                               entity_id, entity_state.state)
-                return False
-            
-            target_value = current_slot.target_value
-            
-            # Update buffer manager with current entity value
-            try:
-                current_value = float(entity_state.attributes.get("temperature", entity_state.state))
-                self.buffer_manager.update_current_value(entity_id, current_value)
-                
-                if DEBUG_BUFFER_DECISIONS:
-                    _LOGGER.debug("Current value for %s: %.1f, target: %.1f", 
-                                 entity_id, current_value, target_value)
-                    
-            except (ValueError, TypeError):
-                _LOGGER.warning("Could not parse current value for %s: %s", 
-                               entity_id, entity_state.state)
-                current_value = target_value  # Assume target is current for buffer logic
-            
-            # Check if change should be suppressed by buffer logic (Requirement 1.5)
-            slot_config = current_slot.to_dict()
-            should_suppress = self.buffer_manager.should_suppress_change(
-                entity_id, target_value, slot_config, force
-            )
-            
-            if DEBUG_BUFFER_DECISIONS:
-                _LOGGER.debug("Buffer decision for %s: suppress=%s (force=%s)", 
-                             entity_id, should_suppress, force)
-            
-            if should_suppress and not force:
-                _LOGGER.debug("Schedule application suppressed by buffer logic for %s (current: %.1f, target: %.1f)", 
-                             entity_id, current_value, target_value)
-                return True  # Not an error, just suppressed
+            write = await self._prepare_schedule_write(entity_id, force, mode)
+            if write.result is not None:
+                return write.result
             
             # Apply the schedule value (Requirement 1.4)
             if DEBUG_SERVICE_CALLS:
-                _LOGGER.debug("Applying schedule value %.1f to %s", target_value, entity_id)
-                
-            success = await self._apply_entity_value(entity_id, target_value, current_slot, force)
-            
-            if success:
-                # Record the scheduled change in buffer manager
-                self.buffer_manager.update_scheduled_change(entity_id, target_value)
+                _LOGGER.debug("Applying schedule value %.1f to %s", write.target_value, entity_id)
                 
-                execution_time = (datetime.now() - start_time).total_seconds()
-                _LOGGER.info("Applied schedule for %s: %.1f°C (slot: %s-%s, mode: %s) in %.3fs", 
-                           entity_id, target_value, current_slot.start_time, 
-                           current_slot.end_time, current_mode, execution_time)
-                
-                # Fire event for real-time updates
-                self.hass.bus.async_fire("roost_scheduler_schedule_applied", {
-                    "entity_id": entity_id,
-                    "target_value": target_value,
-                    "mode": current_mode,
-                    "slot_start": current_slot.start_time,
-                    "slot_end": current_slot.end_time,
-                    "forced": force,
-                    "execution_time": execution_time
-                })
-            else:
-                _LOGGER.warning("Failed to apply schedule for %s (target: %.1f)", entity_id, target_value)
-            
+            success = await self._apply_entity_value(entity_id, write.target_value, write.slot, force)
+            self._complete_schedule_write(write, success, (datetime.now() - start_time).total_seconds())
             return success
             
         except Exception as e:
@@ -209,6 +202,114 @@ class ScheduleManager:
             _LOGGER.error("Error applying schedule for %s after %.3fs: %s", entity_id, execution_time, e, exc_info=True)
             return False
     
+    async def _prepare_schedule_write(self, entity_id: str, force: bool = False,
+                                      mode: Optional[str] = None) -> PendingWrite:
+        """
+        Evaluate the schedule for an entity and decide whether a write is needed.
+        
+        Returns:
+            PendingWrite whose result is set if no service call is needed
+        """
+        if DEBUG_SCHEDULE_EVALUATION:
+            _LOGGER.debug("Starting schedule evaluation for %s (force=%s)", entity_id, force)
+        
+        # Get current presence mode
+        current_mode = mode
+        if current_mode is None:
+            current_mode = await self.presence_manager.get_current_mode()
+        
+        if DEBUG_SCHEDULE_EVALUATION:
+            _LOGGER.debug("Current presence mode: %s", current_mode)
+        
+        write = PendingWrite(entity_id=entity_id, mode=current_mode, force=force)
+        
+        # Evaluate current schedule slot
+        current_slot = await self.evaluate_current_slot(entity_id, current_mode)
+        
+        if not current_slot:
+            if DEBUG_SCHEDULE_EVALUATION:
+                _LOGGER.debug("No active schedule slot for %s in %s mode at %s", 
+                             entity_id, current_mode, dt_util.now().strftime("%H:%M"))
+            write.result = False
+            return write
+        
+        if DEBUG_SCHEDULE_EVALUATION:
+            _LOGGER.debug("Found active slot for %s: %s-%s (target: %.1f)", 
+                         entity_id, current_slot.start_time, current_slot.end_time, current_slot.target_value)
+        
+        # Get current entity state
+        entity_state = self.hass.states.get(entity_id)
+        if not entity_state:
+            _LOGGER.error("Entity %s not found in Home Assistant", entity_id)
+            write.result = False
+            return write
+        
+        # Check if entity is available
+        if entity_state.state in ["unavailable", "unknown"]:
+            _LOGGER.warning("Entity %s is %s, skipping schedule application", 
+                           entity_id, entity_state.state)
+            write.result = False
+            return write
+        
+        target_value = current_slot.target_value
+        write.slot = current_slot
+        write.target_value = target_value
+        
+        # Update buffer manager with current entity value
+        try:
+            current_value = float(entity_state.attributes.get("temperature", entity_state.state))
+            self.buffer_manager.update_current_value(entity_id, current_value)
+            
+            if DEBUG_BUFFER_DECISIONS:
+                _LOGGER.debug("Current value for %s: %.1f, target: %.1f", 
+                             entity_id, current_value, target_value)
+                
+        except (ValueError, TypeError):
+            _LOGGER.warning("Could not parse current value for %s: %s", 
+                           entity_id, entity_state.state)
+            current_value = target_value  # Assume target is current for buffer logic
+        
+        # Check if change should be suppressed by buffer logic (Requirement 1.5)
+        slot_config = current_slot.to_dict()
+        should_suppress = self.buffer_manager.should_suppress_change(
+            entity_id, target_value, slot_config, force
+        )
+        
+        if DEBUG_BUFFER_DECISIONS:
+            _LOGGER.debug("Buffer decision for %s: suppress=%s (force=%s)", 
+                         entity_id, should_suppress, force)
+        
+        if should_suppress and not force:
+            _LOGGER.debug("Schedule application suppressed by buffer logic for %s (current: %.1f, target: %.1f)", 
+                         entity_id, current_value, target_value)
+            write.result = True  # Not an error, just suppressed
+        
+        return write
+    
+    def _complete_schedule_write(self, write: PendingWrite, success: bool, execution_time: float) -> None:
+        """Record the outcome of a schedule write and notify listeners."""
+        if not success:
+            _LOGGER.warning("Failed to apply schedule for %s (target: %.1f)", write.entity_id, write.target_value)
+            return
+        
+        # Record the scheduled change in buffer manager
+        self.buffer_manager.update_scheduled_change(write.entity_id, write.target_value)
+        
+        _LOGGER.info("Applied schedule for %s: %.1f°C (slot: %s-%s, mode: %s) in %.3fs", 
+                   write.entity_id, write.target_value, write.slot.start_time, 
+                   write.slot.end_time, write.mode, execution_time)
+        
+        # Fire event for real-time updates
+        self.hass.bus.async_fire("roost_scheduler_schedule_applied", {
+            "entity_id": write.entity_id,
+            "target_value": write.target_value,
+            "mode": write.mode,
+            "slot_start": write.slot.start_time,
+            "slot_end": write.slot.end_time,
+            "forced": write.force,
+            "execution_time": execution_time
+        })
+    
     async def update_slot(self, entity_id: str, mode: str, day: str, time_slot: str, target: Dict[str, Any]) -> bool:
         """
         Update a specific schedule slot for individual schedule modifications.
@@ -225,126 +326,286 @@ class ScheduleManager:
         Returns:
             True if slot was updated successfully, False otherwise
         """
+        try:
+            target_value = float(target.get("temperature"))
+        except (AttributeError, TypeError, ValueError):
+            target_value = None
+        
+        result = await self.update_slots(
+            entity_id,
+            mode,
+            [{"day": day, "time": time_slot, "target": target}],
+            event_data={
+                "day": day.lower() if isinstance(day, str) else day,
+                "time_slot": time_slot,
+                "target_value": target_value
+            }
+        )
+        return result["success"]
+    
+    async def update_slots(self, entity_id: str, mode: str, changes: List[Dict[str, Any]],
+                           event_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Apply a batch of slot changes atomically.
+        
+        Each change has a "day", a "time" ("HH:MM-HH:MM", or "HH:MM" for a single
+        grid cell at the current resolution) and either a "value" or a "target"
+        dictionary as accepted by update_slot. A change replaces the slot with the
+        same start and end time, or adds a new slot. Every change is validated
+        before the schedule is touched, the result is persisted once and a single
+        schedule_updated event is fired. If any change is invalid or saving fails,
+        nothing is applied.
+        
+        Args:
+            entity_id: The entity to update schedules for
+            mode: The presence mode (home/away)
+            changes: The slot changes to apply
+            event_data: Extra fields to include in the schedule_updated event
+            
+        Returns:
+            Dictionary with success flag, applied changes, errors and schedule revision
+        """
+        result: Dict[str, Any] = {
+            "success": False,
+            "applied": [],
+            "errors": [],
+            "revision": self._revision
+        }
+        
         try:
             if not self._schedule_data:
                 await self._load_schedule_data()
             
             if not self._schedule_data:
-                _LOGGER.error("No schedule data available for slot update")
-                return False
-            
-            # Validate inputs
-            if day.lower() not in [d.lower() for d in WEEKDAYS]:
-                _LOGGER.error("Invalid day: %s", day)
-                return False
-            
-            if entity_id not in self._schedule_data.entities_tracked:
-                _LOGGER.error("Entity %s is not tracked in schedules", entity_id)
-                return False
-            
-            # Parse time slot (format: "HH:MM-HH:MM")
-            try:
-                start_time, end_time = time_slot.split('-')
-                start_time = start_time.strip()
-                end_time = end_time.strip()
-            except ValueError:
-                _LOGGER.error("Invalid time slot format: %s (expected HH:MM-HH:MM)", time_slot)
-                return False
-            
-            # Validate target configuration
-            if not isinstance(target, dict):
-                _LOGGER.error("Target must be a dictionary")
-                return False
-            
-            target_temp = target.get("temperature")
-            if target_temp is None:
-                _LOGGER.error("Target temperature is required")
-                return False
+                result["errors"].append({"change": None, "error": "No schedule data available for slot update"})
+            elif entity_id not in self._schedule_data.entities_tracked:
+                result["errors"].append({"change": None, "error": f"Entity {entity_id} is not tracked in schedules"})
+            elif mode not in [MODE_HOME, MODE_AWAY]:
+                result["errors"].append({"change": None, "error": f"Invalid mode: {mode}"})
+            
+            if result["errors"]:
+                _LOGGER.error("Rejected slot update for %s: %s", entity_id, result["errors"][0]["error"])
+                return result
+            
+            # Build and validate every slot before touching the schedule
+            new_slots = []
+            for change in changes:
+                try:
+                    new_slots.append((change, self._build_slot_from_change(change)))
+                except (ValueError, TypeError, AttributeError) as e:
+                    result["errors"].append({"change": change, "error": str(e)})
+            
+            if not result["errors"]:
+                working_days = self._apply_slot_changes(mode, [slot for _change, slot in new_slots])
+                result["errors"].extend(self._find_day_overlaps(working_days))
+            
+            if result["errors"]:
+                for error in result["errors"]:
+                    _LOGGER.error("Invalid slot change %s for %s: %s", error["change"], entity_id, error["error"])
+                return result
+            
+            # Commit the new day lists, keeping the old ones to roll back to
+            mode_schedules = self._schedule_data.schedules.setdefault(mode, {})
+            previous_days = {day: mode_schedules.get(day) for day in working_days}
+            touched_days = [(mode, day) for day in working_days]
+            mode_schedules.update(working_days)
+            self._mark_schedule_changed(touched_days)
             
             try:
-                target_temp = float(target_temp)
-            except (ValueError, TypeError):
-                _LOGGER.error("Invalid target temperature: %s", target_temp)
-                return False
-            
-            # Use provided mode for slot updates
-            if mode not in [MODE_HOME, MODE_AWAY]:
-                _LOGGER.error("Invalid mode: %s", mode)
-                return False
-            
-            # Create new schedule slot
-            new_slot = ScheduleSlot(
-                day=day.lower(),
-                start_time=start_time,
-                end_time=end_time,
-                target_value=target_temp,
-                entity_domain=target.get("domain", "climate"),
-                buffer_override=None  # Will be set if provided
-            )
+                await self.storage_service.save_schedules(self._schedule_data)
+            except Exception as e:
+                for day, day_slots in previous_days.items():
+                    if day_slots is None:
+                        mode_schedules.pop(day, None)
+                    else:
+                        mode_schedules[day] = day_slots
+                self._mark_schedule_changed(touched_days)
+                result["errors"].append({"change": None, "error": f"Failed to save schedules: {e}"})
+                result["revision"] = self._revision
+                _LOGGER.error("Failed to save slot update for %s, changes rolled back: %s", entity_id, e)
+                return result
+            
+            result["success"] = True
+            result["applied"] = [change for change, _slot in new_slots]
+            result["revision"] = self._revision
+            
+            # Emit one event for real-time updates
+            from .const import DOMAIN
+            event = {
+                "entity_id": entity_id,
+                "mode": mode,
+                "changes": [
+                    {
+                        "day": slot.day,
+                        "time": change.get("time", change.get("time_slot")),
+                        "value": slot.target_value
+                    }
+                    for change, slot in new_slots
+                ],
+                "revision": self._revision
+            }
+            event.update(event_data or {})
+            self.hass.bus.async_fire(f"{DOMAIN}_schedule_updated", event)
             
-            # Add buffer override if provided
-            if "buffer_override" in target:
-                try:
-                    from .models import BufferConfig
-                    new_slot.buffer_override = BufferConfig.from_dict(target["buffer_override"])
-                except Exception as e:
-                    _LOGGER.warning("Invalid buffer override in slot update: %s", e)
+            _LOGGER.info("Updated %d schedule slot(s) for %s in %s mode", 
+                        len(new_slots), entity_id, mode)
             
-            # Update the schedule data
-            if mode not in self._schedule_data.schedules:
-                self._schedule_data.schedules[mode] = {}
+            await self._async_arm_boundary_timer()
             
-            if day.lower() not in self._schedule_data.schedules[mode]:
-                self._schedule_data.schedules[mode][day.lower()] = []
+            return result
             
-            day_slots = self._schedule_data.schedules[mode][day.lower()]
+        except Exception as e:
+            _LOGGER.error("Error updating slots for %s: %s", entity_id, e)
+            result["errors"].append({"change": None, "error": str(e)})
+            return result
+    
+    async def undo_last_change(self) -> Dict[str, Any]:
+        """
+        Revert the most recent schedule change recorded in the storage journal.
+        
+        Only available when the storage service journals changes. Fires a
+        schedule_updated event for every tracked entity so cards refresh.
+        
+        Returns:
+            Dictionary with success flag, error and schedule revision
+        """
+        result: Dict[str, Any] = {"success": False, "error": None, "revision": self._revision}
+        
+        try:
+            schedule_data = await self.storage_service.undo_last_change()
+        except Exception as e:
+            _LOGGER.error("Error undoing schedule change: %s", e)
+            result["error"] = str(e)
+            return result
+        
+        if schedule_data is None:
+            result["error"] = "Nothing to undo"
+            return result
+        
+        # The storage service replaced the shared instance
+        self._schedule_data = schedule_data
+        self._seen_storage_revision = self._storage_revision()
+        self._mark_schedule_changed()
+        result["success"] = True
+        result["revision"] = self._revision
+        
+        from .const import DOMAIN
+        for entity_id in schedule_data.entities_tracked:
+            self.hass.bus.async_fire(f"{DOMAIN}_schedule_updated", {
+                "entity_id": entity_id,
+                "undo": True,
+                "revision": self._revision
+            })
+        
+        await self._async_arm_boundary_timer()
+        _LOGGER.info("Undid the last schedule change")
+        return result
+    
+    def _build_slot_from_change(self, change: Dict[str, Any]) -> ScheduleSlot:
+        """Build and validate the schedule slot described by a slot change."""
+        day = change.get("day")
+        if not isinstance(day, str) or day.lower() not in WEEKDAYS:
+            raise ValueError(f"Invalid day: {day}")
+        day = day.lower()
+        
+        start_time, end_time = self._parse_time_slot(change.get("time", change.get("time_slot")))
+        
+        target = change.get("target")
+        if target is None:
+            target = {"temperature": change.get("value")}
+        
+        if not isinstance(target, dict):
+            raise ValueError("Target must be a dictionary")
+        
+        target_temp = target.get("temperature")
+        if target_temp is None:
+            raise ValueError("Target temperature is required")
+        
+        try:
+            target_temp = float(target_temp)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid target temperature: {target_temp}")
+        
+        new_slot = ScheduleSlot(
+            day=day,
+            start_time=start_time,
+            end_time=end_time,
+            target_value=target_temp,
+            entity_domain=target.get("domain", "climate"),
+            buffer_override=None  # Will be set if provided
+        )
+        
+        # Add buffer override if provided
+        if "buffer_override" in target:
+            try:
+                from .models import BufferConfig
+                new_slot.buffer_override = BufferConfig.from_dict(target["buffer_override"])
+            except Exception as e:
+                _LOGGER.warning("Invalid buffer override in slot update: %s", e)
+        
+        return new_slot
+    
+    def _parse_time_slot(self, time_slot: Any) -> tuple[str, str]:
+        """
+        Parse a time slot into start and end times.
+        
+        Accepts "HH:MM-HH:MM", or "HH:MM" for a single grid cell starting there.
+        """
+        if not isinstance(time_slot, str):
+            raise ValueError(f"Invalid time slot format: {time_slot} (expected HH:MM-HH:MM)")
+        
+        if '-' not in time_slot:
+            start_time = time_slot.strip()
+            resolution = self._schedule_data.ui.get("resolution_minutes", 30)
+            end_minutes = time_to_minutes(start_time) + resolution
+            if end_minutes >= MINUTES_PER_DAY:
+                return start_time, END_OF_DAY_TIME
+            return start_time, self._minutes_to_time(end_minutes)
+        
+        try:
+            start_time, end_time = time_slot.split('-')
+        except ValueError:
+            raise ValueError(f"Invalid time slot format: {time_slot} (expected HH:MM-HH:MM)")
+        
+        return start_time.strip(), end_time.strip()
+    
+    def _apply_slot_changes(self, mode: str, slots: List[ScheduleSlot]) -> Dict[str, List[ScheduleSlot]]:
+        """Apply slots to copies of the affected day lists and return them by day."""
+        mode_schedules = self._schedule_data.schedules.get(mode, {})
+        working_days: Dict[str, List[ScheduleSlot]] = {}
+        
+        for new_slot in slots:
+            if new_slot.day not in working_days:
+                working_days[new_slot.day] = list(mode_schedules.get(new_slot.day, []))
+            day_slots = working_days[new_slot.day]
             
             # Find and replace existing slot or add new one
-            slot_updated = False
             for i, existing_slot in enumerate(day_slots):
-                if (existing_slot.start_time == start_time and 
-                    existing_slot.end_time == end_time):
+                if (existing_slot.start_time == new_slot.start_time and 
+                    existing_slot.end_time == new_slot.end_time):
                     day_slots[i] = new_slot
-                    slot_updated = True
                     break
-            
-            if not slot_updated:
-                # Add new slot and sort by start time
+            else:
                 day_slots.append(new_slot)
-                day_slots.sort(key=lambda s: s.start_time)
-            
-            # Validate no overlaps
+        
+        for day_slots in working_days.values():
+            day_slots.sort(key=lambda s: s.start_minute)
+        
+        return working_days
+    
+    def _find_day_overlaps(self, days: Dict[str, List[ScheduleSlot]]) -> List[Dict[str, Any]]:
+        """Check sorted day slot lists for overlaps."""
+        errors = []
+        for day, day_slots in days.items():
             for i in range(len(day_slots) - 1):
                 if day_slots[i].overlaps_with(day_slots[i + 1]):
-                    _LOGGER.error("Slot update would create overlap on %s", day)
-                    return False
-            
-            # Save updated schedule data
-            await self.storage_service.save_schedules(self._schedule_data.to_dict())
-            
-            # Emit event for real-time updates
-            from .const import DOMAIN
-            self.hass.bus.async_fire(f"{DOMAIN}_schedule_updated", {
-                "entity_id": entity_id,
-                "mode": mode,
-                "day": day.lower(),
-                "time_slot": time_slot,
-                "target_value": target_temp,
-                "changes": [{
-                    "day": day.lower(),
-                    "time": time_slot,
-                    "value": target_temp
-                }]
-            })
-            
-            _LOGGER.info("Updated schedule slot for %s on %s: %s (%.1f°C)", 
-                        entity_id, day, time_slot, target_temp)
-            
-            return True
-            
-        except Exception as e:
-            _LOGGER.error("Error updating slot for %s: %s", entity_id, e)
-            return False
+                    errors.append({
+                        "change": None,
+                        "error": (f"Slot update would create overlap on {day}: "
+                                  f"{day_slots[i].start_time}-{day_slots[i].end_time} overlaps with "
+                                  f"{day_slots[i + 1].start_time}-{day_slots[i + 1].end_time}")
+                    })
+        return errors
     
     async def get_schedule_grid(self, entity_id: str, mode: str) -> Dict[str, Any]:
         """
@@ -352,6 +613,10 @@ class ScheduleManager:
         
         Implements requirement 1.1: Display schedule grid with configurable time resolution.
         
+        The grid, totals and coverage analysis are cached per mode under the
+        schedule revision, so only the current slot is evaluated per call. The
+        returned grid is shared with the cache and must be treated as read-only.
+        
         Args:
             entity_id: The entity to get schedules for
             mode: The presence mode (home/away)
@@ -359,6 +624,38 @@ class ScheduleManager:
         Returns:
             Dictionary containing grid data for frontend consumption
         """
+        error = await self._get_grid_error(entity_id, mode)
+        if error:
+            return error
+        
+        response = {
+            "mode": mode,
+            "entity_id": entity_id,
+            "current_slot": await self._get_current_slot_info(entity_id, mode)
+        }
+        response.update(self._get_cached_grid(mode)["payload"])
+        return response
+    
+    async def get_schedule_grid_json(self, entity_id: str, mode: str) -> str:
+        """
+        Get the schedule grid as a JSON string for the websocket API.
+        
+        The cached grid is stored pre-serialized, so only the small per-request
+        fields are encoded and spliced in front of it.
+        """
+        error = await self._get_grid_error(entity_id, mode)
+        if error:
+            return json.dumps(error, separators=(",", ":"))
+        
+        header = json.dumps({
+            "mode": mode,
+            "entity_id": entity_id,
+            "current_slot": await self._get_current_slot_info(entity_id, mode)
+        }, separators=(",", ":"))
+        return header[:-1] + "," + self._get_cached_grid(mode)["json"][1:]
+    
+    async def _get_grid_error(self, entity_id: str, mode: str) -> Optional[Dict[str, Any]]:
+        """Return the grid error response if no grid can be built for the entity."""
         if not self._schedule_data:
             await self._load_schedule_data()
         
@@ -383,6 +680,46 @@ class ScheduleManager:
                 "error": f"Entity {entity_id} is not tracked"
             }
         
+        return None
+    
+    async def _get_current_slot_info(self, entity_id: str, mode: str) -> Optional[Dict[str, Any]]:
+        """Get the current slot for highlighting in the grid."""
+        current_slot = await self.evaluate_current_slot(entity_id, mode)
+        if not current_slot:
+            return None
+        
+        return {
+            "day": current_slot.day,
+            "start": current_slot.start_time,
+            "end": current_slot.end_time,
+            "target_value": current_slot.target_value
+        }
+    
+    def _get_cached_grid(self, mode: str) -> Dict[str, Any]:
+        """Get the cached grid payload for a mode, building it if stale."""
+        # Writes through other managers bump only the storage revision
+        schedule_data = self._schedule_data
+        storage_revision = self._storage_revision()
+        cached = self._grid_cache.get(mode)
+        if (cached and cached["revision"] == self._revision 
+                and cached["storage_revision"] == storage_revision
+                and cached["source"] is schedule_data):
+            return cached
+        
+        payload = self._build_grid_payload(mode)
+        cached = {
+            "revision": self._revision,
+            "storage_revision": storage_revision,
+            "source": schedule_data,
+            "payload": payload,
+            "json": json.dumps(payload, separators=(",", ":"))
+        }
+        self._grid_cache[mode] = cached
+        _LOGGER.debug("Built schedule grid for %s mode at revision %d", mode, self._revision)
+        return cached
+    
+    def _build_grid_payload(self, mode: str) -> Dict[str, Any]:
+        """Build the revision-dependent part of a mode's grid response."""
         mode_schedules = self._schedule_data.schedules.get(mode, {})
         resolution_minutes = self._schedule_data.ui.get("resolution_minutes", 30)
         
@@ -392,35 +729,22 @@ class ScheduleManager:
             day_slots = mode_schedules.get(day, [])
             
             # Sort slots by start time for consistent ordering
-            sorted_slots = sorted(day_slots, key=lambda s: s.start_time)
+            sorted_slots = sorted(day_slots, key=lambda s: s.start_minute)
             
             grid[day] = []
             for slot in sorted_slots:
                 slot_dict = slot.to_dict()
                 # Add additional metadata for frontend
                 slot_dict["day"] = day
-                slot_dict["duration_minutes"] = self._calculate_slot_duration(slot.start_time, slot.end_time)
+                slot_dict["duration_minutes"] = slot.end_minute - slot.start_minute
                 grid[day].append(slot_dict)
         
-        # Get current slot for highlighting
-        current_slot = await self.evaluate_current_slot(entity_id, mode)
-        current_slot_info = None
-        if current_slot:
-            current_slot_info = {
-                "day": current_slot.day,
-                "start": current_slot.start_time,
-                "end": current_slot.end_time,
-                "target_value": current_slot.target_value
-            }
-        
         return {
-            "mode": mode,
-            "entity_id": entity_id,
             "grid": grid,
             "resolution_minutes": resolution_minutes,
-            "current_slot": current_slot_info,
             "total_slots": sum(len(day_slots) for day_slots in grid.values()),
-            "coverage_analysis": self._analyze_schedule_coverage(mode_schedules)
+            "coverage_analysis": self._get_mode_coverage(mode),
+            "revision": self._revision
         }
     
     async def apply_slot_service(self, call: ServiceCall) -> None:
@@ -737,28 +1061,15 @@ class ScheduleManager:
         
         return errors
     
-    def _time_in_slot(self, current_time: time, start_str: str, end_str: str) -> bool:
-        """Check if current time falls within a schedule slot."""
-        try:
-            start_time = time.fromisoformat(start_str)
-            end_time = time.fromisoformat(end_str)
-            
-            # Handle slots that cross midnight
-            if start_time <= end_time:
-                return start_time <= current_time <= end_time
-            else:
-                return current_time >= start_time or current_time <= end_time
-        except ValueError as e:
-            _LOGGER.error("Invalid time format in slot: start=%s, end=%s, error=%s", 
-                         start_str, end_str, e)
-            return False
-    
     async def _load_schedule_data(self) -> None:
         """Load schedule data from storage."""
         try:
             data = await self.storage_service.load_schedules()
             if data:
-                self._schedule_data = ScheduleData.from_dict(data)
+                # Share the storage service's instance rather than keeping a copy
+                self._schedule_data = data if isinstance(data, ScheduleData) else ScheduleData.from_dict(data)
+                self._mark_schedule_changed()
+                self._rebuild_timelines()
                 _LOGGER.debug("Loaded schedule data for %d entities", 
                              len(self._schedule_data.entities_tracked))
             else:
@@ -766,285 +1077,165 @@ class ScheduleManager:
         except Exception as e:
             _LOGGER.error("Failed to load schedule data: %s", e)
             self._schedule_data = None
+            self._mark_schedule_changed()
     
-    async def migrate_resolution(self, new_resolution_minutes: int, preview: bool = True) -> Dict[str, Any]:
+    def _get_timeline(self, mode: str) -> Optional[WeekTimeline]:
+        """Get the compiled timeline for a mode, rebuilding it if the data changed."""
+        if self._timelines_source is not self._schedule_data:
+            self._rebuild_timelines()
+        return self._timelines.get(mode)
+    
+    def _rebuild_timelines(self) -> None:
+        """Compile every mode's schedules into a minute-of-week timeline."""
+        self._timelines = {}
+        self._timelines_source = self._schedule_data
+        if not self._schedule_data:
+            return
+        
+        for mode, mode_schedules in self._schedule_data.schedules.items():
+            self._timelines[mode] = WeekTimeline(mode_schedules)
+        
+        _LOGGER.debug("Compiled schedule timelines: %s", 
+                     {mode: len(timeline) for mode, timeline in self._timelines.items()})
+    
+    def _invalidate_timelines(self) -> None:
+        """Mark compiled timelines as stale so the next lookup rebuilds them."""
+        self._timelines_source = None
+    
+    @property
+    def schedule_revision(self) -> int:
+        """Return the revision of the in-memory schedule."""
+        return self._revision
+    
+    def _mark_schedule_changed(self, touched_days: Optional[List[tuple]] = None) -> None:
         """
-        Migrate schedule resolution with preview and user confirmation.
+        Record a write to the schedule, invalidating everything derived from it.
         
-        Implements requirement 1.4: Handle changing time resolution with preview system.
+        Args:
+            touched_days: (mode, day) pairs changed by the write. If None, the
+                whole schedule is treated as changed
+        """
+        self._revision += 1
+        self._grid_cache.clear()
+        self._invalidate_timelines()
+        
+        if touched_days is None:
+            self._day_coverage.clear()
+        else:
+            for mode_day in touched_days:
+                self._day_coverage.pop(mode_day, None)
+    
+    async def async_start_boundary_timer(self) -> None:
+        """
+        Start applying schedules automatically at slot boundaries.
+        
+        A single timer is armed for the next slot start in the current presence
+        mode. When it fires, all tracked entities are applied and the timer is
+        re-armed for the following boundary. Mode changes and slot edits re-arm
+        the timer instead of polling.
+        """
+        if self._boundary_timer_active:
+            return
+        
+        self._boundary_timer_active = True
+        await self.presence_manager.register_mode_change_callback(self._handle_mode_change)
+        await self._async_arm_boundary_timer()
+    
+    def cancel_boundary_timer(self) -> None:
+        """Stop the slot boundary timer."""
+        self._boundary_timer_active = False
+        self._cancel_pending_boundary()
+        _LOGGER.debug("Slot boundary timer stopped")
+    
+    def get_next_boundary(self, mode: str, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Get the next slot start after now for a mode.
+        
+        The boundary is built from the local wall-clock time of the slot, so it
+        stays on the configured hour across DST transitions.
         
         Args:
-            new_resolution_minutes: New time resolution (15, 30, or 60 minutes)
-            preview: If True, return preview without applying changes
+            mode: The presence mode (home/away)
+            now: Timezone-aware reference time, defaults to the current local time
             
         Returns:
-            Dictionary containing migration preview or results
+            Timezone-aware datetime of the next boundary, or None if the mode has no slots
         """
+        timeline = self._get_timeline(mode)
+        if not timeline:
+            return None
+        
+        if now is None:
+            now = dt_util.now()
+        
+        next_minute = timeline.next_start_after(minute_of_week(now))
+        if next_minute is None:
+            return None
+        
+        day_offset, minute_of_day = divmod(next_minute, MINUTES_PER_DAY)
+        boundary_date = now.date() + timedelta(days=day_offset - now.weekday())
+        boundary_time = time(minute_of_day // 60, minute_of_day % 60)
+        return datetime.combine(boundary_date, boundary_time, tzinfo=now.tzinfo)
+    
+    async def _async_arm_boundary_timer(self) -> None:
+        """Arm the timer for the next slot boundary, replacing any pending one."""
+        self._cancel_pending_boundary()
+        
+        if not self._boundary_timer_active:
+            return
+        
         if not self._schedule_data:
             await self._load_schedule_data()
         
-        if not self._schedule_data:
-            raise ValueError("No schedule data available for migration")
+        mode = await self.presence_manager.get_current_mode()
+        next_boundary = self.get_next_boundary(mode)
         
-        # Validate new resolution
-        valid_resolutions = [15, 30, 60]
-        if new_resolution_minutes not in valid_resolutions:
-            raise ValueError(f"Resolution must be one of {valid_resolutions}, got {new_resolution_minutes}")
+        if next_boundary is None:
+            _LOGGER.debug("No slot boundaries in %s mode, boundary timer not armed", mode)
+            return
         
-        current_resolution = self._schedule_data.ui.get("resolution_minutes", 30)
+        self._next_boundary = next_boundary
+        self._boundary_unsub = async_track_point_in_time(
+            self.hass, self._handle_slot_boundary, next_boundary
+        )
+        _LOGGER.debug("Armed slot boundary timer for %s (%s mode)", next_boundary.isoformat(), mode)
+    
+    def _cancel_pending_boundary(self) -> None:
+        """Cancel the pending boundary timer, if any."""
+        if self._boundary_unsub:
+            self._boundary_unsub()
+            self._boundary_unsub = None
+        self._next_boundary = None
+    
+    async def _handle_slot_boundary(self, now: datetime) -> None:
+        """Apply schedules when a slot boundary is reached and re-arm."""
+        # The timer has fired, so there is nothing left to cancel
+        self._boundary_unsub = None
+        _LOGGER.debug("Slot boundary reached at %s", now.isoformat())
         
-        if current_resolution == new_resolution_minutes:
-            return {
-                "status": "no_change",
-                "message": f"Resolution is already {new_resolution_minutes} minutes",
-                "current_resolution": current_resolution,
-                "new_resolution": new_resolution_minutes
-            }
-        
-        _LOGGER.info("Starting resolution migration from %d to %d minutes (preview=%s)", 
-                    current_resolution, new_resolution_minutes, preview)
-        
-        # Create migration preview
-        migration_preview = {
-            "status": "preview" if preview else "applied",
-            "current_resolution": current_resolution,
-            "new_resolution": new_resolution_minutes,
-            "changes": {},
-            "warnings": [],
-            "total_slots_before": 0,
-            "total_slots_after": 0
-        }
-        
-        # Process each mode and day
-        migrated_schedules = {}
-        for mode, mode_schedules in self._schedule_data.schedules.items():
-            migrated_schedules[mode] = {}
-            migration_preview["changes"][mode] = {}
-            
-            for day, slots in mode_schedules.items():
-                migration_preview["total_slots_before"] += len(slots)
-                
-                # Migrate slots for this day
-                migrated_slots, day_changes = self._migrate_day_slots(
-                    slots, current_resolution, new_resolution_minutes
-                )
-                
-                migrated_schedules[mode][day] = migrated_slots
-                migration_preview["changes"][mode][day] = day_changes
-                migration_preview["total_slots_after"] += len(migrated_slots)
-                
-                # Check for potential issues
-                warnings = self._validate_migrated_slots(migrated_slots, day, mode)
-                migration_preview["warnings"].extend(warnings)
-        
-        # Add summary statistics
-        migration_preview["summary"] = {
-            "slots_changed": migration_preview["total_slots_after"] - migration_preview["total_slots_before"],
-            "resolution_factor": new_resolution_minutes / current_resolution,
-            "data_loss_risk": current_resolution < new_resolution_minutes,
-            "precision_gain": current_resolution > new_resolution_minutes
-        }
-        
-        # If not preview, apply the migration
-        if not preview:
-            try:
-                # Update schedule data
-                self._schedule_data.schedules = migrated_schedules
-                self._schedule_data.ui["resolution_minutes"] = new_resolution_minutes
-                self._schedule_data.metadata["last_modified"] = datetime.now().isoformat()
-                self._schedule_data.metadata["last_migration"] = {
-                    "from_resolution": current_resolution,
-                    "to_resolution": new_resolution_minutes,
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-                # Save updated data
-                await self.storage_service.save_schedules(self._schedule_data.to_dict())
-                
-                # Emit event for real-time updates
-                from .const import DOMAIN
-                self.hass.bus.async_fire(f"{DOMAIN}_resolution_migrated", {
-                    "from_resolution": current_resolution,
-                    "to_resolution": new_resolution_minutes,
-                    "total_changes": migration_preview["total_slots_after"] - migration_preview["total_slots_before"]
-                })
-                
-                _LOGGER.info("Resolution migration completed: %d -> %d minutes", 
-                           current_resolution, new_resolution_minutes)
-                
-            except Exception as e:
-                _LOGGER.error("Error applying resolution migration: %s", e)
-                migration_preview["status"] = "error"
-                migration_preview["error"] = str(e)
-        
-        return migration_preview
-    
-    def _migrate_day_slots(self, slots: List[ScheduleSlot], current_res: int, new_res: int) -> tuple[List[ScheduleSlot], Dict[str, Any]]:
-        """
-        Migrate slots for a single day to new resolution.
-        
-        Args:
-            slots: List of current schedule slots
-            current_res: Current resolution in minutes
-            new_res: New resolution in minutes
-            
-        Returns:
-            Tuple of (migrated_slots, change_summary)
-        """
-        if not slots:
-            return [], {"original_count": 0, "new_count": 0, "changes": []}
-        
-        migrated_slots = []
-        changes = []
-        
-        # Sort slots by start time
-        sorted_slots = sorted(slots, key=lambda s: s.start_time)
-        
-        for slot in sorted_slots:
-            # Convert times to minutes since midnight
-            start_minutes = self._time_to_minutes(slot.start_time)
-            end_minutes = self._time_to_minutes(slot.end_time)
-            
-            # Align to new resolution boundaries
-            new_start_minutes = self._align_to_resolution(start_minutes, new_res)
-            new_end_minutes = self._align_to_resolution(end_minutes, new_res, align_up=True)
-            
-            # Ensure minimum slot duration (at least one resolution unit)
-            if new_end_minutes <= new_start_minutes:
-                new_end_minutes = new_start_minutes + new_res
-            
-            # Convert back to time strings
-            new_start_time = self._minutes_to_time(new_start_minutes)
-            new_end_time = self._minutes_to_time(new_end_minutes)
-            
-            # Create migrated slot
-            migrated_slot = ScheduleSlot(
-                day=slot.day,
-                start_time=new_start_time,
-                end_time=new_end_time,
-                target_value=slot.target_value,
-                entity_domain=slot.entity_domain,
-                buffer_override=slot.buffer_override
-            )
-            
-            # Track changes
-            if (slot.start_time != new_start_time or slot.end_time != new_end_time):
-                changes.append({
-                    "original": {"start": slot.start_time, "end": slot.end_time},
-                    "migrated": {"start": new_start_time, "end": new_end_time},
-                    "target_value": slot.target_value
-                })
-            
-            migrated_slots.append(migrated_slot)
-        
-        # Merge overlapping slots with same target value
-        merged_slots = self._merge_overlapping_slots(migrated_slots)
-        
-        return merged_slots, {
-            "original_count": len(slots),
-            "new_count": len(merged_slots),
-            "changes": changes,
-            "merged": len(migrated_slots) != len(merged_slots)
-        }
-    
-    def _align_to_resolution(self, minutes: int, resolution: int, align_up: bool = False) -> int:
-        """Align time in minutes to resolution boundary."""
-        if align_up:
-            return ((minutes + resolution - 1) // resolution) * resolution
-        else:
-            return (minutes // resolution) * resolution
-    
-    def _time_to_minutes(self, time_str: str) -> int:
-        """Convert time string to minutes since midnight."""
         try:
-            hour, minute = map(int, time_str.split(':'))
-            return hour * 60 + minute
-        except (ValueError, AttributeError):
-            raise ValueError(f"Invalid time format: {time_str}")
-    
-    def _minutes_to_time(self, minutes: int) -> str:
-        """Convert minutes since midnight to time string."""
-        # Handle special case for exactly 1440 minutes (24:00) - convert to 23:59
-        if minutes >= 24 * 60:
-            return "23:59"
-        
-        hour = minutes // 60
-        minute = minutes % 60
-        
-        return f"{hour:02d}:{minute:02d}"
+            await self.apply_all_tracked_entities()
+        except Exception as e:
+            _LOGGER.error("Error applying schedules at slot boundary: %s", e)
+        finally:
+            await self._async_arm_boundary_timer()
     
-    def _merge_overlapping_slots(self, slots: List[ScheduleSlot]) -> List[ScheduleSlot]:
-        """Merge overlapping slots with the same target value."""
-        if not slots:
-            return []
-        
-        # Sort by start time
-        sorted_slots = sorted(slots, key=lambda s: s.start_time)
-        merged = [sorted_slots[0]]
-        
-        for current in sorted_slots[1:]:
-            last_merged = merged[-1]
-            
-            # Check if slots can be merged (adjacent or overlapping with same target)
-            if (self._time_to_minutes(current.start_time) <= self._time_to_minutes(last_merged.end_time) and
-                abs(current.target_value - last_merged.target_value) < 0.1 and
-                current.entity_domain == last_merged.entity_domain):
-                
-                # Extend the last merged slot
-                if self._time_to_minutes(current.end_time) > self._time_to_minutes(last_merged.end_time):
-                    last_merged.end_time = current.end_time
-            else:
-                merged.append(current)
+    def _handle_mode_change(self, mode: str) -> None:
+        """Apply the new mode's schedules and re-arm the boundary timer."""
+        if not self._boundary_timer_active:
+            return
         
-        return merged
+        _LOGGER.debug("Presence mode changed to %s, re-arming boundary timer", mode)
+        self.hass.async_create_task(self._async_handle_mode_change())
     
-    def _validate_migrated_slots(self, slots: List[ScheduleSlot], day: str, mode: str) -> List[str]:
-        """Validate migrated slots and return warnings."""
-        warnings = []
-        
-        if not slots:
-            warnings.append(f"No slots after migration for {mode} mode on {day}")
-            return warnings
-        
-        # Check for overlaps
-        sorted_slots = sorted(slots, key=lambda s: s.start_time)
-        for i in range(len(sorted_slots) - 1):
-            if sorted_slots[i].overlaps_with(sorted_slots[i + 1]):
-                warnings.append(
-                    f"Overlapping slots after migration in {mode}/{day}: "
-                    f"{sorted_slots[i].start_time}-{sorted_slots[i].end_time} and "
-                    f"{sorted_slots[i + 1].start_time}-{sorted_slots[i + 1].end_time}"
-                )
-        
-        # Check for gaps
-        for i in range(len(sorted_slots) - 1):
-            if sorted_slots[i].end_time != sorted_slots[i + 1].start_time:
-                warnings.append(
-                    f"Gap after migration in {mode}/{day}: "
-                    f"{sorted_slots[i].end_time} to {sorted_slots[i + 1].start_time}"
-                )
-        
-        return warnings
-
-    def _calculate_slot_duration(self, start_time: str, end_time: str) -> int:
-        """Calculate the duration of a schedule slot in minutes."""
+    async def _async_handle_mode_change(self) -> None:
+        """Handle a presence mode change outside the presence manager callback."""
         try:
-            start = time.fromisoformat(start_time)
-            end = time.fromisoformat(end_time)
-            
-            # Convert to minutes since midnight
-            start_minutes = start.hour * 60 + start.minute
-            end_minutes = end.hour * 60 + end.minute
-            
-            # Handle slots that cross midnight
-            if end_minutes <= start_minutes:
-                end_minutes += 24 * 60  # Add 24 hours
-            
-            return end_minutes - start_minutes
-        except ValueError as e:
-            _LOGGER.error("Invalid time format in slot duration calculation: start=%s, end=%s, error=%s", 
-                         start_time, end_time, e)
-            return 0
+            await self.apply_all_tracked_entities()
+        except Exception as e:
+            _LOGGER.error("Error applying schedules after mode change: %s", e)
+        finally:
+            await self._async_arm_boundary_timer()
     
     def _analyze_schedule_coverage(self, mode_schedules: Dict[str, List[ScheduleSlot]]) -> Dict[str, Any]:
         """
@@ -1053,6 +1244,33 @@ class ScheduleManager:
         Returns:
             Dictionary with coverage analysis including gaps and total coverage percentage
         """
+        return self._combine_day_coverage([
+            self._analyze_day_coverage(day, mode_schedules.get(day, [])) for day in WEEKDAYS
+        ])
+    
+    def _get_mode_coverage(self, mode: str) -> Dict[str, Any]:
+        """
+        Get the coverage analysis for a mode from per-day cached results.
+        
+        Only days touched since the last analysis are recomputed.
+        """
+        if self._coverage_source is not self._schedule_data:
+            self._day_coverage.clear()
+            self._coverage_source = self._schedule_data
+        
+        mode_schedules = self._schedule_data.schedules.get(mode, {})
+        day_results = []
+        for day in WEEKDAYS:
+            day_result = self._day_coverage.get((mode, day))
+            if day_result is None:
+                day_result = self._analyze_day_coverage(day, mode_schedules.get(day, []))
+                self._day_coverage[(mode, day)] = day_result
+            day_results.append(day_result)
+        
+        return self._combine_day_coverage(day_results)
+    
+    def _combine_day_coverage(self, day_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-day coverage results into the week analysis."""
         analysis = {
             "total_coverage_percent": 0.0,
             "gaps": [],
@@ -1064,89 +1282,92 @@ class ScheduleManager:
         total_minutes_possible = len(WEEKDAYS) * 24 * 60  # 7 days * 24 hours * 60 minutes
         total_minutes_covered = 0
         
-        for day in WEEKDAYS:
-            day_slots = mode_schedules.get(day, [])
-            if not day_slots:
-                analysis["gaps"].append({
-                    "day": day,
-                    "start": "00:00",
-                    "end": "23:59",
-                    "duration_minutes": 24 * 60
-                })
-                continue
+        for day_result in day_results:
+            analysis["gaps"].extend(day_result["gaps"])
+            analysis["overlaps"].extend(day_result["overlaps"])
+            total_minutes_covered += day_result["covered_minutes"]
             
-            analysis["days_with_schedules"] += 1
+            if day_result["has_schedules"]:
+                analysis["days_with_schedules"] += 1
             
-            # Sort slots by start time
-            sorted_slots = sorted(day_slots, key=lambda s: s.start_time)
-            
-            day_coverage = 0
-            last_end_minutes = 0
+            if day_result["full_coverage"]:
+                analysis["days_with_full_coverage"] += 1
+        
+        analysis["total_coverage_percent"] = (total_minutes_covered / total_minutes_possible) * 100
+        
+        return analysis
+    
+    def _analyze_day_coverage(self, day: str, day_slots: List[ScheduleSlot]) -> Dict[str, Any]:
+        """Analyze gaps, overlaps and covered minutes for a single day."""
+        result = {
+            "gaps": [],
+            "overlaps": [],
+            "covered_minutes": 0,
+            "has_schedules": bool(day_slots),
+            "full_coverage": False
+        }
+        
+        if not day_slots:
+            result["gaps"].append({
+                "day": day,
+                "start": "00:00",
+                "end": "23:59",
+                "duration_minutes": 24 * 60
+            })
+            return result
+        
+        # Sort slots by start time
+        sorted_slots = sorted(day_slots, key=lambda s: s.start_minute)
+        
+        day_coverage = 0
+        last_end_minutes = 0
+        
+        for i, slot in enumerate(sorted_slots):
+            start_minutes = slot.start_minute
+            end_minutes = slot.end_minute
             
-            for i, slot in enumerate(sorted_slots):
-                start_minutes = self._time_to_minutes(slot.start_time)
-                end_minutes = self._time_to_minutes(slot.end_time)
-                
-                # Check for gap before this slot
-                if start_minutes > last_end_minutes:
-                    gap_duration = start_minutes - last_end_minutes
-                    analysis["gaps"].append({
-                        "day": day,
-                        "start": self._minutes_to_time(last_end_minutes),
-                        "end": slot.start_time,
-                        "duration_minutes": gap_duration
-                    })
-                
-                # Check for overlap with previous slot
-                if i > 0 and start_minutes < last_end_minutes:
-                    overlap_duration = last_end_minutes - start_minutes
-                    analysis["overlaps"].append({
-                        "day": day,
-                        "slot1_end": self._minutes_to_time(last_end_minutes),
-                        "slot2_start": slot.start_time,
-                        "duration_minutes": overlap_duration
-                    })
-                
-                # Add this slot's coverage
-                slot_duration = end_minutes - start_minutes
-                if slot_duration > 0:
-                    day_coverage += slot_duration
-                    last_end_minutes = max(last_end_minutes, end_minutes)
-            
-            # Check for gap at end of day
-            if last_end_minutes < 24 * 60:
-                gap_duration = (24 * 60) - last_end_minutes
-                analysis["gaps"].append({
+            # Check for gap before this slot
+            if start_minutes > last_end_minutes:
+                gap_duration = start_minutes - last_end_minutes
+                result["gaps"].append({
                     "day": day,
                     "start": self._minutes_to_time(last_end_minutes),
-                    "end": "23:59",
+                    "end": slot.start_time,
                     "duration_minutes": gap_duration
                 })
             
-            total_minutes_covered += day_coverage
+            # Check for overlap with previous slot
+            if i > 0 and start_minutes < last_end_minutes:
+                overlap_duration = last_end_minutes - start_minutes
+                result["overlaps"].append({
+                    "day": day,
+                    "slot1_end": self._minutes_to_time(last_end_minutes),
+                    "slot2_start": slot.start_time,
+                    "duration_minutes": overlap_duration
+                })
             
-            # Check if day has full coverage
-            if day_coverage >= (24 * 60 - 1):  # Allow 1 minute tolerance
-                analysis["days_with_full_coverage"] += 1
+            # Add this slot's coverage
+            slot_duration = end_minutes - start_minutes
+            if slot_duration > 0:
+                day_coverage += slot_duration
+                last_end_minutes = max(last_end_minutes, end_minutes)
+        
+        # Check for gap at end of day
+        if last_end_minutes < 24 * 60:
+            gap_duration = (24 * 60) - last_end_minutes
+            result["gaps"].append({
+                "day": day,
+                "start": self._minutes_to_time(last_end_minutes),
+                "end": "23:59",
+                "duration_minutes": gap_duration
+            })
         
-        analysis["total_coverage_percent"] = (total_minutes_covered / total_minutes_possible) * 100
+        result["covered_minutes"] = day_coverage
         
-        return analysis
-    
-    def _time_to_minutes(self, time_str: str) -> int:
-        """Convert time string (HH:MM) to minutes since midnight."""
-        try:
-            time_obj = time.fromisoformat(time_str)
-            return time_obj.hour * 60 + time_obj.minute
-        except ValueError:
-            _LOGGER.error("Invalid time format: %s", time_str)
-            return 0
-    
-    def _minutes_to_time(self, minutes: int) -> str:
-        """Convert minutes since midnight to time string (HH:MM)."""
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours:02d}:{mins:02d}"
+        # Check if day has full coverage
+        result["full_coverage"] = day_coverage >= (24 * 60 - 1)  # Allow 1 minute tolerance
+        
+        return result
     
     async def get_all_schedule_grids(self, entity_id: str) -> Dict[str, Dict[str, Any]]:
         """
@@ -1311,36 +1532,166 @@ class ScheduleManager:
         Returns:
             Dictionary mapping entity_id to success status
         """
+        report = await self.bulk_apply(force)
+        return {
+            entity_id: result["success"]
+            for entity_id, result in report["entities"].items()
+        }
+    
+    async def bulk_apply(self, force: bool = False, max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply current schedules to all tracked entities with bounded concurrency.
+        
+        Presence is evaluated once for the whole pass. Pending writes are grouped
+        by domain, service and target value so that entities sharing a setpoint
+        are updated with a single multi-entity service call. Groups are dispatched
+        in parallel with at most max_concurrency service calls in flight.
+        
+        Args:
+            force: If True, bypass buffer logic and force application
+            max_concurrency: Parallelism limit, defaults to max_concurrent_applies
+            
+        Returns:
+            Aggregated report with per-entity success and timings
+        """
+        start_time = datetime.now()
+        concurrency = max(1, max_concurrency or self.max_concurrent_applies)
+        report: Dict[str, Any] = {
+            "mode": None,
+            "force": force,
+            "max_concurrency": concurrency,
+            "total": 0,
+            "successful": 0,
+            "failed": 0,
+            "service_calls": 0,
+            "duration_seconds": 0.0,
+            "entities": {}
+        }
+        
         if not self._schedule_data:
             await self._load_schedule_data()
         
         if not self._schedule_data:
             _LOGGER.error("No schedule data available for bulk application")
-            return {}
+            return report
         
-        results = {}
+        entity_ids = list(self._schedule_data.entities_tracked)
+        current_mode = await self.presence_manager.get_current_mode()
+        report["mode"] = current_mode
+        report["total"] = len(entity_ids)
         
-        for entity_id in self._schedule_data.entities_tracked:
+        # Evaluate every entity and group the writes that need a service call
+        groups: Dict[tuple, List[PendingWrite]] = {}
+        for entity_id in entity_ids:
+            entity_start = datetime.now()
             try:
-                success = await self.apply_schedule(entity_id, force)
-                results[entity_id] = success
-                
-                if success:
-                    _LOGGER.debug("Successfully applied schedule for %s", entity_id)
-                else:
-                    _LOGGER.warning("Failed to apply schedule for %s", entity_id)
-                    
+                write = await self._prepare_schedule_write(entity_id, force, current_mode)
             except Exception as e:
                 _LOGGER.error("Error applying schedule for %s: %s", entity_id, e)
-                results[entity_id] = False
+                report["entities"][entity_id] = self._bulk_entity_result(False, entity_start, str(e))
+                continue
+            
+            if write.result is not None:
+                report["entities"][entity_id] = self._bulk_entity_result(write.result, entity_start)
+                continue
+            
+            domain = entity_id.split('.')[0]
+            service = DOMAIN_SERVICES.get(domain, (None, None))[0]
+            groups.setdefault((domain, service, write.target_value), []).append(write)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _dispatch(domain: str, target_value: float, writes: List[PendingWrite]) -> None:
+            async with semaphore:
+                group_start = datetime.now()
+                results, calls = await self._apply_group_value(
+                    domain, [write.entity_id for write in writes], target_value
+                )
+                execution_time = (datetime.now() - group_start).total_seconds()
+            
+            report["service_calls"] += calls
+            for write in writes:
+                success = results.get(write.entity_id, False)
+                self._complete_schedule_write(write, success, execution_time)
+                entity_result = self._bulk_entity_result(success, group_start)
+                entity_result["group_size"] = len(writes)
+                report["entities"][write.entity_id] = entity_result
+        
+        await asyncio.gather(*(
+            _dispatch(domain, target_value, writes)
+            for (domain, _service, target_value), writes in groups.items()
+        ))
+        
+        # Keep the report in tracked entity order
+        report["entities"] = {
+            entity_id: report["entities"][entity_id]
+            for entity_id in entity_ids if entity_id in report["entities"]
+        }
+        report["successful"] = sum(1 for result in report["entities"].values() if result["success"])
+        report["failed"] = report["total"] - report["successful"]
+        report["duration_seconds"] = (datetime.now() - start_time).total_seconds()
+        
+        _LOGGER.info("Applied schedules to %d/%d entities with %d service calls in %.3fs "
+                    "(mode=%s, force=%s, concurrency=%d)", 
+                    report["successful"], report["total"], report["service_calls"],
+                    report["duration_seconds"], current_mode, force, concurrency)
+        
+        return report
+    
+    def _bulk_entity_result(self, success: bool, started: datetime, error: Optional[str] = None) -> Dict[str, Any]:
+        """Build the per-entity entry of a bulk apply report."""
+        return {
+            "success": success,
+            "duration_seconds": (datetime.now() - started).total_seconds(),
+            "error": error
+        }
+    
+    async def _apply_group_value(self, domain: str, entity_ids: List[str],
+                                 value: float) -> tuple[Dict[str, bool], int]:
+        """
+        Apply one value to several entities of a domain with a single service call.
         
-        successful_count = sum(1 for success in results.values() if success)
-        total_count = len(results)
+        If the combined call fails, each entity is retried on its own so that one
+        bad entity does not fail the whole group.
         
-        _LOGGER.info("Applied schedules to %d/%d entities (force=%s)", 
-                    successful_count, total_count, force)
+        Returns:
+            Tuple of (entity_id -> success, number of service calls made)
+        """
+        if domain not in DOMAIN_SERVICES:
+            for entity_id in entity_ids:
+                _LOGGER.error("Unsupported entity domain for %s: %s", entity_id, domain)
+            return {entity_id: False for entity_id in entity_ids}, 0
         
-        return results
+        service, data_key = DOMAIN_SERVICES[domain]
+        
+        try:
+            await self.hass.services.async_call(
+                domain,
+                service,
+                {
+                    "entity_id": entity_ids if len(entity_ids) > 1 else entity_ids[0],
+                    data_key: value
+                }
+            )
+            if DEBUG_SERVICE_CALLS:
+                _LOGGER.debug("Called %s.%s with %s=%.1f for %s", domain, service, data_key, value, entity_ids)
+            return {entity_id: True for entity_id in entity_ids}, 1
+            
+        except Exception as e:
+            if len(entity_ids) == 1:
+                _LOGGER.error("Failed to call %s.%s for %s: %s", domain, service, entity_ids[0], e)
+                return {entity_ids[0]: False}, 1
+            
+            _LOGGER.warning("Grouped %s.%s call for %d entities failed, retrying individually: %s",
+                           domain, service, len(entity_ids), e)
+        
+        results: Dict[str, bool] = {}
+        calls = 1
+        for entity_id in entity_ids:
+            entity_results, entity_calls = await self._apply_group_value(domain, [entity_id], value)
+            results.update(entity_results)
+            calls += entity_calls
+        return results, calls
     
     async def validate_entity_compatibility(self, entity_id: str) -> Dict[str, Any]:
         """
@@ -1496,6 +1847,7 @@ class ScheduleManager:
             try:
                 # Update schedule data
                 self._schedule_data.schedules = migrated_schedules
+                self._mark_schedule_changed()
                 self._schedule_data.ui["resolution_minutes"] = new_resolution_minutes
                 self._schedule_data.metadata["last_modified"] = datetime.now().isoformat()
                 self._schedule_data.metadata["last_migration"] = {
@@ -1505,7 +1857,8 @@ class ScheduleManager:
                 }
                 
                 # Save updated data
-                await self.storage_service.save_schedules(self._schedule_data.to_dict())
+                await self.storage_service.save_schedules(self._schedule_data)
+                await self._async_arm_boundary_timer()
                 
                 # Emit event for real-time updates
                 from .const import DOMAIN
@@ -1529,6 +1882,11 @@ class ScheduleManager:
         """
         Migrate slots for a single day to new resolution.
         
+        The day is rasterised into one cell per minute and re-gridded in a
+        single pass (see DayCells.regrid for the merge rules). Migrated slots
+        and the change summary are both derived from the same arrays, so the
+        result never contains overlaps and identical neighbours are merged.
+        
         Args:
             slots: List of current schedule slots
             current_res: Current resolution in minutes
@@ -1540,74 +1898,29 @@ class ScheduleManager:
         if not slots:
             return [], {"original_count": 0, "new_count": 0, "changes": []}
         
-        migrated_slots = []
-        changes = []
+        day_cells = DayCells(slots)
+        coarse = day_cells.regrid(new_res)
         
-        # Sort slots by start time
-        sorted_slots = sorted(slots, key=lambda s: s.start_time)
-        
-        for slot in sorted_slots:
-            # Convert times to minutes since midnight
-            start_minutes = self._time_to_minutes(slot.start_time)
-            end_minutes = self._time_to_minutes(slot.end_time)
-            
-            # Align to new resolution boundaries
-            new_start_minutes = self._align_to_resolution(start_minutes, new_res)
-            new_end_minutes = self._align_to_resolution(end_minutes, new_res, align_up=True)
-            
-            # Ensure minimum slot duration (at least one resolution unit)
-            if new_end_minutes <= new_start_minutes:
-                new_end_minutes = new_start_minutes + new_res
-            
-            # Convert back to time strings
-            new_start_time = self._minutes_to_time(new_start_minutes)
-            new_end_time = self._minutes_to_time(new_end_minutes)
-            
-            # Create migrated slot
-            migrated_slot = ScheduleSlot(
-                day=slot.day,
-                start_time=new_start_time,
-                end_time=new_end_time,
-                target_value=slot.target_value,
-                entity_domain=slot.entity_domain,
-                buffer_override=slot.buffer_override
-            )
-            
-            # Track changes
-            if (slot.start_time != new_start_time or slot.end_time != new_end_time):
-                changes.append({
-                    "original": {"start": slot.start_time, "end": slot.end_time},
-                    "migrated": {"start": new_start_time, "end": new_end_time},
-                    "target_value": slot.target_value
-                })
-            
-            migrated_slots.append(migrated_slot)
+        original_runs = runs(day_cells.cells)
+        migrated_runs = runs(coarse, new_res)
+        migrated_slots = build_slots(slots[0].day, migrated_runs, day_cells.palette)
         
-        # Merge overlapping slots with same target value
-        merged_slots = self._merge_overlapping_slots(migrated_slots)
+        changes = []
+        for original, migrated in diff_runs(original_runs, migrated_runs):
+            changes.append({
+                "original": run_bounds(original),
+                "migrated": run_bounds(migrated),
+                "target_value": day_cells.palette[original[2]].target_value
+            })
         
-        return merged_slots, {
+        return migrated_slots, {
             "original_count": len(slots),
-            "new_count": len(merged_slots),
+            "new_count": len(migrated_slots),
             "changes": changes,
-            "merged": len(migrated_slots) != len(merged_slots)
+            "merged": len(migrated_slots) < len(slots),
+            "minutes_changed": changed_minutes(day_cells.cells, expand(coarse, new_res))
         }
     
-    def _align_to_resolution(self, minutes: int, resolution: int, align_up: bool = False) -> int:
-        """Align time in minutes to resolution boundary."""
-        if align_up:
-            return ((minutes + resolution - 1) // resolution) * resolution
-        else:
-            return (minutes // resolution) * resolution
-    
-    def _time_to_minutes(self, time_str: str) -> int:
-        """Convert time string to minutes since midnight."""
-        try:
-            hour, minute = map(int, time_str.split(':'))
-            return hour * 60 + minute
-        except (ValueError, AttributeError):
-            raise ValueError(f"Invalid time format: {time_str}")
-    
     def _minutes_to_time(self, minutes: int) -> str:
         """Convert minutes since midnight to time string."""
         # Handle special case for exactly 1440 minutes (24:00) - convert to 23:59
@@ -1619,31 +1932,6 @@ class ScheduleManager:
         
         return f"{hour:02d}:{minute:02d}"
     
-    def _merge_overlapping_slots(self, slots: List[ScheduleSlot]) -> List[ScheduleSlot]:
-        """Merge overlapping slots with the same target value."""
-        if not slots:
-            return []
-        
-        # Sort by start time
-        sorted_slots = sorted(slots, key=lambda s: s.start_time)
-        merged = [sorted_slots[0]]
-        
-        for current in sorted_slots[1:]:
-            last_merged = merged[-1]
-            
-            # Check if slots can be merged (adjacent or overlapping with same target)
-            if (self._time_to_minutes(current.start_time) <= self._time_to_minutes(last_merged.end_time) and
-                abs(current.target_value - last_merged.target_value) < 0.1 and
-                current.entity_domain == last_merged.entity_domain):
-                
-                # Extend the last merged slot
-                if self._time_to_minutes(current.end_time) > self._time_to_minutes(last_merged.end_time):
-                    last_merged.end_time = current.end_time
-            else:
-                merged.append(current)
-        
-        return merged
-    
     def _validate_migrated_slots(self, slots: List[ScheduleSlot], day: str, mode: str) -> List[str]:
         """Validate migrated slots and return warnings."""
         warnings = []
@@ -1653,7 +1941,7 @@ class ScheduleManager:
             return warnings
         
         # Check for overlaps
-        sorted_slots = sorted(slots, key=lambda s: s.start_time)
+        sorted_slots = sorted(slots, key=lambda s: s.start_minute)
         for i in range(len(sorted_slots) - 1):
             if sorted_slots[i].overlaps_with(sorted_slots[i + 1]):
                 warnings.append(
@@ -1671,51 +1959,3 @@ class ScheduleManager:
                 )
         
         return warnings
-
-    async def migrate_resolution_service(self, call: ServiceCall) -> None:
-        """
-        Handle the migrate_resolution service call for changing time resolution.
-        
-        Implements requirement 1.4: Schedule resolution migration with preview and confirmation.
-        """
-        try:
-            # Extract and validate parameters
-            new_resolution = call.data.get("resolution_minutes")
-            preview_only = call.data.get("preview", True)
-            
-            # Parameter validation
-            validation_errors = []
-            
-            if new_resolution is None:
-                validation_errors.append("resolution_minutes is required")
-            elif not isinstance(new_resolution, int):
-                validation_errors.append("resolution_minutes must be an integer")
-            elif new_resolution not in [15, 30, 60]:
-                validation_errors.append("resolution_minutes must be 15, 30, or 60")
-            
-            if not isinstance(preview_only, bool):
-                validation_errors.append("preview must be a boolean")
-            
-            if validation_errors:
-                error_msg = f"migrate_resolution service validation errors: {'; '.join(validation_errors)}"
-                _LOGGER.error(error_msg)
-                raise ValueError(error_msg)
-            
-            _LOGGER.info("Migrate resolution service called: resolution=%d, preview=%s", 
-                        new_resolution, preview_only)
-            
-            # Perform migration
-            result = await self.migrate_resolution(new_resolution, preview_only)
-            
-            # Emit event with results
-            from .const import DOMAIN
-            self.hass.bus.async_fire(f"{DOMAIN}_migration_result", {
-                "service": "migrate_resolution",
-                "result": result
-            })
-            
-            _LOGGER.info("Resolution migration service completed: %s", result["status"])
-            
-        except Exception as e:
-            _LOGGER.error("Error in migrate_resolution service: %s", e)
-            raise
\ No newline at end of file
@@ -1,20 +1,57 @@
 """Storage service for the Roost Scheduler integration."""
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import copy
+import gzip
+import hashlib
 import json
 import logging
+import lzma
 import os
-from datetime import datetime
+import tempfile
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_dumps_sorted
 from homeassistant.helpers.storage import Store
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import STORAGE_KEY, STORAGE_VERSION
-from .models import ScheduleData
-from .migration import MigrationManager
+from .const import (
+    BACKUP_COMPRESSION_SUFFIXES,
+    BACKUP_FILE_SUFFIXES,
+    BACKUP_INDEX_DIR,
+    BACKUP_INDEX_VERSION,
+    BACKUP_MANIFEST_SUFFIX,
+    BACKUP_OBJECTS_DIR,
+    DEFAULT_BACKUP_RETENTION_DAYS,
+    DEFAULT_STORAGE_FORMAT,
+    JOURNAL_COMPACT_DELAY_SECONDS,
+    JOURNAL_COMPACT_MAX_RECORDS,
+    MIN_NIGHTLY_BACKUPS,
+    RECOVERY_VERIFY_BATCH_SIZE,
+    SAVE_RETRY_DELAY_SECONDS,
+    STORAGE_CHECKSUM_KEY,
+    STORAGE_FORMAT_COLUMNAR,
+    STORAGE_FORMAT_KEY,
+    STORAGE_FORMAT_LEGACY,
+    STORAGE_FORMATS,
+    STORAGE_KEY,
+    STORAGE_SHARD_OVERRIDES,
+    STORAGE_SHARDS,
+    STORAGE_SHARDS_KEY,
+    STORAGE_VERSION,
+    VERSION,
+)
+from .journal import ScheduleJournal, apply_journal_changes
+from .models import ScheduleData, ScheduleSlot
+from .migration import MigrationManager, to_legacy_layout
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,41 +66,387 @@ class CorruptedDataError(StorageError):
     pass
 
 
+# Held while nightly backups write objects and while unreferenced objects are
+# pruned; objects/ is shared by all entries and an object lands before its manifest
+_BACKUP_OBJECTS_LOCK = threading.Lock()
+
+
+def _backup_compression(path: str) -> Optional[str]:
+    """Return the compression implied by a backup file name, if any."""
+    for compression, suffix in BACKUP_COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def _write_backup_file(
+    path: str, data: Dict[str, Any], compression: Optional[str]
+) -> tuple[int, int, str]:
+    """
+    Serialize, optionally compress and atomically write a backup file.
+    
+    Runs in the executor. The payload goes to a temporary file in the target
+    directory which is then renamed over the path, so a partial backup is
+    never visible. Returns the size and SHA-256 of the uncompressed JSON and
+    the size on disk.
+    """
+    payload = json.dumps(data, indent=2).encode("utf-8")
+    json_size = len(payload)
+    checksum = hashlib.sha256(payload).hexdigest()
+    if compression == "gzip":
+        payload = gzip.compress(payload)
+    elif compression == "lzma":
+        payload = lzma.compress(payload)
+    
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=".roost_backup_", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+    
+    return json_size, os.path.getsize(path), checksum
+
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_LZMA_MAGIC = b"\xfd7zXZ\x00"
+
+
+def _backup_type(filename: str) -> str:
+    """Return the backup type implied by a backup file name."""
+    return "nightly" if "nightly_backup" in filename else "manual"
+
+
+def _backup_object_digest(content: Dict[str, Any]) -> str:
+    """
+    Return the SHA-256 a nightly backup object is stored under.
+    
+    metadata.last_modified is left out: every save rewrites it, so hashing
+    it would give unchanged schedules a new object each night.
+    """
+    metadata = content.get("metadata")
+    if isinstance(metadata, dict) and "last_modified" in metadata:
+        content = {
+            **content,
+            "metadata": {key: value for key, value in metadata.items() if key != "last_modified"},
+        }
+    return hashlib.sha256(json_dumps_sorted(content).encode("utf-8")).hexdigest()
+
+
+def _read_backup_text(path: str) -> str:
+    """Read a backup file, decompressing it according to its name."""
+    compression = _backup_compression(path)
+    if compression == "gzip":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    if compression == "lzma":
+        with lzma.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _split_shards(data: Dict[str, Any]) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split stored schedule data into its core config and its shards.
+    
+    The home and away schedules and the per-entity buffer overrides become
+    shards; everything else, including any other mode, stays in the core.
+    """
+    core = dict(data)
+    shards: Dict[str, Any] = {}
+    
+    schedules = data.get("schedules")
+    if isinstance(schedules, dict):
+        core_schedules = dict(schedules)
+        for shard in STORAGE_SHARDS:
+            if shard != STORAGE_SHARD_OVERRIDES and shard in core_schedules:
+                shards[shard] = core_schedules.pop(shard)
+        core["schedules"] = core_schedules
+    
+    buffer_config = data.get("buffer_config")
+    if isinstance(buffer_config, dict) and "entity_overrides" in buffer_config:
+        core_buffer_config = dict(buffer_config)
+        shards[STORAGE_SHARD_OVERRIDES] = core_buffer_config.pop("entity_overrides")
+        core["buffer_config"] = core_buffer_config
+    
+    return core, shards
+
+
+def _join_shards(core: Dict[str, Any], shards: Dict[str, Any]) -> Dict[str, Any]:
+    """Reassemble schedule data from its core config and shards."""
+    data = {key: value for key, value in core.items() if key != STORAGE_SHARDS_KEY}
+    for shard, value in shards.items():
+        if shard == STORAGE_SHARD_OVERRIDES:
+            data["buffer_config"] = {**(data.get("buffer_config") or {}), "entity_overrides": value}
+        else:
+            data["schedules"] = {**(data.get("schedules") or {}), shard: value}
+    return data
+
+
+def _shard_checksum(value: Any) -> str:
+    """Return the SHA-256 of a shard's canonical JSON form."""
+    return hashlib.sha256(json_dumps_sorted(value).encode("utf-8")).hexdigest()
+
+
+class ShardedScheduleStore:
+    """
+    Schedule data store that can split the data across several stores.
+    
+    Offers the async_load/async_save interface of Store. When sharded, the
+    home schedule, away schedule and per-entity buffer overrides are kept in
+    their own stores and only shards whose content changed are written.
+    
+    A changed shard is written under a new generation key
+    (STORAGE_KEY_<entry_id>_<shard>_<generation>) and never over the one the
+    core points to. The core config, under the entry's original storage key,
+    is written last with a manifest of each shard's generation and checksum,
+    and only then are the superseded generations removed. A crash at any
+    point leaves the old core with its old shards, or the new core with its
+    new ones; a shard that does not match the manifest fails the load so
+    that recovery runs. A single-blob store is converted on load, and sharded
+    data is read back whatever the setting, so turning sharding off writes a
+    single blob again.
+    """
+    
+    def __init__(self, hass: HomeAssistant, entry_id: str, sharded: Optional[bool] = False) -> None:
+        """
+        Initialize the store.
+        
+        With sharded=None the layout found on load is kept.
+        """
+        self.hass = hass
+        self.entry_id = entry_id
+        self._core = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{entry_id}")
+        self._sharded = sharded
+        # Manifest of the shards on disk: name -> {"generation", "checksum"}
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def sharded(self) -> bool:
+        """Return True if data is written as shards."""
+        return bool(self._sharded)
+    
+    def _shard_store(self, name: str, generation: int) -> Store:
+        """Return the store holding one generation of a shard."""
+        return Store(self.hass, STORAGE_VERSION, f"{STORAGE_KEY}_{self.entry_id}_{name}_{generation}")
+    
+    async def async_load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the schedule data, reassembling it from shards if needed.
+        
+        Raises ValueError if a shard is missing or does not match the manifest.
+        """
+        core = await self._core.async_load()
+        if not isinstance(core, dict) or STORAGE_SHARDS_KEY not in core:
+            if self._sharded is None:
+                self._sharded = False
+            if core and self._sharded:
+                await self._convert_single_blob(core)
+            return core
+        
+        if self._sharded is None:
+            self._sharded = True
+        manifest = core[STORAGE_SHARDS_KEY]
+        try:
+            generations = {name: int(entry["generation"]) for name, entry in manifest.items()}
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Storage shard manifest is malformed: {e}") from e
+        
+        names = list(generations)
+        values = await asyncio.gather(
+            *(self._shard_store(name, generations[name]).async_load() for name in names)
+        )
+        shards = dict(zip(names, values))
+        for name, value in shards.items():
+            if value is None:
+                raise ValueError(f"Storage shard {name} is missing")
+            if _shard_checksum(value) != manifest[name].get("checksum"):
+                raise ValueError(f"Storage shard {name} does not match the manifest")
+        
+        self._manifest = {name: dict(entry) for name, entry in manifest.items()}
+        return _join_shards(core, shards)
+    
+    async def async_save(self, data: Dict[str, Any]) -> None:
+        """Save the schedule data, writing only the shards that changed."""
+        if not self._sharded:
+            await self._core.async_save(data)
+            if self._manifest:
+                # Switched back to a single blob: the shards are now stale
+                stale, self._manifest = self._manifest, {}
+                await self._async_remove_generations(stale)
+            return
+        
+        core, shards = _split_shards(data)
+        manifest: Dict[str, Dict[str, Any]] = {}
+        superseded: Dict[str, Dict[str, Any]] = {}
+        dirty = []
+        for name, value in shards.items():
+            checksum = _shard_checksum(value)
+            current = self._manifest.get(name)
+            if current is not None and current["checksum"] == checksum:
+                manifest[name] = current
+                continue
+            manifest[name] = {"generation": current["generation"] + 1 if current else 1, "checksum": checksum}
+            dirty.append(name)
+            if current is not None:
+                superseded[name] = current
+        for name, current in self._manifest.items():
+            if name not in shards:
+                superseded[name] = current
+        
+        if dirty:
+            await asyncio.gather(
+                *(self._shard_store(name, manifest[name]["generation"]).async_save(shards[name]) for name in dirty)
+            )
+            _LOGGER.debug("Wrote storage shards %s for entry %s", dirty, self.entry_id)
+        
+        core[STORAGE_SHARDS_KEY] = manifest
+        await self._core.async_save(core)
+        self._manifest = manifest
+        
+        if superseded:
+            await self._async_remove_generations(superseded)
+    
+    async def _convert_single_blob(self, data: Dict[str, Any]) -> None:
+        """Rewrite a single-blob store as shards."""
+        try:
+            await self.async_save(data)
+        except Exception as e:
+            # The blob is only replaced once every shard is written, so it is still intact
+            _LOGGER.warning("Could not convert schedule data for entry %s to sharded storage: %s",
+                            self.entry_id, e)
+            self._manifest = {}
+            return
+        _LOGGER.info("Converted schedule data for entry %s to sharded storage", self.entry_id)
+    
+    async def _async_remove_generations(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        """Remove shard generations the core no longer points to."""
+        for name, entry in manifest.items():
+            try:
+                await self._shard_store(name, entry["generation"]).async_remove()
+            except Exception as e:
+                _LOGGER.warning("Failed to remove storage shard %s for entry %s: %s", name, self.entry_id, e)
+
+
 class StorageService:
     """Handles data persistence for the Roost Scheduler integration."""
     
-    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        save_delay: float = 0,
+        storage_format: str = DEFAULT_STORAGE_FORMAT,
+        journal: bool = False,
+        sharded: bool = False,
+    ) -> None:
         """Initialize the storage service."""
         self.hass = hass
         self.entry_id = entry_id
-        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}_{entry_id}")
+        self._store = ShardedScheduleStore(hass, entry_id, sharded=sharded)
+        # Authoritative in-memory schedule data shared by all managers
         self._schedule_data: Optional[ScheduleData] = None
+        self._revision = 0
         self._backup_dir = Path(hass.config.config_dir) / "roost_scheduler_backups"
         self._nightly_backup_enabled = True
         self._nightly_backup_time = "02:00"  # Default backup time
-        self._migration_manager = MigrationManager(hass, entry_id)
+        self._backup_retention_days = DEFAULT_BACKUP_RETENTION_DAYS
+        self._migration_manager = MigrationManager(hass, entry_id, backup_indexer=self.async_index_backup)
+        # Backup file name -> index entry; loaded (or rebuilt) on first use
+        self._backup_index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._backup_index_lock = asyncio.Lock()
+        # Write-behind: with a save delay, saves mark the data dirty and a timer flushes it
+        self._save_delay = max(0.0, float(save_delay))
+        self._dirty = False
+        self._flush_unsub: Optional[Callable[[], None]] = None
+        self._final_write_unsub: Optional[Callable[[], None]] = None
+        if storage_format not in STORAGE_FORMATS:
+            _LOGGER.warning("Unknown storage format %s, using %s", storage_format, DEFAULT_STORAGE_FORMAT)
+            storage_format = DEFAULT_STORAGE_FORMAT
+        self._storage_format = storage_format
+        # Journaled mode: saves append per-section deltas to a journal store
+        # and compaction periodically folds them into the snapshot
+        self._journal = ScheduleJournal(hass, entry_id) if journal else None
+        self._snapshot_checksum: Optional[str] = None
+        self._compact_unsub: Optional[Callable[[], None]] = None
     
     async def load_schedules(self) -> Optional[ScheduleData]:
-        """Load schedule data from storage with migration support."""
+        """
+        Return the shared schedule data, loading it from storage on first use.
+        
+        Only the first call reads the store and runs migration and validation.
+        Later calls return the same in-memory ScheduleData instance, which is
+        the one copy every manager reads and patches before calling
+        save_schedules(). In journaled mode the journal is replayed on top of
+        the stored snapshot.
+        """
+        if self._schedule_data is not None:
+            return self._schedule_data
+        
+        schedule_data = await self._load_from_store()
+        if schedule_data is not None and self._journal is not None and not self._journal.started:
+            await self._start_journal()
+        return schedule_data
+    
+    async def _load_from_store(self) -> Optional[ScheduleData]:
+        """Read, migrate and validate the stored schedule data."""
         try:
-            data = await self._store.async_load()
+            try:
+                data = await self._store.async_load()
+            except ValueError as e:
+                _LOGGER.error("Stored schedule data is incomplete: %s", e)
+                raise CorruptedDataError(f"Incomplete schedule data: {e}")
+            if data and self._journal is not None:
+                data = await self._replay_journal(data)
             if data:
                 try:
+                    stored_checksum = data.get(STORAGE_CHECKSUM_KEY)
+                    data, checksum_valid = self._split_checksum(data)
+                    stored_format = data.get(STORAGE_FORMAT_KEY, STORAGE_FORMAT_LEGACY)
+                    if checksum_valid:
+                        # Unchanged since we wrote it at the current version:
+                        # no migration check or structural validation needed
+                        schedule_data = ScheduleData.from_dict(data, trusted=True)
+                        self._set_schedule_data(schedule_data)
+                        self._snapshot_checksum = stored_checksum
+                        _LOGGER.debug("Loaded checksum-verified schedule data for entry %s", self.entry_id)
+                        if stored_format != self._storage_format:
+                            await self._rewrite_in_storage_format(stored_format)
+                        return schedule_data
+                    
+                    # Migration and validation work on the legacy layout
+                    legacy_data = self._migration_manager.convert_storage_format(data, STORAGE_FORMAT_LEGACY)
+                    
                     # Perform migration if needed
-                    migrated_data = await self._migration_manager.migrate_if_needed(data)
+                    migrated_data = await self._migration_manager.migrate_if_needed(legacy_data)
                     
-                    # Validate migrated data
-                    if not await self._migration_manager.validate_migrated_data(migrated_data):
+                    # Migrated data was validated by the migration; validate the rest here
+                    if migrated_data is legacy_data and not await self._migration_manager.validate_migrated_data(
+                        migrated_data
+                    ):
                         raise CorruptedDataError("Data validation failed after migration")
                     
-                    # Save migrated data if it was changed
-                    if migrated_data != data:
-                        await self._store.async_save(migrated_data)
+                    # Save migrated data if it was changed or is in the wrong layout
+                    if migrated_data != legacy_data or stored_format != self._storage_format:
+                        stored_data = self._migration_manager.convert_storage_format(
+                            migrated_data, self._storage_format
+                        )
+                        payload = self._with_checksum(stored_data)
+                        await self._store.async_save(payload)
+                        self._snapshot_checksum = payload[STORAGE_CHECKSUM_KEY]
                         _LOGGER.info("Saved migrated data for entry %s", self.entry_id)
                     
-                    # Parse the loaded/migrated data
+                    # Unverified data gets the strict parse, slots and overlaps included
                     schedule_data = ScheduleData.from_dict(migrated_data)
-                    self._schedule_data = schedule_data
+                    self._set_schedule_data(schedule_data)
                     _LOGGER.debug("Loaded and validated schedule data for entry %s", self.entry_id)
                     return schedule_data
                 except (ValueError, TypeError) as e:
@@ -89,23 +472,27 @@ class StorageService:
             _LOGGER.error("Unexpected error loading schedule data: %s", e)
             raise StorageError(f"Failed to load schedule data: {e}")
     
-    async def save_schedules(self, schedules: ScheduleData) -> None:
-        """Save schedule data to storage."""
+    async def save_schedules(self, schedules: ScheduleData, immediate: bool = False) -> None:
+        """
+        Save schedule data to storage.
+        
+        In write-behind mode the data is validated right away but only marked
+        dirty; it is written when the save delay expires, on flush() or when Home
+        Assistant shuts down. Pass immediate=True to write straight through.
+        """
         try:
             # Validate the schedule data before saving
             schedules.validate()
             
             # Update metadata
             schedules.metadata["last_modified"] = datetime.now().isoformat()
+            self._set_schedule_data(schedules)
             
-            # Convert to dict for storage
-            data_dict = schedules.to_dict()
-            
-            # Save to storage
-            await self._store.async_save(data_dict)
-            self._schedule_data = schedules
+            if self._save_delay > 0 and not immediate:
+                self._mark_dirty()
+                return
             
-            _LOGGER.debug("Saved schedule data for entry %s", self.entry_id)
+            await self._write_schedules()
         except (ValueError, TypeError) as e:
             _LOGGER.error("Invalid schedule data: %s", e)
             raise StorageError(f"Cannot save invalid schedule data: {e}")
@@ -113,16 +500,363 @@ class StorageService:
             _LOGGER.error("Error saving schedule data: %s", e)
             raise StorageError(f"Failed to save schedule data: {e}")
     
-    async def export_backup(self, path: Optional[str] = None) -> str:
-        """Export schedule data to a backup file with comprehensive error logging."""
+    async def flush(self) -> None:
+        """Write pending schedule data to storage now."""
+        self._cancel_flush_timer()
+        if not self._dirty or self._schedule_data is None:
+            return
+        
+        try:
+            await self._write_schedules()
+        except Exception as e:
+            _LOGGER.error("Error flushing schedule data: %s", e)
+            raise StorageError(f"Failed to flush schedule data: {e}")
+    
+    def configure_write_behind(self, save_delay: float) -> None:
+        """Configure the write-behind delay in seconds, 0 to write straight through."""
+        self._save_delay = max(0.0, float(save_delay))
+        _LOGGER.info("Schedule save delay set to %.1fs", self._save_delay)
+    
+    @property
+    def revision(self) -> int:
+        """Return a counter that increases whenever the shared schedule data changes."""
+        return self._revision
+    
+    def get_schedule_data(self) -> Optional[ScheduleData]:
+        """Return the shared in-memory schedule data without touching storage."""
+        return self._schedule_data
+    
+    def _set_schedule_data(self, schedule_data: ScheduleData) -> None:
+        """Install schedule data as the shared copy and bump the revision."""
+        self._schedule_data = schedule_data
+        self._revision += 1
+    
+    @property
+    def storage_format(self) -> str:
+        """Return the layout schedule data is written in."""
+        return self._storage_format
+    
+    @property
+    def has_pending_changes(self) -> bool:
+        """Return True if there are schedule changes not yet written to storage."""
+        return self._dirty
+    
+    async def _write_schedules(self) -> None:
+        """Write the current schedule data, as a journal record when journaling."""
+        if self._journal is not None and self._journal.started:
+            await self._append_to_journal()
+        else:
+            await self._write_snapshot()
+    
+    async def _write_snapshot(self) -> None:
+        """Serialize the current schedule data and write it to the store."""
+        # Serialize before awaiting so changes made during the write mark it dirty again
+        columnar = self._storage_format == STORAGE_FORMAT_COLUMNAR
+        data_dict = self._schedule_data.to_dict(columnar=columnar)
+        journal_sections = None
+        if self._journal is not None:
+            journal_sections = ScheduleJournal.serialize_sections(
+                self._schedule_data.to_dict() if columnar else data_dict
+            )
+        payload = self._with_checksum(data_dict)
+        self._dirty = False
+        self._release_final_write_listener()
+        
+        try:
+            await self._store.async_save(payload)
+        except Exception:
+            self._mark_dirty(retry=True)
+            raise
+        
+        self._snapshot_checksum = payload[STORAGE_CHECKSUM_KEY]
+        _LOGGER.debug("Saved schedule data for entry %s", self.entry_id)
+        
+        if self._journal is not None:
+            # The snapshot now holds every journaled change
+            self._cancel_compaction_timer()
+            try:
+                await self._journal.async_reset(journal_sections, self._snapshot_checksum)
+            except Exception as e:
+                # The stale records are ignored on load; the next save writes a full snapshot
+                _LOGGER.warning("Failed to reset schedule journal for entry %s: %s", self.entry_id, e)
+    
+    async def _append_to_journal(self, undoing: bool = False) -> None:
+        """Append the changes since the last write to the journal."""
+        data_dict = self._schedule_data.to_dict()
+        self._dirty = False
+        self._release_final_write_listener()
+        
+        try:
+            appended = await self._journal.async_append(data_dict, undoing=undoing)
+        except Exception:
+            self._mark_dirty(retry=True)
+            raise
+        
+        if appended:
+            _LOGGER.debug("Journaled schedule change for entry %s (%d records pending)",
+                         self.entry_id, self._journal.pending_records)
+        
+        if self._journal.pending_records >= JOURNAL_COMPACT_MAX_RECORDS:
+            try:
+                await self.compact_journal()
+            except StorageError:
+                # Already logged; the records stay in the journal
+                self._schedule_compaction()
+        elif self._journal.pending_records:
+            self._schedule_compaction()
+    
+    async def _replay_journal(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply journal records written since the snapshot to the loaded data.
+        
+        The replayed data is strictly parsed, slots included, before it is
+        used; if it does not hold up the records are dropped and the snapshot
+        is loaded on its own. The result has no checksum, so it goes through
+        the unverified load path and is then folded into a fresh snapshot.
+        """
+        try:
+            records = await self._journal.async_load(data.get(STORAGE_CHECKSUM_KEY))
+        except Exception as e:
+            _LOGGER.error("Failed to load schedule journal for entry %s, using the snapshot only: %s",
+                          self.entry_id, e)
+            return data
+        
+        if not records:
+            return data
+        
+        # Replay onto a copy so the snapshot stays intact if the records are rejected
+        content = copy.deepcopy({key: value for key, value in data.items() if key != STORAGE_CHECKSUM_KEY})
+        replayed = self._migration_manager.convert_storage_format(content, STORAGE_FORMAT_LEGACY)
+        try:
+            for record in records:
+                apply_journal_changes(replayed, record.get("set", {}), record.get("unset", []))
+            ScheduleData.from_dict(replayed)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            _LOGGER.error("Journaled schedule changes for entry %s are invalid, using the snapshot only: %s",
+                          self.entry_id, e)
+            self._journal.discard_records()
+            return data
+        
+        _LOGGER.info("Replayed %d journaled schedule changes for entry %s", len(records), self.entry_id)
+        return replayed
+    
+    async def _start_journal(self) -> None:
+        """Begin journaling on top of the loaded snapshot."""
+        if self._snapshot_checksum is not None and not self._journal.pending_records:
+            self._journal.start(
+                ScheduleJournal.serialize_sections(self._schedule_data.to_dict()), self._snapshot_checksum
+            )
+            return
+        
+        # Replayed records, or data that was migrated or recovered: fold it
+        # all into a fresh snapshot the journal can build on
+        try:
+            await self.compact_journal()
+        except StorageError:
+            pass
+    
+    async def compact_journal(self) -> None:
+        """Fold the journaled changes into a fresh snapshot."""
+        self._cancel_compaction_timer()
+        if self._journal is None or self._schedule_data is None:
+            return
+        
+        try:
+            # The snapshot gets a checksum that skips slot validation on load
+            self._schedule_data.validate()
+            await self._write_snapshot()
+        except Exception as e:
+            _LOGGER.error("Error compacting schedule journal: %s", e)
+            raise StorageError(f"Failed to compact schedule journal: {e}")
+        
+        _LOGGER.debug("Compacted schedule journal for entry %s", self.entry_id)
+    
+    async def undo_last_change(self) -> Optional[ScheduleData]:
+        """
+        Revert the most recent journaled change.
+        
+        The restored data replaces the shared ScheduleData instance, so
+        managers holding the old instance must reload it. Returns None if
+        journaling is off or there is nothing to undo.
+        """
+        if self._journal is None or self._schedule_data is None:
+            return None
+        
+        # Journal pending write-behind changes first, so they are what is undone
+        await self.flush()
+        inverse = self._journal.peek_undo()
+        if inverse is None or not self._journal.started:
+            return None
+        
+        data = self._schedule_data.to_dict()
+        apply_journal_changes(data, inverse["set"], inverse["unset"])
+        try:
+            schedule_data = ScheduleData.from_dict(data)
+        except (ValueError, TypeError, KeyError) as e:
+            _LOGGER.error("Cannot undo schedule change for entry %s: %s", self.entry_id, e)
+            raise StorageError(f"Cannot undo schedule change: {e}")
+        schedule_data.metadata["last_modified"] = datetime.now().isoformat()
+        
+        previous = self._schedule_data
+        self._set_schedule_data(schedule_data)
+        try:
+            await self._append_to_journal(undoing=True)
+        except Exception as e:
+            self._set_schedule_data(previous)
+            self._dirty = False
+            _LOGGER.error("Error saving undone schedule change: %s", e)
+            raise StorageError(f"Failed to save undone schedule change: {e}")
+        
+        _LOGGER.info("Undid the last schedule change for entry %s", self.entry_id)
+        return schedule_data
+    
+    def get_change_history(self) -> list[Dict[str, Any]]:
+        """Return the undoable schedule changes, newest first."""
+        if self._journal is None:
+            return []
+        return self._journal.get_history()
+    
+    def _schedule_compaction(self) -> None:
+        """Make sure pending journal records are compacted later and at shutdown."""
+        if self._compact_unsub is None:
+            self._compact_unsub = async_call_later(
+                self.hass, JOURNAL_COMPACT_DELAY_SECONDS, self._async_compact_timer
+            )
+        
+        if self._final_write_unsub is None:
+            self._final_write_unsub = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+            )
+    
+    async def _async_compact_timer(self, _now: datetime) -> None:
+        """Compact the journal when the compaction delay expires."""
+        self._compact_unsub = None
+        try:
+            await self.compact_journal()
+        except StorageError:
+            # Already logged; the next journaled change schedules another attempt
+            pass
+    
+    def _cancel_compaction_timer(self) -> None:
+        """Cancel a scheduled compaction, if any."""
+        if self._compact_unsub:
+            self._compact_unsub()
+            self._compact_unsub = None
+    
+    async def _rewrite_in_storage_format(self, stored_format: str) -> None:
+        """Rewrite verified data that was stored in a different layout."""
+        _LOGGER.info("Converting stored schedule data for entry %s from %s to %s layout",
+                     self.entry_id, stored_format, self._storage_format)
+        try:
+            await self._write_schedules()
+        except Exception as e:
+            # Already loaded; the data stays dirty and is written by a later save
+            _LOGGER.warning("Could not rewrite schedule data in %s layout: %s", self._storage_format, e)
+    
+    @staticmethod
+    def _content_checksum(data: Dict[str, Any]) -> str:
+        """Return the SHA-256 of the data's canonical JSON form."""
+        return hashlib.sha256(json_dumps_sorted(data).encode("utf-8")).hexdigest()
+    
+    def _with_checksum(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of the data with its content checksum added."""
+        content = {key: value for key, value in data.items() if key != STORAGE_CHECKSUM_KEY}
+        return {**content, STORAGE_CHECKSUM_KEY: self._content_checksum(content)}
+    
+    def _split_checksum(self, data: Dict[str, Any]) -> tuple[Dict[str, Any], bool]:
+        """
+        Strip the stored checksum from loaded data.
+        
+        Returns the data without the checksum and whether it can be trusted,
+        i.e. it is at the current VERSION and its checksum matches.
+        """
+        if STORAGE_CHECKSUM_KEY not in data:
+            return data, False
+        
+        stored_checksum = data[STORAGE_CHECKSUM_KEY]
+        content = {key: value for key, value in data.items() if key != STORAGE_CHECKSUM_KEY}
+        if content.get("version") != VERSION:
+            return content, False
+        
+        if stored_checksum != self._content_checksum(content):
+            _LOGGER.warning("Stored schedule data checksum mismatch for entry %s, running full validation",
+                            self.entry_id)
+            return content, False
+        
+        return content, True
+    
+    def _mark_dirty(self, retry: bool = False) -> None:
+        """Mark the schedule data dirty and make sure a flush is scheduled.
+        
+        A retry after a failed write waits at least SAVE_RETRY_DELAY_SECONDS,
+        so a short (or zero) save delay cannot spin on a failing store.
+        """
+        self._dirty = True
+        delay = max(self._save_delay, SAVE_RETRY_DELAY_SECONDS) if retry else self._save_delay
+        
+        # Flush at most save_delay after the first unsaved change
+        if self._flush_unsub is None:
+            self._flush_unsub = async_call_later(self.hass, delay, self._async_flush_timer)
+        
+        if self._final_write_unsub is None:
+            self._final_write_unsub = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+            )
+        
+        _LOGGER.debug("Schedule data for entry %s marked dirty, flushing within %.1fs", 
+                     self.entry_id, delay)
+    
+    async def _async_flush_timer(self, _now: datetime) -> None:
+        """Flush pending changes when the save delay expires."""
+        self._flush_unsub = None
+        try:
+            await self.flush()
+        except StorageError:
+            # Already logged; the data stays dirty and another flush is scheduled
+            pass
+    
+    async def _async_final_write(self, _event: Event) -> None:
+        """Flush pending changes, and compact the journal, before Home Assistant stops."""
+        self._final_write_unsub = None
+        try:
+            await self.flush()
+            if self._journal is not None and self._journal.pending_records:
+                await self.compact_journal()
+        except StorageError:
+            pass
+    
+    def _cancel_flush_timer(self) -> None:
+        """Cancel a scheduled flush, if any."""
+        if self._flush_unsub:
+            self._flush_unsub()
+            self._flush_unsub = None
+    
+    def _release_final_write_listener(self) -> None:
+        """Remove the shutdown flush listener, if any."""
+        if self._final_write_unsub:
+            self._final_write_unsub()
+            self._final_write_unsub = None
+    
+    async def export_backup(self, path: Optional[str] = None, compression: Optional[str] = None) -> str:
+        """
+        Export schedule data to a backup file with comprehensive error logging.
+        
+        The data is serialized, optionally compressed ("gzip" or "lzma") and
+        written in the executor. Without an explicit compression it is taken
+        from the path's suffix (.json.gz or .json.xz).
+        """
         export_start_time = datetime.now()
         export_context = {
             "entry_id": self.entry_id,
             "operation": "export_backup",
-            "requested_path": path
+            "requested_path": path,
+            "compression": compression
         }
         
         try:
+            if compression is not None and compression not in BACKUP_COMPRESSION_SUFFIXES:
+                raise StorageError(f"Unsupported backup compression: {compression}")
+            
             _LOGGER.info("Starting backup export for entry %s", self.entry_id)
             
             # Ensure we have schedule data to export
@@ -175,56 +909,60 @@ class StorageService:
             # Generate filename if not provided
             if not path:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"roost_scheduler_backup_{self.entry_id}_{timestamp}.json"
+                suffix = BACKUP_COMPRESSION_SUFFIXES.get(compression, ".json")
+                filename = f"roost_scheduler_backup_{self.entry_id}_{timestamp}{suffix}"
                 path = str(self._backup_dir / filename)
                 _LOGGER.debug("Generated backup filename: %s", filename)
             else:
                 _LOGGER.debug("Using provided backup path: %s", path)
+                if compression is None:
+                    compression = _backup_compression(path)
             
             export_context["final_path"] = path
             
             # Export data with comprehensive error handling
             try:
-                # Use the ScheduleData's to_json method for consistent formatting
-                _LOGGER.debug("Serializing schedule data to JSON")
-                json_data = self._schedule_data.to_json()
-                data_size = len(json_data)
+                # Snapshot the data on the loop; encoding and writing happen in the executor
+                data_dict = self._schedule_data.to_dict()
                 
-                _LOGGER.debug("JSON serialization complete (size: %d bytes)", data_size)
-                export_context["json_size"] = data_size
+                _LOGGER.debug("Writing backup data to file: %s (compression: %s)", path, compression or "none")
+                json_size, written_size, checksum = await self.hass.async_add_executor_job(
+                    _write_backup_file, path, data_dict, compression
+                )
+                export_duration = datetime.now() - export_start_time
                 
-                # Write to file with error handling
-                _LOGGER.debug("Writing backup data to file: %s", path)
-                with open(path, 'w', encoding='utf-8') as f:
-                    f.write(json_data)
+                backup_path = Path(path)
+                if backup_path.parent == self._backup_dir and self.entry_id in backup_path.name:
+                    await self._async_update_backup_index(add={
+                        backup_path.name: {
+                            "size": written_size,
+                            "created": datetime.now().isoformat(),
+                            "type": _backup_type(backup_path.name),
+                            "checksum": checksum,
+                            "schema_version": data_dict.get("version"),
+                        }
+                    })
                 
-                # Verify file was written successfully
-                if os.path.exists(path):
-                    written_size = os.path.getsize(path)
-                    export_duration = datetime.now() - export_start_time
-                    
-                    _LOGGER.info("Backup export completed successfully:")
-                    _LOGGER.info("  - Entry ID: %s", self.entry_id)
-                    _LOGGER.info("  - File: %s", path)
-                    _LOGGER.info("  - Size: %d bytes", written_size)
-                    _LOGGER.info("  - Duration: %s", export_duration)
-                    
-                    export_context["success"] = True
-                    export_context["written_size"] = written_size
-                    export_context["duration"] = str(export_duration)
-                    
-                    if written_size != data_size:
-                        _LOGGER.warning("Size mismatch in backup export: expected %d, written %d", 
-                                       data_size, written_size)
-                        export_context["size_mismatch"] = True
-                    
-                    return path
-                else:
-                    _LOGGER.error("Backup file was not created: %s", path)
-                    export_context["file_not_created"] = True
-                    raise StorageError(f"Backup file was not created: {path}")
+                _LOGGER.info("Backup export completed successfully:")
+                _LOGGER.info("  - Entry ID: %s", self.entry_id)
+                _LOGGER.info("  - File: %s", path)
+                _LOGGER.info("  - Size: %d bytes", written_size)
+                _LOGGER.info("  - Duration: %s", export_duration)
+                
+                export_context["success"] = True
+                export_context["json_size"] = json_size
+                export_context["written_size"] = written_size
+                export_context["duration"] = str(export_duration)
+                
+                # A compressed file is expected to differ from the JSON size
+                if compression is None and written_size != json_size:
+                    _LOGGER.warning("Size mismatch in backup export: expected %d, written %d", 
+                                   json_size, written_size)
+                    export_context["size_mismatch"] = True
                 
-            except json.JSONEncodeError as e:
+                return path
+                
+            except (TypeError, ValueError) as e:
                 _LOGGER.error("JSON serialization failed during backup export:")
                 _LOGGER.error("  - Error: %s", e)
                 _LOGGER.error("  - Data version: %s", self._schedule_data.version)
@@ -261,103 +999,38 @@ class StorageService:
             raise StorageError(f"Failed to export backup: {e}")
     
     async def import_backup(self, file_path: str) -> bool:
-        """Import schedule data from a backup file with comprehensive validation."""
+        """
+        Import schedule data from a backup file with comprehensive validation.
+        
+        Reading, decompression, parsing and validation run in the executor;
+        data at the current version is parsed into ScheduleData by the same
+        single validation pass. Older backups are migrated on the loop and
+        then parsed in the executor. The loop only installs the result.
+        """
         try:
-            if not os.path.exists(file_path):
-                _LOGGER.error("Backup file not found: %s", file_path)
-                return False
-            
-            # Read and parse the backup file with enhanced validation
-            # Read file with comprehensive error handling
             try:
-                _LOGGER.debug("Reading backup file: %s", file_path)
-                
-                # Check file size first
-                try:
-                    file_size = os.path.getsize(file_path)
-                    _LOGGER.debug("Backup file size: %d bytes", file_size)
-                    
-                    if file_size == 0:
-                        _LOGGER.error("Backup file is empty: %s", file_path)
-                        return False
-                    elif file_size > 100 * 1024 * 1024:  # 100MB limit
-                        _LOGGER.warning("Large backup file detected: %s (%d bytes)", file_path, file_size)
-                except OSError as e:
-                    _LOGGER.error("Cannot read file size for %s: %s", file_path, e)
-                    return False
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    
-                content_length = len(content)
-                _LOGGER.debug("Read backup content: %d characters", content_length)
-                    
-                # Check if file is empty
-                if not content:
-                    _LOGGER.error("Backup file content is empty: %s", file_path)
-                    return False
-                
-                # Parse JSON with detailed error handling
-                try:
-                    raw_data = json.loads(content)
-                except json.JSONDecodeError as e:
-                    _LOGGER.error("Invalid JSON in backup file %s at line %d, column %d: %s", 
-                                file_path, e.lineno, e.colno, e.msg)
+                loaded = await self.hass.async_add_executor_job(self._load_backup_file, file_path)
+                if loaded is None:
                     return False
+                raw_data, schedule_data = loaded
                 
-                # Validate basic data structure with comprehensive analysis
-                validation_result = self._validate_backup_data_structure(raw_data, file_path)
-                if not validation_result["valid"]:
-                    _LOGGER.error("Backup data structure validation failed for %s", file_path)
-                    _LOGGER.error("Validation errors (%d):", len(validation_result["errors"]))
-                    for error in validation_result["errors"]:
-                        _LOGGER.error("  - %s", error)
+                if schedule_data is None:
+                    # Older version: migrate, then parse the migrated data off the loop
+                    migrated_data = await self._migration_manager.migrate_if_needed(raw_data)
                     
-                    if validation_result.get("warnings"):
-                        _LOGGER.warning("Validation warnings (%d):", len(validation_result["warnings"]))
-                        for warning in validation_result["warnings"]:
-                            _LOGGER.warning("  - %s", warning)
-                    
-                    # Log detailed analysis for troubleshooting
-                    details = validation_result.get("details", {})
-                    if "validation_score" in details:
-                        _LOGGER.info("Validation score: %d/100", details["validation_score"])
-                    
-                    if "structure_analysis" in details:
-                        analysis = details["structure_analysis"]
-                        _LOGGER.debug("Structure analysis: %s", analysis)
+                    # Migrated data was validated by the migration; validate the rest here
+                    if migrated_data is raw_data and not await self._migration_manager.validate_migrated_data(
+                        migrated_data
+                    ):
+                        _LOGGER.error("Backup data validation failed after migration for %s", file_path)
+                        return False
                     
-                    return False
-                
-                # Log validation success with details
-                if validation_result.get("warnings"):
-                    _LOGGER.info("Backup validation passed with %d warnings for %s", 
-                               len(validation_result["warnings"]), file_path)
-                    for warning in validation_result["warnings"]:
-                        _LOGGER.warning("  - %s", warning)
-                else:
-                    _LOGGER.info("Backup validation passed successfully for %s", file_path)
-                
-                # Perform migration if needed
-                migrated_data = await self._migration_manager.migrate_if_needed(raw_data)
-                
-                # Validate migrated data
-                if not await self._migration_manager.validate_migrated_data(migrated_data):
-                    _LOGGER.error("Backup data validation failed after migration for %s", file_path)
-                    return False
-                
-                # Convert to ScheduleData object with additional validation
-                try:
-                    schedule_data = ScheduleData.from_dict(migrated_data)
-                    # Perform additional validation on the created object
-                    schedule_data.validate()
-                except (ValueError, TypeError, AttributeError) as e:
-                    _LOGGER.error("Failed to create valid ScheduleData from backup %s: %s", file_path, e)
-                    return False
+                    schedule_data = await self.hass.async_add_executor_job(
+                        self._parse_migrated_backup, migrated_data, file_path
+                    )
+                    if schedule_data is None:
+                        return False
                 
-            except (OSError, UnicodeDecodeError) as e:
-                _LOGGER.error("Error reading backup file %s: %s", file_path, e)
-                return False
             except Exception as e:
                 _LOGGER.error("Unexpected error processing backup file %s: %s", file_path, e)
                 return False
@@ -371,8 +1044,124 @@ class StorageService:
             _LOGGER.error("Unexpected error importing backup from %s: %s", file_path, e)
             return False
     
+    def _load_backup_file(self, file_path: str) -> Optional[tuple[Dict[str, Any], Optional[ScheduleData]]]:
+        """
+        Read, decompress, parse and validate a backup file.
+        
+        Runs in the executor. Returns the raw data and, for data at the
+        current version, the ScheduleData built while validating it. Returns
+        None (after logging why) if the backup cannot be used.
+        """
+        if not os.path.exists(file_path):
+            _LOGGER.error("Backup file not found: %s", file_path)
+            return None
+        
+        try:
+            _LOGGER.debug("Reading backup file: %s", file_path)
+            
+            # Check file size first
+            try:
+                file_size = os.path.getsize(file_path)
+                _LOGGER.debug("Backup file size: %d bytes", file_size)
+                
+                if file_size == 0:
+                    _LOGGER.error("Backup file is empty: %s", file_path)
+                    return None
+                elif file_size > 100 * 1024 * 1024:  # 100MB limit
+                    _LOGGER.warning("Large backup file detected: %s (%d bytes)", file_path, file_size)
+            except OSError as e:
+                _LOGGER.error("Cannot read file size for %s: %s", file_path, e)
+                return None
+            
+            content = _read_backup_text(file_path).strip()
+            content_length = len(content)
+            _LOGGER.debug("Read backup content: %d characters", content_length)
+            
+            # Check if file is empty
+            if not content:
+                _LOGGER.error("Backup file content is empty: %s", file_path)
+                return None
+            
+            # Parse JSON with detailed error handling
+            try:
+                raw_data = json.loads(content)
+            except json.JSONDecodeError as e:
+                _LOGGER.error("Invalid JSON in backup file %s at line %d, column %d: %s", 
+                            file_path, e.lineno, e.colno, e.msg)
+                return None
+            
+            # Nightly manifests reference the data in the object store
+            if file_path.endswith(BACKUP_MANIFEST_SUFFIX):
+                try:
+                    raw_data = self._read_manifest_content(Path(file_path))
+                except (OSError, ValueError) as e:
+                    _LOGGER.error("Cannot read backup data referenced by %s: %s", file_path, e)
+                    return None
+            
+            # A copied columnar store is validated in the legacy layout
+            if isinstance(raw_data, dict) and raw_data.get(STORAGE_FORMAT_KEY) == STORAGE_FORMAT_COLUMNAR:
+                try:
+                    raw_data = to_legacy_layout(raw_data)
+                except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+                    _LOGGER.error("Invalid columnar data in backup file %s: %s", file_path, e)
+                    return None
+        except (OSError, EOFError, lzma.LZMAError, UnicodeDecodeError) as e:
+            _LOGGER.error("Error reading backup file %s: %s", file_path, e)
+            return None
+        
+        # Validate the structure, parsing current-version data as we go
+        validation_result = self._validate_backup_data_structure(raw_data, file_path, content_length)
+        if not validation_result["valid"]:
+            _LOGGER.error("Backup data structure validation failed for %s", file_path)
+            _LOGGER.error("Validation errors (%d):", len(validation_result["errors"]))
+            for error in validation_result["errors"]:
+                _LOGGER.error("  - %s", error)
+            
+            if validation_result.get("warnings"):
+                _LOGGER.warning("Validation warnings (%d):", len(validation_result["warnings"]))
+                for warning in validation_result["warnings"]:
+                    _LOGGER.warning("  - %s", warning)
+            
+            # Log detailed analysis for troubleshooting
+            details = validation_result.get("details", {})
+            if "validation_score" in details:
+                _LOGGER.info("Validation score: %d/100", details["validation_score"])
+            
+            if "structure_analysis" in details:
+                analysis = details["structure_analysis"]
+                _LOGGER.debug("Structure analysis: %s", analysis)
+            
+            return None
+        
+        # Log validation success with details
+        if validation_result.get("warnings"):
+            _LOGGER.info("Backup validation passed with %d warnings for %s", 
+                       len(validation_result["warnings"]), file_path)
+            for warning in validation_result["warnings"]:
+                _LOGGER.warning("  - %s", warning)
+        else:
+            _LOGGER.info("Backup validation passed successfully for %s", file_path)
+        
+        return raw_data, validation_result.get("schedule_data")
+    
+    @staticmethod
+    def _parse_migrated_backup(migrated_data: Dict[str, Any], file_path: str) -> Optional[ScheduleData]:
+        """Parse migrated backup data, returning None if it is invalid. Runs in the executor."""
+        try:
+            return ScheduleData.from_dict(migrated_data)
+        except (ValueError, TypeError, AttributeError) as e:
+            _LOGGER.error("Failed to create valid ScheduleData from backup %s: %s", file_path, e)
+            return None
+    
     async def create_nightly_backup(self) -> Optional[str]:
-        """Create an automatic nightly backup."""
+        """
+        Create an automatic nightly backup.
+        
+        The schedule data is stored once under objects/, named by its SHA-256
+        (see _backup_object_digest), and the nightly backup is a small manifest referencing it. If the data
+        has not changed since the latest manifest, nothing is written and that
+        manifest's path is returned.
+        """
         try:
             if not self._schedule_data:
                 await self.load_schedules()
@@ -381,26 +1170,292 @@ class StorageService:
                 _LOGGER.debug("No data to backup")
                 return None
             
-            # Create backup with nightly prefix
-            timestamp = datetime.now().strftime("%Y%m%d")
-            filename = f"nightly_backup_{self.entry_id}_{timestamp}.json"
-            path = str(self._backup_dir / filename)
+            content = self._schedule_data.to_dict()
+            digest = _backup_object_digest(content)
             
-            # Only create if doesn't exist (one per day)
-            if os.path.exists(path):
-                _LOGGER.debug("Nightly backup already exists for today")
-                return path
+            latest = await self._async_latest_nightly_manifest()
+            latest_name = latest[0] if latest is not None and latest[1].get("checksum") == digest else None
             
-            backup_path = await self.export_backup(path)
+            path, index_entry = await self.hass.async_add_executor_job(
+                self._write_nightly_backup, content, digest, latest_name
+            )
+            if index_entry is None:
+                _LOGGER.debug("Schedule data unchanged since nightly backup %s", path.name)
+                return str(path)
+            
+            _LOGGER.info("Created nightly backup %s (object %s)", path.name, digest[:12])
+            await self._async_update_backup_index(add={path.name: index_entry})
             
-            # Clean up old nightly backups (keep last 7 days)
+            # Apply retention and drop objects no manifest references
             await self._cleanup_old_backups()
             
-            return backup_path
+            return str(path)
         except Exception as e:
             _LOGGER.error("Error creating nightly backup: %s", e)
             return None
     
+    def _write_nightly_backup(
+        self, content: Dict[str, Any], digest: str, latest_name: Optional[str]
+    ) -> tuple[Path, Optional[Dict[str, Any]]]:
+        """
+        Write a nightly backup object and manifest. Runs in the executor.
+        
+        Returns the manifest path and its index entry. If the latest manifest,
+        already holding this digest, is still on disk, nothing is written and
+        the entry is None.
+        """
+        if latest_name is not None:
+            latest_path = self._backup_dir / latest_name
+            if latest_path.exists():
+                return latest_path, None
+        
+        objects_dir = self._backup_dir / BACKUP_OBJECTS_DIR
+        object_path = objects_dir / f"{digest}.json"
+        # One manifest per day; a later change the same day replaces it
+        timestamp = datetime.now().strftime("%Y%m%d")
+        path = self._backup_dir / f"nightly_backup_{self.entry_id}_{timestamp}{BACKUP_MANIFEST_SUFFIX}"
+        
+        with _BACKUP_OBJECTS_LOCK:
+            objects_dir.mkdir(parents=True, exist_ok=True)
+            if self._backup_object_matches(object_path, digest):
+                object_size = object_path.stat().st_size
+            else:
+                _, object_size, _ = _write_backup_file(str(object_path), content, None)
+            
+            manifest = {
+                "entry_id": self.entry_id,
+                "created": datetime.now().isoformat(),
+                "object": digest,
+                "size": object_size,
+                "version": content.get("version"),
+            }
+            _, manifest_size, _ = _write_backup_file(str(path), manifest, None)
+        
+        return path, {
+            "size": manifest_size,
+            "created": manifest["created"],
+            "type": "nightly",
+            "checksum": digest,
+            "schema_version": manifest["version"],
+            "content_size": manifest["size"],
+        }
+    
+    def _list_backup_files(self) -> list[Path]:
+        """Return this entry's backup files, compressed ones included."""
+        return [
+            path for path in self._backup_dir.glob(f"*{self.entry_id}*")
+            if path.name.endswith(BACKUP_FILE_SUFFIXES)
+        ]
+    
+    async def _async_latest_nightly_manifest(self) -> Optional[tuple[str, Dict[str, Any]]]:
+        """Return the name and index entry of this entry's newest nightly manifest."""
+        index = await self._async_backup_index()
+        manifests = [
+            (name, entry) for name, entry in index.items()
+            if name.startswith("nightly_backup_") and name.endswith(BACKUP_MANIFEST_SUFFIX)
+        ]
+        if not manifests:
+            return None
+        return max(manifests, key=lambda item: item[1]["created"])
+    
+    async def _async_backup_index(self) -> Dict[str, Dict[str, Any]]:
+        """Return the backup index, loading or rebuilding it on first use."""
+        async with self._backup_index_lock:
+            if self._backup_index is None:
+                self._backup_index = await self.hass.async_add_executor_job(self._load_backup_index)
+            return self._backup_index
+    
+    async def _async_update_backup_index(
+        self, add: Optional[Dict[str, Dict[str, Any]]] = None, remove: Iterable[str] = ()
+    ) -> None:
+        """Add and remove index entries and persist the index."""
+        index = await self._async_backup_index()
+        index.update(add or {})
+        for name in remove:
+            index.pop(name, None)
+        await self.hass.async_add_executor_job(self._save_backup_index, dict(index))
+    
+    async def async_index_backup(self, filename: str, entry: Dict[str, Any]) -> None:
+        """Add a backup written into the backup directory elsewhere, e.g. by a migration."""
+        await self._async_update_backup_index(add={filename: {"type": _backup_type(filename), **entry}})
+    
+    async def async_rebuild_backup_index(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the backup index from the files in the backup directory.
+        
+        Backups written by this integration are indexed as they are created
+        (see async_index_backup), so this is only needed if backups were added
+        or removed by hand or the index could not be updated.
+        """
+        async with self._backup_index_lock:
+            self._backup_index = await self.hass.async_add_executor_job(self._rebuild_backup_index)
+            return self._backup_index
+    
+    @property
+    def _backup_index_path(self) -> Path:
+        """Return the path of this entry's backup index."""
+        return self._backup_dir / BACKUP_INDEX_DIR / f"{self.entry_id}.json"
+    
+    def _load_backup_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read the backup index, rebuilding it if it is missing or invalid. Runs in the executor."""
+        index_path = self._backup_index_path
+        try:
+            data = json.loads(index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = None
+        except (OSError, ValueError) as e:
+            _LOGGER.warning("Cannot read backup index %s: %s", index_path, e)
+            data = None
+        
+        if (
+            isinstance(data, dict)
+            and data.get("version") == BACKUP_INDEX_VERSION
+            and isinstance(data.get("backups"), dict)
+        ):
+            return data["backups"]
+        
+        return self._rebuild_backup_index()
+    
+    def _rebuild_backup_index(self) -> Dict[str, Dict[str, Any]]:
+        """Build the backup index by scanning the backup directory. Runs in the executor."""
+        index = {}
+        if self._backup_dir.exists():
+            for backup_file in self._list_backup_files():
+                entry = self._scan_backup_file(backup_file)
+                if entry is not None:
+                    index[backup_file.name] = entry
+        
+        _LOGGER.debug("Rebuilt backup index for entry %s: %d backups", self.entry_id, len(index))
+        if index:
+            self._save_backup_index(index)
+        return index
+    
+    def _scan_backup_file(self, backup_file: Path) -> Optional[Dict[str, Any]]:
+        """Build the index entry for a backup file, or None if it cannot be read."""
+        try:
+            stat = backup_file.stat()
+        except OSError as e:
+            _LOGGER.warning("Error reading backup file %s: %s", backup_file, e)
+            return None
+        
+        entry = {
+            "size": stat.st_size,
+            "created": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "type": _backup_type(backup_file.name),
+            "checksum": None,
+            "schema_version": None,
+        }
+        
+        if backup_file.name.endswith(BACKUP_MANIFEST_SUFFIX):
+            manifest = self._read_backup_manifest(backup_file)
+            if manifest is not None:
+                entry["checksum"] = manifest["object"]
+                entry["schema_version"] = manifest.get("version")
+                entry["content_size"] = manifest.get("size", 0)
+            return entry
+        
+        try:
+            content = _read_backup_text(str(backup_file))
+            entry["checksum"] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            data = json.loads(content)
+        except (OSError, EOFError, lzma.LZMAError, UnicodeDecodeError, ValueError) as e:
+            _LOGGER.debug("Cannot read content of backup file %s: %s", backup_file, e)
+            return entry
+        
+        if isinstance(data, dict) and isinstance(data.get("version"), str):
+            entry["schema_version"] = data["version"]
+        return entry
+    
+    def _save_backup_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        """Persist the backup index. Runs in the executor.
+        
+        Failures are only logged; the index is rebuilt from a scan if lost.
+        """
+        index_path = self._backup_index_path
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_backup_file(
+                str(index_path),
+                {"version": BACKUP_INDEX_VERSION, "entry_id": self.entry_id, "backups": index},
+                None,
+            )
+        except OSError as e:
+            _LOGGER.warning("Cannot write backup index %s: %s", index_path, e)
+    
+    def _indexed_backups_newest_first(self, index: Dict[str, Dict[str, Any]]) -> list[tuple[str, Dict[str, Any]]]:
+        """Return index entries ordered by creation time, newest first."""
+        return sorted(index.items(), key=lambda item: item[1].get("created") or "", reverse=True)
+    
+    @staticmethod
+    def _read_backup_manifest(manifest_path: Path) -> Optional[Dict[str, Any]]:
+        """Read a backup manifest, returning None if it is unreadable."""
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            _LOGGER.warning("Cannot read backup manifest %s: %s", manifest_path, e)
+            return None
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("object"), str):
+            _LOGGER.warning("Invalid backup manifest %s", manifest_path)
+            return None
+        return manifest
+    
+    def _read_manifest_content(self, manifest_path: Path) -> Any:
+        """Read and verify the schedule data a manifest references."""
+        manifest = self._read_backup_manifest(manifest_path)
+        if manifest is None:
+            raise ValueError(f"Invalid backup manifest: {manifest_path.name}")
+        
+        object_path = self._backup_dir / BACKUP_OBJECTS_DIR / f"{manifest['object']}.json"
+        content = json.loads(object_path.read_text(encoding="utf-8"))
+        # Objects written before last_modified was excluded carry the full-content digest
+        if manifest["object"] not in (_backup_object_digest(content), self._content_checksum(content)):
+            raise ValueError(f"Backup object {object_path.name} does not match its checksum")
+        return content
+    
+    def _backup_object_matches(self, object_path: Path, digest: str) -> bool:
+        """Return whether an existing backup object holds the data its name promises."""
+        try:
+            content = json.loads(object_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return digest in (_backup_object_digest(content), self._content_checksum(content))
+    
+    def _prune_backup_objects(self) -> None:
+        """Remove backup objects no manifest of any entry references. Runs in the executor."""
+        objects_dir = self._backup_dir / BACKUP_OBJECTS_DIR
+        
+        with _BACKUP_OBJECTS_LOCK:
+            if not objects_dir.exists():
+                return
+            
+            referenced = set()
+            for manifest_path in self._backup_dir.glob(f"*{BACKUP_MANIFEST_SUFFIX}"):
+                manifest = self._read_backup_manifest(manifest_path)
+                if manifest is None:
+                    # Keep everything rather than risk dropping an object it needs
+                    return
+                referenced.add(manifest["object"])
+            
+            for object_path in objects_dir.glob("*.json"):
+                if object_path.stem not in referenced:
+                    try:
+                        object_path.unlink()
+                        _LOGGER.debug("Removed unreferenced backup object: %s", object_path.name)
+                    except OSError as e:
+                        _LOGGER.error("Error removing backup object %s: %s", object_path, e)
+    
+    def _remove_backup_files(self, names: list[str]) -> list[str]:
+        """Remove backup files by name, returning those removed. Runs in the executor."""
+        removed = []
+        for name in names:
+            old_file = self._backup_dir / name
+            try:
+                old_file.unlink(missing_ok=True)
+                removed.append(name)
+                _LOGGER.debug("Removed old backup: %s", old_file)
+            except Exception as e:
+                _LOGGER.error("Error removing old backup %s: %s", old_file, e)
+        return removed
+    
     async def _migrate_schedule_data(self, schedule_data: ScheduleData) -> ScheduleData:
         """Migrate schedule data from older versions if needed."""
         current_version = schedule_data.version
@@ -428,89 +1483,78 @@ class StorageService:
             recovery_attempts.append({"file": "N/A", "error": error_msg, "strategy": "directory_check"})
             return await self._create_default_schedule_data("No backup directory found")
         
-        # Find backup files
+        # Find backup files, newest first, from the backup index
         try:
-            backup_files = list(self._backup_dir.glob(f"*{self.entry_id}*.json"))
+            index = await self._async_backup_index()
+            candidates = [
+                (self._backup_dir / name, entry) for name, entry in self._indexed_backups_newest_first(index)
+            ]
         except Exception as e:
-            error_msg = f"Error scanning backup directory: {e}"
+            error_msg = f"Error reading backup index: {e}"
             _LOGGER.error(error_msg)
             recovery_attempts.append({"file": "N/A", "error": error_msg, "strategy": "directory_scan"})
             return await self._create_default_schedule_data("Cannot scan backup directory")
         
-        if not backup_files:
+        if not candidates:
             error_msg = f"No backup files found for entry {self.entry_id}"
             _LOGGER.warning(error_msg)
             recovery_attempts.append({"file": "N/A", "error": error_msg, "strategy": "file_search"})
             return await self._create_default_schedule_data("No backup files available")
         
-        # Sort by modification time, newest first
-        try:
-            backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        except Exception as e:
-            _LOGGER.warning("Error sorting backup files, using unsorted order: %s", e)
-        
+        backup_files = [backup_file for backup_file, _entry in candidates]
         _LOGGER.info("Found %d backup files for recovery attempt", len(backup_files))
         
-        # Attempt recovery from each backup file
-        for i, backup_file in enumerate(backup_files):
-            attempt_info = {
-                "file": str(backup_file),
-                "strategy": f"backup_import_{i+1}",
-                "error": None
-            }
+        # Verify candidates a batch at a time in the executor, newest batch first;
+        # only those passing the header and checksum checks are fully imported
+        for batch_start in range(0, len(candidates), RECOVERY_VERIFY_BATCH_SIZE):
+            batch = candidates[batch_start:batch_start + RECOVERY_VERIFY_BATCH_SIZE]
+            verify_results = await asyncio.gather(
+                *(
+                    self.hass.async_add_executor_job(self._verify_backup_candidate, backup_file, entry)
+                    for backup_file, entry in batch
+                ),
+                return_exceptions=True,
+            )
             
-            try:
-                _LOGGER.info("Recovery attempt %d/%d from %s", i+1, len(backup_files), backup_file.name)
-                
-                # Check file accessibility
-                if not backup_file.exists():
-                    attempt_info["error"] = "File no longer exists"
-                    recovery_attempts.append(attempt_info)
-                    continue
-                
-                if not backup_file.is_file():
-                    attempt_info["error"] = "Path is not a regular file"
-                    recovery_attempts.append(attempt_info)
-                    continue
+            for offset, ((backup_file, _entry), verify_error) in enumerate(zip(batch, verify_results)):
+                i = batch_start + offset
+                attempt_info = {
+                    "file": str(backup_file),
+                    "strategy": f"backup_import_{i+1}",
+                    "error": None
+                }
                 
-                # Check file size
                 try:
-                    file_size = backup_file.stat().st_size
-                    if file_size == 0:
-                        attempt_info["error"] = "File is empty"
-                        recovery_attempts.append(attempt_info)
-                        continue
-                    elif file_size > 10 * 1024 * 1024:  # 10MB limit
-                        attempt_info["error"] = f"File too large ({file_size} bytes)"
-                        recovery_attempts.append(attempt_info)
-                        continue
+                    if isinstance(verify_error, BaseException):
+                        raise verify_error
+                    
+                    if verify_error is not None:
+                        attempt_info["error"] = verify_error
+                    else:
+                        _LOGGER.info("Recovery attempt %d/%d from %s", i+1, len(backup_files), backup_file.name)
+                        
+                        # Attempt import
+                        if await self.import_backup(str(backup_file)):
+                            _LOGGER.info("Successfully recovered from %s (attempt %d/%d)", 
+                                       backup_file.name, i+1, len(backup_files))
+                            
+                            # Log recovery summary
+                            self._log_recovery_summary(recovery_attempts, success=True, 
+                                                     successful_file=str(backup_file))
+                            return self._schedule_data
+                        else:
+                            attempt_info["error"] = "Import validation failed"
+                        
+                except PermissionError as e:
+                    attempt_info["error"] = f"Permission denied: {e}"
+                except OSError as e:
+                    attempt_info["error"] = f"File system error: {e}"
                 except Exception as e:
-                    attempt_info["error"] = f"Cannot read file stats: {e}"
-                    recovery_attempts.append(attempt_info)
-                    continue
+                    attempt_info["error"] = f"Unexpected error: {e}"
                 
-                # Attempt import
-                if await self.import_backup(str(backup_file)):
-                    _LOGGER.info("Successfully recovered from %s (attempt %d/%d)", 
-                               backup_file.name, i+1, len(backup_files))
-                    
-                    # Log recovery summary
-                    self._log_recovery_summary(recovery_attempts, success=True, 
-                                             successful_file=str(backup_file))
-                    return self._schedule_data
-                else:
-                    attempt_info["error"] = "Import validation failed"
-                    
-            except PermissionError as e:
-                attempt_info["error"] = f"Permission denied: {e}"
-            except OSError as e:
-                attempt_info["error"] = f"File system error: {e}"
-            except Exception as e:
-                attempt_info["error"] = f"Unexpected error: {e}"
-            
-            recovery_attempts.append(attempt_info)
-            _LOGGER.warning("Recovery attempt %d failed for %s: %s", 
-                          i+1, backup_file.name, attempt_info["error"])
+                recovery_attempts.append(attempt_info)
+                _LOGGER.warning("Recovery attempt %d failed for %s: %s", 
+                              i+1, backup_file.name, attempt_info["error"])
         
         # All recovery attempts failed
         _LOGGER.error("All %d recovery attempts failed", len(backup_files))
@@ -527,6 +1571,64 @@ class StorageService:
         _LOGGER.info("Graceful degradation successful - integration will continue with default data")
         return default_data
     
+    def _verify_backup_candidate(self, backup_file: Path, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Cheaply check that a backup can be restored before importing it.
+        
+        Runs in the executor. Checks the file, its leading bytes and, if the
+        index recorded one, its checksum. Returns why the backup was rejected,
+        or None if it passed.
+        """
+        # Check file accessibility
+        if not backup_file.exists():
+            return "File no longer exists"
+        
+        if not backup_file.is_file():
+            return "Path is not a regular file"
+        
+        # Check file size
+        file_size = backup_file.stat().st_size
+        if file_size == 0:
+            return "File is empty"
+        elif file_size > 10 * 1024 * 1024:  # 10MB limit
+            return f"File too large ({file_size} bytes)"
+        
+        # Header check: compressed files start with their magic bytes, JSON with "{"
+        with open(backup_file, "rb") as f:
+            header = f.read(len(_GZIP_MAGIC) + len(_LZMA_MAGIC))
+        compression = _backup_compression(backup_file.name)
+        if compression == "gzip":
+            header_ok = header.startswith(_GZIP_MAGIC)
+        elif compression == "lzma":
+            header_ok = header.startswith(_LZMA_MAGIC)
+        else:
+            header_ok = header.lstrip().startswith(b"{")
+        if not header_ok:
+            return "Invalid file header"
+        
+        checksum = entry.get("checksum")
+        if backup_file.name.endswith(BACKUP_MANIFEST_SUFFIX):
+            # Verifies the object against the digest it is named by
+            manifest = self._read_backup_manifest(backup_file)
+            if manifest is None:
+                return "Invalid backup manifest"
+            if checksum and manifest["object"] != checksum:
+                return "Manifest does not match the backup index"
+            try:
+                self._read_manifest_content(backup_file)
+            except (OSError, ValueError) as e:
+                return f"Backup object failed verification: {e}"
+            return None
+        
+        if checksum:
+            try:
+                content = _read_backup_text(str(backup_file))
+            except (EOFError, lzma.LZMAError, UnicodeDecodeError) as e:
+                return f"Cannot decode backup: {e}"
+            if hashlib.sha256(content.encode("utf-8")).hexdigest() != checksum:
+                return "Checksum mismatch"
+        return None
+    
     def _log_recovery_summary(self, attempts: list, success: bool, successful_file: str = None) -> None:
         """Log a summary of recovery attempts for troubleshooting."""
         _LOGGER.info("=== Backup Recovery Summary ===")
@@ -674,11 +1776,18 @@ class StorageService:
             # The calling code should handle this gracefully
             return None
     
-    def configure_nightly_backup(self, enabled: bool, backup_time: str = "02:00") -> None:
+    def configure_nightly_backup(
+        self,
+        enabled: bool,
+        backup_time: str = "02:00",
+        retention_days: int = DEFAULT_BACKUP_RETENTION_DAYS,
+    ) -> None:
         """Configure automatic nightly backup settings."""
         self._nightly_backup_enabled = enabled
         self._nightly_backup_time = backup_time
-        _LOGGER.info("Nightly backup configured: enabled=%s, time=%s", enabled, backup_time)
+        self._backup_retention_days = max(0, int(retention_days))
+        _LOGGER.info("Nightly backup configured: enabled=%s, time=%s, retention=%d days",
+                     enabled, backup_time, self._backup_retention_days)
     
     def is_nightly_backup_enabled(self) -> bool:
         """Check if nightly backup is enabled."""
@@ -742,22 +1851,30 @@ class StorageService:
             _LOGGER.warning("Using default backup time 02:00 due to parsing error")
             return 2, 0
     
-    def _validate_backup_data_structure(self, data: Any, file_path: str) -> Dict[str, Any]:
+    def _validate_backup_data_structure(
+        self, data: Any, file_path: str, data_size: Optional[int] = None
+    ) -> Dict[str, Any]:
         """Validate the basic structure of backup data with comprehensive checks.
         
+        Data at the current version is parsed into ScheduleData during the
+        same walk, so importing it needs no separate migration or parse pass.
+        
         Args:
             data: The parsed backup data to validate
             file_path: Path to the backup file for error reporting
+            data_size: Size of the serialized data, if the caller knows it
             
         Returns:
-            Dict with 'valid' boolean, 'errors' list, 'warnings' list, and 'details' dict
+            Dict with 'valid' boolean, 'errors' list, 'warnings' list, 'details'
+            dict and 'schedule_data' (ScheduleData or None)
         """
         errors = []
         warnings = []
+        schedule_data = None
         details = {
             "file_path": file_path,
             "validation_timestamp": datetime.now().isoformat(),
-            "data_size": len(str(data)) if data else 0,
+            "data_size": data_size if data_size is not None else 0,
             "structure_analysis": {}
         }
         
@@ -766,7 +1883,13 @@ class StorageService:
             if not isinstance(data, dict):
                 errors.append(f"Root data must be a dictionary, got {type(data).__name__}")
                 details["structure_analysis"]["root_type"] = type(data).__name__
-                return {"valid": False, "errors": errors, "warnings": warnings, "details": details}
+                return {
+                    "valid": False,
+                    "errors": errors,
+                    "warnings": warnings,
+                    "details": details,
+                    "schedule_data": None
+                }
             
             details["structure_analysis"]["root_type"] = "dict"
             details["structure_analysis"]["top_level_keys"] = list(data.keys())
@@ -811,11 +1934,19 @@ class StorageService:
                     if not re.match(version_pattern, version):
                         warnings.append(f"Version format may be invalid: {version} (expected X.Y or X.Y.Z)")
             
-            # Validate schedules field with comprehensive structure analysis
+            # Validate schedules field with comprehensive structure analysis; slots
+            # are only built for data that needs no migration before parsing
+            parsed_schedules = None
             if "schedules" in data:
                 schedules = data["schedules"]
-                schedule_analysis = self._analyze_schedules_structure(schedules, errors, warnings)
+                if data.get("version") == VERSION and "entities_tracked" in data:
+                    parsed_schedules = {}
+                schedule_analysis = self._analyze_schedules_structure(
+                    schedules, errors, warnings, parsed_schedules
+                )
                 details["structure_analysis"]["schedules"] = schedule_analysis
+                if not schedule_analysis["slots_parsed"]:
+                    parsed_schedules = None
             
             # Validate entities_tracked
             if "entities_tracked" in data:
@@ -875,10 +2006,13 @@ class StorageService:
                     presence_config_analysis = self._analyze_presence_config_structure(presence_config, errors, warnings)
                     details["structure_analysis"]["presence_config"] = presence_config_analysis
             
-            # Check for unexpected data types in nested structures
-            nested_validation_errors = []
-            self._validate_nested_data_types(data, nested_validation_errors, "root")
-            errors.extend(nested_validation_errors)
+            # Build the schedule data from the slots parsed above
+            if parsed_schedules is not None and not errors:
+                try:
+                    schedule_data = ScheduleData.from_parsed_slots(data, parsed_schedules)
+                except (ValueError, TypeError, AttributeError, KeyError) as e:
+                    # Left to the migration path, which reports the failure
+                    _LOGGER.debug("Backup %s not parsed during validation: %s", file_path, e)
             
             # Calculate validation score
             total_checks = len(required_fields) + len(optional_fields) + 10  # Additional checks
@@ -895,17 +2029,26 @@ class StorageService:
             "valid": len(errors) == 0,
             "errors": errors,
             "warnings": warnings,
-            "details": details
+            "details": details,
+            "schedule_data": schedule_data if not errors else None
         }
     
-    def _analyze_schedules_structure(self, schedules: Any, errors: list, warnings: list) -> Dict[str, Any]:
-        """Analyze schedules structure and return detailed information."""
+    def _analyze_schedules_structure(
+        self, schedules: Any, errors: list, warnings: list, parsed: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Analyze schedules structure and return detailed information.
+        
+        If parsed is given, slots are also built into it as mode -> day ->
+        ScheduleSlot list; analysis["slots_parsed"] records whether every
+        slot could be built.
+        """
         analysis = {
             "type": type(schedules).__name__,
             "modes": [],
             "total_slots": 0,
             "days_coverage": {},
-            "validation_issues": []
+            "validation_issues": [],
+            "slots_parsed": parsed is not None
         }
         
         if not isinstance(schedules, dict):
@@ -926,6 +2069,8 @@ class StorageService:
                 continue
             
             mode_analysis = {"days": [], "slots_per_day": {}, "total_slots": 0}
+            if analysis["slots_parsed"]:
+                parsed[mode] = {}
             
             for day, day_schedules in mode_schedules.items():
                 mode_analysis["days"].append(day)
@@ -953,6 +2098,13 @@ class StorageService:
                     for field in required_slot_fields:
                         if field not in slot:
                             errors.append(f"Slot {i} in {mode}/{day} missing required field: {field}")
+                    
+                    if analysis["slots_parsed"]:
+                        try:
+                            parsed[mode].setdefault(day, []).append(ScheduleSlot.from_dict(day, slot))
+                        except (ValueError, TypeError, AttributeError, KeyError) as e:
+                            analysis["slots_parsed"] = False
+                            analysis["validation_issues"].append(f"Slot {i} in {mode}/{day}: {e}")
             
             analysis["days_coverage"][mode] = mode_analysis
         
@@ -1119,40 +2271,6 @@ class StorageService:
         
         return analysis
     
-    def _validate_nested_data_types(self, data: Any, errors: list, path: str) -> None:
-        """Recursively validate data types in nested structures.
-        
-        Args:
-            data: Data to validate
-            errors: List to append errors to
-            path: Current path in the data structure for error reporting
-        """
-        try:
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    # Validate key type
-                    if not isinstance(key, str):
-                        errors.append(f"Dictionary key at '{path}' must be string, got {type(key).__name__}")
-                    
-                    # Recursively validate values
-                    new_path = f"{path}.{key}" if path != "root" else key
-                    self._validate_nested_data_types(value, errors, new_path)
-                    
-            elif isinstance(data, list):
-                for i, item in enumerate(data):
-                    new_path = f"{path}[{i}]"
-                    self._validate_nested_data_types(item, errors, new_path)
-                    
-            elif isinstance(data, (str, int, float, bool)) or data is None:
-                # These are valid JSON types
-                pass
-            else:
-                # Invalid type for JSON
-                errors.append(f"Invalid data type at '{path}': {type(data).__name__}")
-                
-        except Exception as e:
-            errors.append(f"Error validating nested data at '{path}': {str(e)}")
-    
     async def schedule_nightly_backup(self) -> None:
         """Schedule the nightly backup using Home Assistant's time tracking."""
         if not self._nightly_backup_enabled:
@@ -1189,32 +2307,42 @@ class StorageService:
             _LOGGER.error("Error during scheduled backup: %s", e)
     
     async def get_backup_info(self) -> Dict[str, Any]:
-        """Get information about available backups."""
+        """Get information about available backups.
+        
+        Nightly manifests report the size of the data they reference as
+        content_size; total_size counts each shared object once.
+        """
         if not self._backup_dir.exists():
             return {"backups": [], "total_size": 0}
         
         backups = []
         total_size = 0
+        counted_objects = set()
         
         try:
-            backup_files = list(self._backup_dir.glob(f"*{self.entry_id}*.json"))
-            
-            for backup_file in backup_files:
-                try:
-                    stat = backup_file.stat()
-                    backups.append({
-                        "filename": backup_file.name,
-                        "path": str(backup_file),
-                        "size": stat.st_size,
-                        "created": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        "type": "nightly" if "nightly_backup" in backup_file.name else "manual"
-                    })
-                    total_size += stat.st_size
-                except Exception as e:
-                    _LOGGER.warning("Error reading backup file %s: %s", backup_file, e)
-            
-            # Sort by creation time, newest first
-            backups.sort(key=lambda x: x["created"], reverse=True)
+            index = await self._async_backup_index()
+            
+            # Newest first, as recorded in the backup index
+            for name, entry in self._indexed_backups_newest_first(index):
+                info = {
+                    "filename": name,
+                    "path": str(self._backup_dir / name),
+                    "size": entry["size"],
+                    "created": entry["created"],
+                    "type": entry["type"],
+                    "checksum": entry.get("checksum"),
+                    "schema_version": entry.get("schema_version")
+                }
+                total_size += entry["size"]
+                
+                if name.endswith(BACKUP_MANIFEST_SUFFIX) and entry.get("checksum"):
+                    info["object"] = entry["checksum"]
+                    info["content_size"] = entry.get("content_size", 0)
+                    if entry["checksum"] not in counted_objects:
+                        counted_objects.add(entry["checksum"])
+                        total_size += entry.get("content_size", 0)
+                
+                backups.append(info)
             
             return {
                 "backups": backups,
@@ -1239,35 +2367,49 @@ class StorageService:
                 _LOGGER.error("Security violation: backup file outside backup directory")
                 return False
             
-            if self.entry_id not in filename or not filename.endswith('.json'):
+            if self.entry_id not in filename or not filename.endswith(BACKUP_FILE_SUFFIXES):
                 _LOGGER.error("Invalid backup filename format: %s", filename)
                 return False
             
-            backup_path.unlink()
+            await self.hass.async_add_executor_job(backup_path.unlink)
             _LOGGER.info("Deleted backup file: %s", filename)
+            await self._async_update_backup_index(remove=[filename])
+            
+            if filename.endswith(BACKUP_MANIFEST_SUFFIX):
+                await self.hass.async_add_executor_job(self._prune_backup_objects)
             return True
         except Exception as e:
             _LOGGER.error("Error deleting backup %s: %s", filename, e)
             return False
     
     async def _cleanup_old_backups(self) -> None:
-        """Clean up old nightly backups, keeping only the last 7 days."""
+        """
+        Clean up old nightly backups.
+        
+        The most recent MIN_NIGHTLY_BACKUPS are always kept, plus any newer
+        than the retention period. Manifests only reference shared objects, so
+        a long retention costs one object per distinct version of the data.
+        """
         try:
-            if not self._backup_dir.exists():
+            if not await self.hass.async_add_executor_job(self._backup_dir.exists):
                 return
             
-            nightly_files = list(self._backup_dir.glob(f"nightly_backup_{self.entry_id}_*.json"))
-            
-            # Sort by modification time, newest first
-            nightly_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # Remove files beyond the 7 most recent
-            for old_file in nightly_files[7:]:
-                try:
-                    old_file.unlink()
-                    _LOGGER.debug("Removed old backup: %s", old_file)
-                except Exception as e:
-                    _LOGGER.error("Error removing old backup %s: %s", old_file, e)
+            index = await self._async_backup_index()
+            nightly_backups = [
+                (name, entry) for name, entry in self._indexed_backups_newest_first(index)
+                if name.startswith(f"nightly_backup_{self.entry_id}_")
+            ]
+            
+            cutoff = (datetime.now() - timedelta(days=self._backup_retention_days)).isoformat()
+            expired = [
+                name for name, entry in nightly_backups[MIN_NIGHTLY_BACKUPS:]
+                if entry["created"] < cutoff
+            ]
+            
+            removed = await self.hass.async_add_executor_job(self._remove_backup_files, expired)
+            if removed:
+                await self._async_update_backup_index(remove=removed)
+            await self.hass.async_add_executor_job(self._prune_backup_objects)
         except Exception as e:
             _LOGGER.error("Error during backup cleanup: %s", e)
     
@@ -0,0 +1,86 @@
+"""Compiled week timeline for fast schedule slot lookup."""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .const import WEEKDAYS, MINUTES_PER_HOUR, DAYS_PER_WEEK
+from .models import MINUTES_PER_DAY, ScheduleSlot
+
+_LOGGER = logging.getLogger(__name__)
+
+MINUTES_PER_WEEK = MINUTES_PER_DAY * DAYS_PER_WEEK
+
+# The grid stores a slot that runs until midnight with an end time of "23:59"
+END_OF_DAY_TIME = "23:59"
+
+
+def slot_bounds(slot: ScheduleSlot) -> tuple[int, int]:
+    """Return the (start, end) minutes of a slot as a half-open interval."""
+    end = slot.end_minute
+    return slot.start_minute, MINUTES_PER_DAY if end == MINUTES_PER_DAY - 1 else end
+
+
+def minute_of_week(moment: datetime) -> int:
+    """Return the minute offset of a moment from Monday 00:00."""
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * MINUTES_PER_HOUR + moment.minute
+
+
+class WeekTimeline:
+    """Sorted minute-of-week boundary index for a single mode's schedules.
+
+    Slots are compiled once into parallel arrays of start minutes, end minutes
+    and slot references so that looking up the active slot is a single bisect
+    instead of a scan with string parsing per slot.
+    """
+
+    def __init__(self, mode_schedules: Dict[str, List[ScheduleSlot]]) -> None:
+        """Compile the timeline from a mode's day -> slots mapping."""
+        entries = []
+        for day, slots in mode_schedules.items():
+            day_key = day.lower()
+            if day_key not in WEEKDAYS:
+                _LOGGER.debug("Skipping unknown day %s while compiling timeline", day)
+                continue
+
+            day_offset = WEEKDAYS.index(day_key) * MINUTES_PER_DAY
+            for slot in slots:
+                start, end = slot_bounds(slot)
+                entries.append((day_offset + start, day_offset + end, slot))
+
+        entries.sort(key=lambda entry: entry[0])
+
+        self._starts: List[int] = [entry[0] for entry in entries]
+        self._ends: List[int] = [entry[1] for entry in entries]
+        self._slots: List[ScheduleSlot] = [entry[2] for entry in entries]
+
+    def __len__(self) -> int:
+        """Return the number of compiled slots."""
+        return len(self._slots)
+
+    def slot_at(self, minute: int) -> Optional[ScheduleSlot]:
+        """Return the slot covering the given minute of the week, if any."""
+        index = bisect_right(self._starts, minute) - 1
+        if index >= 0 and minute < self._ends[index]:
+            return self._slots[index]
+        return None
+
+    def slot_for(self, moment: datetime) -> Optional[ScheduleSlot]:
+        """Return the slot covering the given moment, if any."""
+        return self.slot_at(minute_of_week(moment))
+
+    def next_start_after(self, minute: int) -> Optional[int]:
+        """Return the minute of the next slot start strictly after the given minute.
+
+        The week wraps around, so the result may be up to one week past the
+        input (i.e. greater than MINUTES_PER_WEEK). Returns None if empty.
+        """
+        if not self._starts:
+            return None
+
+        index = bisect_right(self._starts, minute)
+        if index < len(self._starts):
+            return self._starts[index]
+        return self._starts[0] + MINUTES_PER_WEEK
@@ -1,10 +1,11 @@
 """Upgrade manager for handling version upgrades and compatibility."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Optional
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
@@ -12,6 +13,7 @@ from homeassistant.helpers.storage import Store
 from .const import DOMAIN, STORAGE_KEY
 from .version import VERSION, VersionInfo, is_version_supported
 from .migration import MigrationManager, UninstallManager
+from .storage import ShardedScheduleStore, StorageService
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,14 +25,31 @@ class UpgradeManager:
         """Initialize upgrade manager."""
         self.hass = hass
         self._version_info = VersionInfo()
+        # Stored data read by check_upgrade_compatibility, handed to the
+        # upgrade that follows so each store is loaded only once
+        self._loaded_data: dict[str, dict[str, Any]] = {}
+        self._entry_stores: dict[str, ShardedScheduleStore] = {}
+        # Per-entry readiness and results published by async_upgrade_entries
+        self._ready: dict[str, asyncio.Event] = {}
+        self._results: dict[str, dict[str, Any]] = {}
+        # Serializes read-modify-write of the shared upgrade history store
+        self._history_lock = asyncio.Lock()
     
     async def check_upgrade_compatibility(self, entry_id: str) -> dict[str, Any]:
         """Check if an upgrade is compatible and safe."""
         try:
-            # Load existing data to check version
-            store = Store(self.hass, 1, f"{STORAGE_KEY}_{entry_id}")
+            # Load existing data to check version; the store keeps whichever
+            # layout (single blob or shards) it finds
+            store = ShardedScheduleStore(self.hass, entry_id, sharded=None)
             existing_data = await store.async_load()
             
+            if existing_data:
+                self._loaded_data[entry_id] = existing_data
+                self._entry_stores[entry_id] = store
+            else:
+                self._loaded_data.pop(entry_id, None)
+                self._entry_stores.pop(entry_id, None)
+            
             if not existing_data:
                 return {
                     "compatible": True,
@@ -169,14 +188,7 @@ class UpgradeManager:
     
     async def perform_upgrade(self, entry_id: str, create_backup: bool = True) -> dict[str, Any]:
         """Perform the upgrade process with proper error handling."""
-        upgrade_info = {
-            "success": False,
-            "timestamp": datetime.now().isoformat(),
-            "backup_created": False,
-            "migration_applied": False,
-            "validation_passed": False,
-            "errors": []
-        }
+        upgrade_info = self._new_upgrade_info()
         
         try:
             # Check compatibility first
@@ -187,49 +199,9 @@ class UpgradeManager:
             
             # Create backup if requested and recommended
             if create_backup and compatibility.get("backup_recommended", False):
-                uninstall_manager = UninstallManager(self.hass)
-                try:
-                    backup_locations = await uninstall_manager._create_final_backup()
-                    upgrade_info["backup_created"] = len(backup_locations) > 0
-                    upgrade_info["backup_locations"] = backup_locations
-                except Exception as e:
-                    _LOGGER.warning("Failed to create upgrade backup: %s", e)
-                    upgrade_info["errors"].append(f"Backup creation failed: {e}")
+                await self._create_upgrade_backup(upgrade_info)
             
-            # Perform migration if needed
-            if compatibility.get("migration_required", False):
-                migration_manager = MigrationManager(self.hass, entry_id)
-                
-                # Load and migrate data
-                store = Store(self.hass, 1, f"{STORAGE_KEY}_{entry_id}")
-                existing_data = await store.async_load()
-                
-                if existing_data:
-                    try:
-                        migrated_data = await migration_manager.migrate_if_needed(existing_data)
-                        
-                        # Save migrated data
-                        await store.async_save(migrated_data)
-                        upgrade_info["migration_applied"] = True
-                        
-                        # Validate migrated data
-                        validation_passed = await migration_manager.validate_migrated_data(migrated_data)
-                        upgrade_info["validation_passed"] = validation_passed
-                        
-                        if not validation_passed:
-                            upgrade_info["errors"].append("Migration validation failed")
-                            return upgrade_info
-                            
-                    except Exception as e:
-                        upgrade_info["errors"].append(f"Migration failed: {e}")
-                        return upgrade_info
-            
-            # Record upgrade completion
-            await self._record_upgrade_completion(entry_id, compatibility)
-            upgrade_info["success"] = True
-            
-            _LOGGER.info("Upgrade completed successfully from %s to %s", 
-                        compatibility.get("current_version"), VERSION)
+            await self._apply_upgrade(entry_id, compatibility, upgrade_info)
             
         except Exception as e:
             _LOGGER.error("Unexpected error during upgrade: %s", e)
@@ -237,6 +209,192 @@ class UpgradeManager:
         
         return upgrade_info
     
+    async def async_upgrade_entries(
+        self, entry_ids: Iterable[str], create_backup: bool = True
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Load and migrate the stores of several config entries concurrently.
+        
+        All stores are loaded and checked in parallel, a single backup is
+        taken if any entry needs one, and the migrations then run in
+        parallel. Each entry is published as ready as soon as its own store
+        is current, so setting up one entry never waits on another entry's
+        migration. Entries that are already current are not recorded in the
+        upgrade history.
+        """
+        entry_ids = list(dict.fromkeys(entry_ids))
+        for entry_id in entry_ids:
+            self._ready.setdefault(entry_id, asyncio.Event())
+        
+        results = {entry_id: self._new_upgrade_info() for entry_id in entry_ids}
+        
+        try:
+            compatibilities = await asyncio.gather(
+                *(self.check_upgrade_compatibility(entry_id) for entry_id in entry_ids)
+            )
+            
+            pending: list[tuple[str, dict[str, Any]]] = []
+            for entry_id, compatibility in zip(entry_ids, compatibilities):
+                upgrade_info = results[entry_id]
+                if not compatibility["compatible"]:
+                    upgrade_info["errors"].append(compatibility.get("error", "Upgrade not compatible"))
+                    self._publish_ready(entry_id, upgrade_info)
+                elif not compatibility.get("migration_required", False):
+                    self._loaded_data.pop(entry_id, None)
+                    self._entry_stores.pop(entry_id, None)
+                    upgrade_info["success"] = True
+                    self._publish_ready(entry_id, upgrade_info)
+                else:
+                    pending.append((entry_id, compatibility))
+            
+            if not pending:
+                return results
+            
+            _LOGGER.info("Migrating %d of %d Roost Scheduler entries to %s",
+                        len(pending), len(entry_ids), VERSION)
+            
+            # The backup covers every storage file, so it is taken once for
+            # the whole batch rather than once per entry
+            if create_backup and any(c.get("backup_recommended", False) for _, c in pending):
+                backup_info = self._new_upgrade_info()
+                await self._create_upgrade_backup(backup_info)
+                for entry_id, _ in pending:
+                    results[entry_id]["backup_created"] = backup_info["backup_created"]
+                    results[entry_id]["errors"].extend(backup_info["errors"])
+                    if "backup_locations" in backup_info:
+                        results[entry_id]["backup_locations"] = backup_info["backup_locations"]
+            
+            await asyncio.gather(
+                *(
+                    self._upgrade_and_publish(entry_id, compatibility, results[entry_id])
+                    for entry_id, compatibility in pending
+                )
+            )
+        finally:
+            # Never leave a waiter blocked, whatever happened above
+            for entry_id in entry_ids:
+                if not self._ready[entry_id].is_set():
+                    self._publish_ready(entry_id, results[entry_id])
+        
+        return results
+    
+    def async_schedule_upgrades(
+        self, entry_ids: Iterable[str], create_backup: bool = True
+    ) -> asyncio.Task:
+        """
+        Start async_upgrade_entries in the background.
+        
+        Readiness events are registered before the task is created, so an
+        entry that is set up before the task first runs still waits for it.
+        """
+        entry_ids = list(entry_ids)
+        for entry_id in entry_ids:
+            self._ready.setdefault(entry_id, asyncio.Event())
+        return self.hass.async_create_task(self.async_upgrade_entries(entry_ids, create_backup))
+    
+    def is_entry_ready(self, entry_id: str) -> bool:
+        """Return True if the entry's store is safe to load."""
+        event = self._ready.get(entry_id)
+        return event is None or event.is_set()
+    
+    async def async_wait_ready(self, entry_id: str) -> Optional[dict[str, Any]]:
+        """
+        Wait until the entry's startup upgrade has finished.
+        
+        Returns the entry's upgrade result, or None for entries that are not
+        part of a coordinated upgrade (those are ready immediately).
+        """
+        event = self._ready.get(entry_id)
+        if event is None:
+            return None
+        await event.wait()
+        return self._results.get(entry_id)
+    
+    def _publish_ready(self, entry_id: str, upgrade_info: dict[str, Any]) -> None:
+        """Record an entry's upgrade result and release anything waiting on it."""
+        self._results[entry_id] = upgrade_info
+        self._ready.setdefault(entry_id, asyncio.Event()).set()
+    
+    async def _upgrade_and_publish(
+        self, entry_id: str, compatibility: dict[str, Any], upgrade_info: dict[str, Any]
+    ) -> None:
+        """Apply one entry's upgrade as part of a batch and publish its readiness."""
+        try:
+            await self._apply_upgrade(entry_id, compatibility, upgrade_info)
+        except Exception as e:
+            _LOGGER.error("Unexpected error upgrading entry %s: %s", entry_id, e)
+            upgrade_info["errors"].append(f"Unexpected error: {e}")
+        finally:
+            self._publish_ready(entry_id, upgrade_info)
+    
+    @staticmethod
+    def _new_upgrade_info() -> dict[str, Any]:
+        """Return an empty upgrade result."""
+        return {
+            "success": False,
+            "timestamp": datetime.now().isoformat(),
+            "backup_created": False,
+            "migration_applied": False,
+            "validation_passed": False,
+            "errors": []
+        }
+    
+    async def _create_upgrade_backup(self, upgrade_info: dict[str, Any]) -> None:
+        """Back up all integration storage files before migrating."""
+        uninstall_manager = UninstallManager(self.hass)
+        try:
+            backup_locations = await uninstall_manager._create_final_backup()
+            upgrade_info["backup_created"] = len(backup_locations) > 0
+            upgrade_info["backup_locations"] = backup_locations
+        except Exception as e:
+            _LOGGER.warning("Failed to create upgrade backup: %s", e)
+            upgrade_info["errors"].append(f"Backup creation failed: {e}")
+    
+    async def _apply_upgrade(
+        self, entry_id: str, compatibility: dict[str, Any], upgrade_info: dict[str, Any]
+    ) -> None:
+        """Migrate and save one entry's store, then record the upgrade."""
+        # Reuse the data and store the compatibility check loaded
+        existing_data = self._loaded_data.pop(entry_id, None)
+        store = self._entry_stores.pop(entry_id, None)
+        
+        # Perform migration if needed
+        if compatibility.get("migration_required", False):
+            # Index the pre-migration backup so the entry's StorageService sees it
+            migration_manager = MigrationManager(
+                self.hass, entry_id, backup_indexer=StorageService(self.hass, entry_id).async_index_backup
+            )
+            if store is None or existing_data is None:
+                store = ShardedScheduleStore(self.hass, entry_id, sharded=None)
+                existing_data = await store.async_load()
+            
+            if existing_data:
+                try:
+                    # migrate_if_needed validates what it migrates and raises
+                    # if validation fails, so no second validation pass here
+                    migrated_data = await migration_manager.migrate_if_needed(existing_data)
+                    if migrated_data is existing_data and not await migration_manager.validate_migrated_data(
+                        migrated_data
+                    ):
+                        upgrade_info["errors"].append("Migration validation failed")
+                        return
+                    upgrade_info["validation_passed"] = True
+                    
+                    # Save migrated data
+                    await store.async_save(migrated_data)
+                    upgrade_info["migration_applied"] = True
+                        
+                except Exception as e:
+                    upgrade_info["errors"].append(f"Migration failed: {e}")
+                    return
+        
+        # Record upgrade completion
+        await self._record_upgrade_completion(entry_id, compatibility)
+        upgrade_info["success"] = True
+        
+        _LOGGER.info("Upgrade completed successfully from %s to %s", 
+                    compatibility.get("current_version"), VERSION)
+    
     async def _record_upgrade_completion(self, entry_id: str, compatibility_info: dict) -> None:
         """Record successful upgrade completion for tracking."""
         try:
@@ -249,16 +407,18 @@ class UpgradeManager:
                 "new_features": compatibility_info.get("new_features", [])
             }
             
-            # Store upgrade record
-            upgrade_store = Store(self.hass, 1, f"{STORAGE_KEY}_upgrades")
-            existing_records = await upgrade_store.async_load() or []
-            existing_records.append(upgrade_record)
-            
-            # Keep only last 10 upgrade records
-            if len(existing_records) > 10:
-                existing_records = existing_records[-10:]
-            
-            await upgrade_store.async_save(existing_records)
+            # Store upgrade record; entries upgraded concurrently share this
+            # store, so the read-modify-write must not interleave
+            async with self._history_lock:
+                upgrade_store = Store(self.hass, 1, f"{STORAGE_KEY}_upgrades")
+                existing_records = await upgrade_store.async_load() or []
+                existing_records.append(upgrade_record)
+                
+                # Keep only last 10 upgrade records
+                if len(existing_records) > 10:
+                    existing_records = existing_records[-10:]
+                
+                await upgrade_store.async_save(existing_records)
             
         except Exception as e:
             _LOGGER.warning("Failed to record upgrade completion: %s", e)
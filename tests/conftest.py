@@ -0,0 +1,15 @@
+"""Shared fixtures for the Roost Scheduler tests."""
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def registration_fix_backup_root(tmp_path):
+    """Write registration fix backups to a temporary directory, not the package."""
+    with patch(
+        "custom_components.roost_scheduler.config_flow_registration_fixer."
+        "ConfigFlowRegistrationFixer._get_backup_root",
+        return_value=tmp_path,
+    ):
+        yield tmp_path
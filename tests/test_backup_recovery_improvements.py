@@ -32,7 +32,7 @@ def mock_hass():
     hass.data = {}
     hass.config = MagicMock()
     hass.config.config_dir = "/config"
-    hass.async_add_executor_job = AsyncMock()
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda target, *args: target(*args))
     return hass
 
 
@@ -53,6 +53,20 @@ def storage_service(mock_hass, mock_config_entry):
     return StorageService(mock_hass, mock_config_entry.entry_id)
 
 
+def backup_index(*names):
+    """Build a backup index listing the given files, oldest first."""
+    return {
+        name: {
+            "size": 100,
+            "created": f"2025-10-07T10:{i:02d}:00",
+            "type": "manual",
+            "checksum": None,
+            "schema_version": "0.4.0"
+        }
+        for i, name in enumerate(names)
+    }
+
+
 class TestBackupDataTypeParsing:
     """Test backup parsing with different data types and formats."""
     
@@ -365,90 +379,70 @@ class TestBackupRecoveryFallbackMechanisms:
     @pytest.mark.asyncio
     async def test_recovery_fallback_all_backups_corrupted(self, storage_service, mock_hass):
         """Test recovery fallback when all backup files are corrupted."""
-        # Create mock corrupted backup files
-        mock_backup_files = []
-        for i in range(3):
-            mock_file = MagicMock(spec=Path)
-            mock_file.name = f"backup{i+1}.json"
-            mock_file.exists.return_value = True
-            mock_file.is_file.return_value = True
-            mock_file.stat.return_value.st_size = 100  # Valid size
-            mock_backup_files.append(mock_file)
+        # Index three corrupted backup files
+        storage_service._backup_index = backup_index("backup1.json", "backup2.json", "backup3.json")
         
         mock_default_data = MagicMock()
         mock_default_data.version = "0.4.0"
         mock_default_data.schedules = {"home": {}, "away": {}}
         
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.glob', return_value=mock_backup_files):
-                with patch.object(storage_service, 'import_backup', return_value=False):
-                    with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
-                        result = await storage_service._attempt_recovery()
-                        
-                        # Should fall back to default data after all recovery attempts fail
-                        assert result is not None
-                        assert hasattr(result, 'version')
-                        assert hasattr(result, 'schedules')
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch.object(storage_service, '_verify_backup_candidate', return_value=None):
+            with patch.object(storage_service, 'import_backup', return_value=False) as mock_import:
+                with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
+                    result = await storage_service._attempt_recovery()
+                    
+                    # Should fall back to default data after all recovery attempts fail
+                    assert mock_import.call_count == 3
+                    assert result is not None
+                    assert hasattr(result, 'version')
+                    assert hasattr(result, 'schedules')
     
     @pytest.mark.asyncio
     async def test_recovery_fallback_file_permission_errors(self, storage_service, mock_hass):
         """Test recovery fallback when backup files have permission errors."""
-        mock_backup_files = [MagicMock(spec=Path)]
-        mock_backup_files[0].name = "backup1.json"
-        mock_backup_files[0].exists.return_value = True
-        mock_backup_files[0].is_file.return_value = True
-        mock_backup_files[0].stat.side_effect = PermissionError("Access denied")
+        storage_service._backup_index = backup_index("backup1.json")
         
         mock_default_data = MagicMock()
         mock_default_data.version = "0.4.0"
         mock_default_data.schedules = {"home": {}, "away": {}}
         
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.glob', return_value=mock_backup_files):
-                with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
-                    result = await storage_service._attempt_recovery()
-                    
-                    # Should fall back to default data
-                    assert result is not None
-                    assert hasattr(result, 'version')
-                    assert hasattr(result, 'schedules')
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch('pathlib.Path.is_file', return_value=True), \
+             patch('pathlib.Path.stat', side_effect=PermissionError("Access denied")):
+            with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
+                result = await storage_service._attempt_recovery()
+                
+                # Should fall back to default data
+                assert result is not None
+                assert hasattr(result, 'version')
+                assert hasattr(result, 'schedules')
     
     @pytest.mark.asyncio
     async def test_recovery_fallback_file_system_errors(self, storage_service, mock_hass):
         """Test recovery fallback when file system errors occur."""
-        mock_backup_files = [MagicMock(spec=Path)]
-        mock_backup_files[0].name = "backup1.json"
-        mock_backup_files[0].exists.return_value = True
-        mock_backup_files[0].is_file.return_value = True
-        mock_backup_files[0].stat.side_effect = OSError("File system error")
+        storage_service._backup_index = backup_index("backup1.json")
         
         mock_default_data = MagicMock()
         mock_default_data.version = "0.4.0"
         mock_default_data.schedules = {"home": {}, "away": {}}
         
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.glob', return_value=mock_backup_files):
-                with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
-                    result = await storage_service._attempt_recovery()
-                    
-                    # Should fall back to default data
-                    assert result is not None
-                    assert hasattr(result, 'version')
-                    assert hasattr(result, 'schedules')
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch('pathlib.Path.is_file', return_value=True), \
+             patch('pathlib.Path.stat', side_effect=OSError("File system error")):
+            with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
+                result = await storage_service._attempt_recovery()
+                
+                # Should fall back to default data
+                assert result is not None
+                assert hasattr(result, 'version')
+                assert hasattr(result, 'schedules')
     
     @pytest.mark.asyncio
     async def test_recovery_priority_newest_first(self, storage_service, mock_hass):
         """Test that recovery attempts newest backup files first."""
-        # Create mock backup files with different modification times
-        mock_backup_files = []
-        for i in range(3):
-            mock_file = MagicMock(spec=Path)
-            mock_file.name = f"backup_{i}.json"
-            mock_file.exists.return_value = True
-            mock_file.is_file.return_value = True
-            mock_file.stat.return_value.st_mtime = 1000 + i  # Increasing timestamps
-            mock_file.stat.return_value.st_size = 100  # Valid size
-            mock_backup_files.append(mock_file)
+        # Index backup files with increasing creation times
+        storage_service._backup_index = backup_index("backup_0.json", "backup_1.json", "backup_2.json")
         
         import_attempts = []
         
@@ -461,32 +455,23 @@ class TestBackupRecoveryFallbackMechanisms:
         mock_default_data.version = "0.4.0"
         mock_default_data.schedules = {"home": {}, "away": {}}
         
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.glob', return_value=mock_backup_files):
-                with patch.object(storage_service, 'import_backup', side_effect=mock_import_backup):
-                    with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
-                        # Mock the _schedule_data attribute to simulate successful recovery
-                        storage_service._schedule_data = mock_default_data
-                        result = await storage_service._attempt_recovery()
-                        
-                        # Should have attempted recovery in reverse chronological order (newest first)
-                        # From the logs, we can see it's working correctly: backup_2.json, backup_1.json, backup_0.json
-                        assert len(import_attempts) == 3
-                        # The test is successful - the recovery system is attempting files in the correct order
-                        # as evidenced by the log output showing "Recovery attempt 1/3 from backup_2.json" first
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch.object(storage_service, '_verify_backup_candidate', return_value=None):
+            with patch.object(storage_service, 'import_backup', side_effect=mock_import_backup):
+                with patch.object(storage_service, '_create_default_schedule_data', return_value=mock_default_data):
+                    # Mock the _schedule_data attribute to simulate successful recovery
+                    storage_service._schedule_data = mock_default_data
+                    result = await storage_service._attempt_recovery()
+                    
+                    # Should have attempted recovery in reverse chronological order (newest first)
+                    assert [Path(attempt).name for attempt in import_attempts] == [
+                        "backup_2.json", "backup_1.json", "backup_0.json"
+                    ]
     
     @pytest.mark.asyncio
     async def test_recovery_stops_on_first_success(self, storage_service, mock_hass):
         """Test that recovery stops on first successful backup import."""
-        mock_backup_files = []
-        for i in range(3):
-            mock_file = MagicMock(spec=Path)
-            mock_file.name = f"backup_{i}.json"
-            mock_file.exists.return_value = True
-            mock_file.is_file.return_value = True
-            mock_file.stat.return_value.st_mtime = 1000 + i
-            mock_file.stat.return_value.st_size = 100  # Valid size
-            mock_backup_files.append(mock_file)
+        storage_service._backup_index = backup_index("backup_0.json", "backup_1.json", "backup_2.json")
         
         import_attempts = []
         
@@ -499,19 +484,19 @@ class TestBackupRecoveryFallbackMechanisms:
         mock_schedule_data.version = "0.4.0"
         mock_schedule_data.schedules = {"home": {}, "away": {}}
         
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.glob', return_value=mock_backup_files):
-                with patch.object(storage_service, 'import_backup', side_effect=mock_import_backup):
-                    # Set the _schedule_data attribute to simulate successful recovery
-                    storage_service._schedule_data = mock_schedule_data
-                    result = await storage_service._attempt_recovery()
-                    
-                    # Should have stopped after successful import (2 attempts)
-                    assert len(import_attempts) == 2
-                    # Should not have attempted the third file
-                    assert not any("backup_0.json" in attempt for attempt in import_attempts)
-                    # Should return the recovered data
-                    assert result == mock_schedule_data
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch.object(storage_service, '_verify_backup_candidate', return_value=None):
+            with patch.object(storage_service, 'import_backup', side_effect=mock_import_backup):
+                # Set the _schedule_data attribute to simulate successful recovery
+                storage_service._schedule_data = mock_schedule_data
+                result = await storage_service._attempt_recovery()
+                
+                # Should have stopped after successful import (2 attempts)
+                assert len(import_attempts) == 2
+                # Should not have attempted the third file
+                assert not any("backup_0.json" in attempt for attempt in import_attempts)
+                # Should return the recovered data
+                assert result == mock_schedule_data
 
 
 class TestBackupImportWithDifferentFormats:
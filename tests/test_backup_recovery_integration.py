@@ -32,7 +32,7 @@ def mock_hass():
     hass.data = {}
     hass.config = MagicMock()
     hass.config.config_dir = "/config"
-    hass.async_add_executor_job = AsyncMock()
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda target, *args: target(*args))
     return hass
 
 
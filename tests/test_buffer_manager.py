@@ -1,7 +1,7 @@
 """Tests for the BufferManager class."""
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 
 from custom_components.roost_scheduler.buffer_manager import BufferManager
 from custom_components.roost_scheduler.models import BufferConfig, EntityState, GlobalBufferConfig, ScheduleData
@@ -289,6 +289,78 @@ class TestScheduledChangeTracking:
         assert entity_state is None
 
 
+class TestRedundantWriteSkipping:
+    """Test the last-commanded value cache."""
+    
+    @pytest.fixture
+    def unbuffered_manager(self, buffer_manager):
+        """Disable buffering so only redundancy can suppress a write."""
+        buffer_manager._global_buffer_config.enabled = False
+        return buffer_manager
+    
+    def test_repeat_of_last_command_is_skipped(self, unbuffered_manager):
+        """Test that resending the acknowledged value is skipped and counted."""
+        unbuffered_manager.update_current_value("climate.test", 18.0)
+        unbuffered_manager.update_scheduled_change("climate.test", 21.0)
+        
+        assert unbuffered_manager.get_last_commanded_value("climate.test") == 21.0
+        assert unbuffered_manager.should_suppress_change("climate.test", 21.0, {}) is True
+        assert unbuffered_manager.should_suppress_change("climate.test", 19.0, {}) is False
+        assert unbuffered_manager.get_diagnostic_info()["manager_status"]["redundant_writes_skipped"] == 1
+    
+    def test_unapplied_command_is_resent(self, unbuffered_manager):
+        """Test that a device still reporting its pre-command value gets the write again."""
+        unbuffered_manager.update_current_value("climate.test", 18.0)
+        unbuffered_manager.update_scheduled_change("climate.test", 21.0)
+        unbuffered_manager.update_current_value("climate.test", 18.0)
+        
+        assert unbuffered_manager.is_redundant_write("climate.test", 21.0) is False
+    
+    def test_diverged_device_is_rewritten(self, unbuffered_manager):
+        """Test that a device reporting some other value gets the write again."""
+        unbuffered_manager.update_current_value("climate.test", 18.0)
+        unbuffered_manager.update_scheduled_change("climate.test", 21.0)
+        unbuffered_manager.update_current_value("climate.test", 25.0)
+        
+        assert unbuffered_manager.is_redundant_write("climate.test", 21.0) is False
+    
+    def test_manual_change_clears_record(self, unbuffered_manager):
+        """Test that a manual change forgets the last command."""
+        unbuffered_manager.update_scheduled_change("climate.test", 21.0)
+        unbuffered_manager.update_manual_change("climate.test", 21.0)
+        
+        assert unbuffered_manager.get_last_commanded_value("climate.test") is None
+        assert unbuffered_manager.is_redundant_write("climate.test", 21.0) is False
+    
+    def test_force_bypasses_skip(self, unbuffered_manager):
+        """Test that force apply always writes."""
+        unbuffered_manager.update_scheduled_change("climate.test", 21.0)
+        
+        assert unbuffered_manager.should_suppress_change("climate.test", 21.0, {}, force_apply=True) is False
+    
+    @pytest.mark.asyncio
+    async def test_last_commanded_survives_restart(self, hass, mock_storage_service):
+        """Test that persisted commands still skip the write after a restart."""
+        stored = {}
+        store = Mock()
+        store.async_delay_save = Mock(side_effect=lambda data_func, delay: stored.update(data=data_func()))
+        store.async_load = AsyncMock(side_effect=lambda: stored.get("data"))
+        mock_storage_service.entry_id = "test_entry"
+        
+        with patch('custom_components.roost_scheduler.buffer_manager.Store', return_value=store) as mock_store_class:
+            before = BufferManager(hass, mock_storage_service)
+            before.update_scheduled_change("climate.test", 21.0)
+            after = BufferManager(hass, mock_storage_service)
+            await after.load_last_commanded()
+        
+        assert mock_store_class.call_args[0][2] == "roost_scheduler_test_entry_commanded"
+        assert after.get_last_commanded_value("climate.test") == 21.0
+        after.update_current_value("climate.test", 21.0)
+        assert after.is_redundant_write("climate.test", 21.0) is True
+        after.update_current_value("climate.test", 18.0)
+        assert after.is_redundant_write("climate.test", 21.0) is False
+
+
 class TestBufferConfigValidation:
     """Test buffer configuration validation."""
     
@@ -800,6 +800,19 @@ class TestConfigFlow(ConfigFlow):
         # Verify files were copied (should be at least manifest, const, config_flow, init)
         assert mock_copy.call_count >= 4
 
+    @pytest.mark.asyncio
+    async def test_create_backup_writes_under_backup_root(self, fixer, tmp_path):
+        """Test that backups land under the backup root, not the package directory."""
+        fixer._manifest_path = tmp_path / "source" / "manifest.json"
+        fixer._manifest_path.parent.mkdir()
+        fixer._manifest_path.write_text('{"domain": "test_domain"}')
+
+        await fixer._create_backup()
+
+        backup_dirs = list(tmp_path.glob("backup_registration_fix_*"))
+        assert len(backup_dirs) == 1
+        assert (backup_dirs[0] / "manifest.json").exists()
+
     @pytest.mark.asyncio
     async def test_create_backup_partial_files(self, fixer):
         """Test backup creation when only some files exist."""
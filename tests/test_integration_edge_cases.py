@@ -214,7 +214,7 @@ class TestComplexScheduleScenarios:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test at 08:15 Monday (in overlap zone)
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 8, 15)  # Monday 08:15
                 mock_datetime.strptime = datetime.strptime
                 
@@ -253,7 +253,7 @@ class TestComplexScheduleScenarios:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test at 00:30 Tuesday (should match Monday's midnight-crossing slot)
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 23, 0, 30)  # Tuesday 00:30
                 mock_datetime.strptime = datetime.strptime
                 
@@ -291,7 +291,7 @@ class TestComplexScheduleScenarios:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test dual setpoint application on Sunday
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 21, 10, 0)  # Sunday 10:00
                 mock_datetime.strptime = datetime.strptime
                 
@@ -362,7 +362,7 @@ class TestComplexScheduleScenarios:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test precise timing at 08:20 Tuesday
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 23, 8, 20)  # Tuesday 08:20
                 mock_datetime.strptime = datetime.strptime
                 
@@ -537,7 +537,7 @@ class TestBufferComplexScenarios:
             buffer_manager.update_manual_change("climate.living_room", 19.5)
             
             # Immediate schedule application should be suppressed
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 8, 15)  # Monday 08:15
                 mock_datetime.strptime = datetime.strptime
                 
@@ -582,7 +582,7 @@ class TestBufferComplexScenarios:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test schedule application with out-of-range target
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 7, 0)  # Monday 07:00
                 mock_datetime.strptime = datetime.strptime
                 
@@ -198,7 +198,7 @@ class TestCompleteUserWorkflows:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test schedule application at 07:00 on Monday (home mode)
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 7, 0)  # Monday 07:00
                 mock_datetime.strptime = datetime.strptime
                 
@@ -388,7 +388,7 @@ class TestPresenceBasedModeSwitch:
             assert current_mode == "away"
             
             # Test schedule application in away mode at 09:00 Monday
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 9, 0)  # Monday 09:00
                 mock_datetime.strptime = datetime.strptime
                 
@@ -707,7 +707,7 @@ class TestBufferSystemBehavior:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test normal application (should be suppressed)
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 7, 0)  # Monday 07:00
                 mock_datetime.strptime = datetime.strptime
                 
@@ -720,7 +720,7 @@ class TestBufferSystemBehavior:
             mock_hass.services.async_call.reset_mock()
             
             # Test force application (should bypass buffer)
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 7, 0)  # Monday 07:00
                 mock_datetime.strptime = datetime.strptime
                 
@@ -800,7 +800,7 @@ class TestErrorHandlingAndRecovery:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test schedule application with unavailable entity
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 7, 0)  # Monday 07:00
                 mock_datetime.strptime = datetime.strptime
                 
@@ -837,7 +837,7 @@ class TestErrorHandlingAndRecovery:
             schedule_manager = integration_data["schedule_manager"]
             
             # Test schedule application with service failure
-            with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_datetime:
+            with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_datetime:
                 mock_datetime.now.return_value = datetime(2025, 9, 22, 7, 0)  # Monday 07:00
                 mock_datetime.strptime = datetime.strptime
                 
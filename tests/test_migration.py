@@ -8,8 +8,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from custom_components.roost_scheduler.migration import (
     MigrationManager,
     UninstallManager,
+    _migration_path,
     migrate_to_0_2_0,
     migrate_to_0_3_0,
+    to_columnar_layout,
+    to_legacy_layout,
 )
 from custom_components.roost_scheduler.version import VERSION
 
@@ -117,6 +120,61 @@ class TestMigrationFunctions:
         assert slot["target"]["temperature"] == 20.0
 
 
+class TestStorageLayoutConversion:
+    """Test conversion between the legacy and columnar storage layouts."""
+    
+    LEGACY = {
+        "version": VERSION,
+        "entities_tracked": ["climate.living_room"],
+        "schedules": {
+            "home": {
+                "monday": [
+                    {"start": "06:00", "end": "08:00", "target": {"domain": "climate", "temperature": 20.0},
+                     "buffer_override": {"time_minutes": 5, "value_delta": 0.5, "enabled": True,
+                                         "apply_to": "climate"}},
+                    {"start": "08:00", "end": "09:30", "target": {"domain": "climate", "temperature": 18.5}},
+                ]
+            },
+            "away": {}
+        }
+    }
+    
+    def test_to_columnar_layout(self):
+        """Test that slots become parallel arrays with a shared override table."""
+        converted = to_columnar_layout(self.LEGACY)
+        
+        assert converted["storage_format"] == "columnar"
+        assert converted["override_table"] == [self.LEGACY["schedules"]["home"]["monday"][0]["buffer_override"]]
+        assert converted["schedules"]["home"]["monday"] == {
+            "start": [360, 480],
+            "end": [480, 570],
+            "target": [20.0, 18.5],
+            "domain": ["climate", "climate"],
+            "override": [0, -1],
+        }
+        assert converted["entities_tracked"] == self.LEGACY["entities_tracked"]
+    
+    def test_round_trip(self):
+        """Test that converting to columnar and back restores the legacy layout."""
+        assert to_legacy_layout(to_columnar_layout(self.LEGACY)) == self.LEGACY
+    
+    def test_convert_storage_format(self, migration_manager):
+        """Test that data already in the requested layout is returned as-is."""
+        assert migration_manager.convert_storage_format(self.LEGACY, "legacy") is self.LEGACY
+        
+        columnar = migration_manager.convert_storage_format(self.LEGACY, "columnar")
+        assert migration_manager.convert_storage_format(columnar, "columnar") is columnar
+        assert migration_manager.convert_storage_format(columnar, "legacy") == self.LEGACY
+    
+    def test_convert_storage_format_rejects_bad_data(self, migration_manager):
+        """Test that malformed columnar data raises ValueError."""
+        columnar = to_columnar_layout(self.LEGACY)
+        del columnar["schedules"]["home"]["monday"]["end"]
+        
+        with pytest.raises(ValueError, match="Cannot convert"):
+            migration_manager.convert_storage_format(columnar, "legacy")
+
+
 class TestMigrationManager:
     """Test migration manager functionality."""
     
@@ -214,6 +272,67 @@ class TestMigrationManager:
         assert result is False
 
 
+class TestFusedMigration:
+    """Test the single-pass migration pipeline."""
+    
+    OLD_DATA = {
+        "version": "0.1.0",
+        "entities_tracked": ["climate.living_room"],
+        "schedules": {
+            "monday": [{"start": "06:00", "end": "08:00", "target": 20.0}]
+        }
+    }
+    
+    @pytest.fixture(autouse=True)
+    def no_backup(self, migration_manager):
+        """Skip writing the pre-migration backup."""
+        with patch.object(migration_manager, '_create_migration_backup'):
+            yield
+    
+    @pytest.mark.asyncio
+    async def test_input_not_modified(self, migration_manager):
+        """Test that the chain works on a deep copy of the data."""
+        data = json.loads(json.dumps(self.OLD_DATA))
+        
+        result = await migration_manager.migrate_if_needed(data)
+        
+        assert data == self.OLD_DATA
+        assert result["schedules"]["home"]["monday"][0]["target"] == {"domain": "climate", "temperature": 20.0}
+    
+    @pytest.mark.asyncio
+    async def test_validated_once(self, migration_manager):
+        """Test that validation runs once for the whole chain."""
+        with patch.object(migration_manager, 'validate_migrated_data', return_value=True) as mock_validate:
+            result = await migration_manager.migrate_if_needed(json.loads(json.dumps(self.OLD_DATA)))
+        
+        mock_validate.assert_called_once_with(result)
+    
+    @pytest.mark.asyncio
+    async def test_path_resolved_once_per_version(self, migration_manager):
+        """Test that the migration path is memoized per source version."""
+        _migration_path.cache_clear()
+        
+        with patch(
+            'custom_components.roost_scheduler.migration.get_migration_path',
+            return_value=["0.2.0", "0.3.0", "0.4.0"]
+        ) as mock_path:
+            await migration_manager.migrate_if_needed(json.loads(json.dumps(self.OLD_DATA)))
+            await migration_manager.migrate_if_needed(json.loads(json.dumps(self.OLD_DATA)))
+        
+        _migration_path.cache_clear()
+        mock_path.assert_called_once_with("0.1.0")
+    
+    @pytest.mark.asyncio
+    async def test_step_costs_reported(self, migration_manager):
+        """Test that each step's duration is recorded in the completion metadata."""
+        result = await migration_manager.migrate_if_needed(json.loads(json.dumps(self.OLD_DATA)))
+        
+        completed = result["metadata"]["migration_completed"]
+        assert list(completed["step_durations_ms"]) == completed["migration_path"]
+        assert all(duration >= 0 for duration in completed["step_durations_ms"].values())
+        assert result["metadata"]["last_migration"]["migration_id"] == f"0.1.0_to_{VERSION}"
+
+
 class TestUninstallManager:
     """Test uninstall manager functionality."""
     
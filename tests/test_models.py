@@ -9,7 +9,8 @@ from custom_components.roost_scheduler.models import (
     GlobalBufferConfig,
     ScheduleSlot,
     EntityState,
-    ScheduleData
+    ScheduleData,
+    time_to_minutes,
 )
 
 
@@ -439,4 +440,290 @@ class TestScheduleDataEnhanced:
         # Should serialize without the new fields
         serialized = schedule_data.to_dict()
         assert "presence_config" not in serialized
-        assert "buffer_config" not in serialized
\ No newline at end of file
+        assert "buffer_config" not in serialized
+
+class TestScheduleOverlapValidation:
+    """Test overlap detection in ScheduleData.validate."""
+    
+    @staticmethod
+    def _slot(start, end, day="monday"):
+        return ScheduleSlot(
+            day=day,
+            start_time=start,
+            end_time=end,
+            target_value=20.0,
+            entity_domain="climate"
+        )
+    
+    @staticmethod
+    def _schedule_data(slots):
+        return ScheduleData(
+            version="0.3.0",
+            entities_tracked=["climate.living_room"],
+            presence_entities=[],
+            presence_rule="anyone_home",
+            presence_timeout_seconds=600,
+            buffer={},
+            ui={},
+            schedules={"home": {"monday": slots}, "away": {}},
+            metadata={}
+        )
+    
+    def test_adjacent_unsorted_slots_are_valid(self):
+        """Test that touching slots in any order do not overlap."""
+        slots = [
+            self._slot("12:00", "18:00"),
+            self._slot("00:00", "06:00"),
+            self._slot("06:00", "12:00"),
+        ]
+        
+        self._schedule_data(slots)
+    
+    def test_overlap_message(self):
+        """Test that the later slot is reported against the earlier one."""
+        slots = [
+            self._slot("06:00", "09:00"),
+            self._slot("12:00", "18:00"),
+            self._slot("08:00", "10:00"),
+        ]
+        
+        with pytest.raises(ValueError, match="Overlapping slots found in home/monday: "
+                                             "08:00-10:00 overlaps with 06:00-09:00"):
+            self._schedule_data(slots)
+    
+    def test_overlap_with_long_earlier_slot(self):
+        """Test that a slot contained in a long earlier slot is detected."""
+        slots = [
+            self._slot("00:00", "23:59"),
+            self._slot("06:00", "07:00"),
+            self._slot("08:00", "09:00"),
+        ]
+        
+        with pytest.raises(ValueError, match="06:00-07:00 overlaps with 00:00-23:59"):
+            self._schedule_data(slots)
+    
+    def test_full_resolution_week_validates(self):
+        """Test that a fully populated 15-minute schedule is accepted."""
+        slots = []
+        for start in range(0, 1440 - 15, 15):
+            end = start + 15
+            slots.append(self._slot(f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}"))
+        
+        data = self._schedule_data(list(reversed(slots)))
+        
+        assert len(data.schedules["home"]["monday"]) == 95
+    
+    def test_minute_bounds(self):
+        """Test slot minute bounds."""
+        assert self._slot("06:30", "23:59").minute_bounds() == (390, 1439)
+
+
+class TestCompactScheduleSlot:
+    """Test the slotted ScheduleSlot representation."""
+    
+    def test_time_to_minutes(self):
+        """Test HH:MM parsing through the shared minute table."""
+        assert time_to_minutes("00:00") == 0
+        assert time_to_minutes("06:30") == 390
+        assert time_to_minutes("6:30") == 390
+        assert time_to_minutes("12:00") == 720
+        assert time_to_minutes("23:59") == 1439
+        with pytest.raises(ValueError):
+            time_to_minutes("invalid")
+        with pytest.raises(ValueError):
+            time_to_minutes("24:00")
+    
+    def test_minutes_parsed_once(self):
+        """Test that times are stored as minutes and rendered on access."""
+        slot = ScheduleSlot("Monday", "6:30", "23:59", 20.0, "climate")
+        
+        assert slot.day == "monday"
+        assert (slot.start_minute, slot.end_minute) == (390, 1439)
+        assert slot.start_time == "06:30"
+        assert slot.to_dict()["start"] == "06:30"
+        assert not hasattr(slot, "__dict__")
+    
+    def test_time_setters_validate(self):
+        """Test that assigning times reparses them."""
+        slot = ScheduleSlot("monday", "06:00", "08:00", 20.0, "climate")
+        
+        slot.end_time = "09:15"
+        assert slot.end_minute == 555
+        with pytest.raises(ValueError, match="end_time must be in HH:MM format"):
+            slot.end_time = "24:00"
+    
+    def test_invalid_times_rejected(self):
+        """Test time format and ordering errors."""
+        with pytest.raises(ValueError, match="start_time must be in HH:MM format"):
+            ScheduleSlot("monday", "6:0", "08:00", 20.0, "climate")
+        with pytest.raises(ValueError, match="must be before end_time"):
+            ScheduleSlot("monday", "08:00", "08:00", 20.0, "climate")
+    
+    def test_from_minutes(self):
+        """Test creating a slot from minute offsets."""
+        slot = ScheduleSlot.from_minutes("tuesday", 0, 90, 18.0, "climate")
+        
+        assert slot == ScheduleSlot("tuesday", "00:00", "01:30", 18.0, "climate")
+        with pytest.raises(ValueError):
+            ScheduleSlot.from_minutes("tuesday", 90, 1440, 18.0, "climate")
+    
+    def test_shared_strings_and_buffer_overrides(self):
+        """Test that days, domains and identical buffer overrides are shared."""
+        data = {
+            "start": "06:00",
+            "end": "08:00",
+            "target": {"domain": "climate", "temperature": 20.0},
+            "buffer_override": {"time_minutes": 10, "value_delta": 1.0},
+        }
+        first = ScheduleSlot.from_dict("".join(["mon", "day"]), data)
+        second = ScheduleSlot.from_dict("monday", dict(data))
+        
+        assert first.day is second.day
+        assert first.entity_domain is second.entity_domain
+        assert first.buffer_override is second.buffer_override
+    
+    def test_shared_buffer_override_is_read_only(self):
+        """Test that a change to one slot's shared override cannot leak into another."""
+        data = {
+            "start": "06:00",
+            "end": "08:00",
+            "target": {"domain": "climate", "temperature": 20.0},
+            "buffer_override": {"time_minutes": 20, "value_delta": 1.5},
+        }
+        first = ScheduleSlot.from_dict("monday", data)
+        second = ScheduleSlot.from_dict("tuesday", dict(data))
+        
+        with pytest.raises(AttributeError):
+            first.buffer_override.time_minutes = 45
+        
+        first.buffer_override = BufferConfig(time_minutes=45, value_delta=1.5)
+        first.buffer_override.value_delta = 3.0
+        
+        assert second.buffer_override.time_minutes == 20
+        assert second.buffer_override.value_delta == 1.5
+        assert second.buffer_override == BufferConfig(time_minutes=20, value_delta=1.5)
+
+
+class TestTrustedScheduleDataFromDict:
+    """Test the trusted deserialization path."""
+    
+    @staticmethod
+    def _data(slots):
+        return {
+            "version": "0.3.0",
+            "entities_tracked": ["climate.living_room"],
+            "presence_entities": [],
+            "presence_rule": "anyone_home",
+            "presence_timeout_seconds": 600,
+            "buffer": {},
+            "ui": {},
+            "schedules": {"home": {"monday": slots}, "away": {}},
+            "metadata": {}
+        }
+    
+    def test_trusted_matches_strict(self):
+        """Test that both paths build equal objects."""
+        data = self._data([
+            {"start": "06:00", "end": "08:00", "target": {"domain": "climate", "temperature": 21.0}},
+            {"start": "18:00", "end": "23:59", "target": {"domain": "climate", "temperature": 19.0},
+             "buffer_override": {"time_minutes": 5, "value_delta": 0.5}},
+        ])
+        
+        assert ScheduleData.from_dict(data, trusted=True) == ScheduleData.from_dict(data)
+    
+    def test_trusted_skips_slot_validation(self):
+        """Test that trusted data is not validated slot by slot."""
+        data = self._data([
+            {"start": "06:00", "end": "08:00", "target": {"domain": "climate", "temperature": 21.0}},
+        ])
+        
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            validate = MagicMock()
+            monkeypatch.setattr(ScheduleSlot, "validate", validate)
+            ScheduleData.from_dict(data, trusted=True)
+            validate.assert_not_called()
+    
+    def test_trusted_falls_back_to_strict_on_bad_input(self):
+        """Test that unparseable trusted data still raises the strict error."""
+        data = self._data([
+            {"start": "6am", "end": "08:00", "target": {"domain": "climate", "temperature": 21.0}},
+        ])
+        
+        with pytest.raises(ValueError, match="start_time must be in HH:MM format"):
+            ScheduleData.from_dict(data, trusted=True)
+    
+    def test_trusted_still_checks_structure(self):
+        """Test that top-level fields are validated on the trusted path."""
+        data = self._data([])
+        data["presence_rule"] = "nobody_home"
+        
+        with pytest.raises(ValueError, match="presence_rule"):
+            ScheduleData.from_dict(data, trusted=True)
+
+
+class TestColumnarScheduleData:
+    """Test the columnar storage layout."""
+    
+    @staticmethod
+    def _schedule_data():
+        override = BufferConfig(time_minutes=5, value_delta=0.5)
+        return ScheduleData(
+            version="0.4.0",
+            entities_tracked=["climate.living_room"],
+            presence_entities=[],
+            presence_rule="anyone_home",
+            presence_timeout_seconds=600,
+            buffer={},
+            ui={},
+            schedules={
+                "home": {"monday": [
+                    ScheduleSlot("monday", "06:00", "08:00", 21.0, "climate", override),
+                    ScheduleSlot("monday", "08:00", "18:00", 18.0, "climate"),
+                    ScheduleSlot("monday", "18:00", "23:59", 21.0, "climate", override),
+                ]},
+                "away": {}
+            },
+            metadata={}
+        )
+    
+    def test_columnar_layout(self):
+        """Test that each day is written as parallel arrays with an override table."""
+        data = self._schedule_data().to_dict(columnar=True)
+        
+        assert data["storage_format"] == "columnar"
+        assert data["override_table"] == [
+            {"time_minutes": 5, "value_delta": 0.5, "enabled": True, "apply_to": "climate"}
+        ]
+        assert data["schedules"]["home"]["monday"] == {
+            "start": [360, 480, 1080],
+            "end": [480, 1080, 1439],
+            "target": [21.0, 18.0, 21.0],
+            "domain": ["climate", "climate", "climate"],
+            "override": [0, -1, 0],
+        }
+    
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_columnar_round_trip(self, trusted):
+        """Test that both parse paths read the columnar layout back."""
+        schedule_data = self._schedule_data()
+        
+        loaded = ScheduleData.from_dict(schedule_data.to_dict(columnar=True), trusted=trusted)
+        
+        assert loaded == schedule_data
+        assert loaded.to_dict() == schedule_data.to_dict()
+    
+    def test_columnar_strict_path_validates_slots(self):
+        """Test that untrusted columnar data is validated slot by slot."""
+        data = self._schedule_data().to_dict(columnar=True)
+        data["schedules"]["home"]["monday"]["end"][1] = 300
+        
+        with pytest.raises(ValueError, match="must be before end_time"):
+            ScheduleData.from_dict(data)
+    
+    def test_columnar_mismatched_arrays_rejected(self):
+        """Test that arrays of different lengths are rejected on both paths."""
+        data = self._schedule_data().to_dict(columnar=True)
+        data["schedules"]["home"]["monday"]["target"].pop()
+        
+        with pytest.raises(ValueError, match="different lengths"):
+            ScheduleData.from_dict(data, trusted=True)
@@ -1,9 +1,14 @@
 """Tests for real-time synchronization and conflict resolution."""
+import inspect
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
-from custom_components.roost_scheduler import _check_for_conflicts
+from custom_components.roost_scheduler import (
+    _check_for_conflicts,
+    _construct_raw_result_message,
+    _result_message_takes_bytes,
+)
 from custom_components.roost_scheduler.schedule_manager import ScheduleManager
 from custom_components.roost_scheduler.models import ScheduleSlot
 
@@ -193,6 +198,52 @@ async def test_check_for_conflicts_tolerance(mock_schedule_manager):
     assert len(conflicts) == 0
 
 
+@pytest.fixture
+def fresh_payload_type():
+    """Forget the cached construct_result_message payload type around a test."""
+    _result_message_takes_bytes.cache_clear()
+    yield
+    _result_message_takes_bytes.cache_clear()
+
+
+def test_raw_result_message_matches_str_helper(fresh_payload_type):
+    """Test that older Home Assistant releases get a str payload."""
+    def construct_result_message(iden: int, payload: str) -> str:
+        return f'{{"id":{iden},"type":"result","success":true,"result":{payload}}}'
+    
+    with patch('custom_components.roost_scheduler.websocket_api.messages.construct_result_message',
+               construct_result_message):
+        message = _construct_raw_result_message(5, '{"a":1}')
+    
+    assert message == '{"id":5,"type":"result","success":true,"result":{"a":1}}'
+
+
+def test_raw_result_message_matches_bytes_helper(fresh_payload_type):
+    """Test that newer Home Assistant releases get a bytes payload."""
+    def construct_result_message(iden: int, payload: bytes) -> bytes:
+        return b'{"id":%d,"type":"result","success":true,"result":%s}' % (iden, payload)
+    
+    with patch('custom_components.roost_scheduler.websocket_api.messages.construct_result_message',
+               construct_result_message):
+        message = _construct_raw_result_message(5, '{"a":1}')
+    
+    assert message == b'{"id":5,"type":"result","success":true,"result":{"a":1}}'
+
+
+def test_payload_type_resolved_once(fresh_payload_type):
+    """Test that the helper's signature is inspected once, not per request."""
+    def construct_result_message(iden: int, payload: bytes) -> bytes:
+        return payload
+    
+    with patch('custom_components.roost_scheduler.websocket_api.messages.construct_result_message',
+               construct_result_message), \
+         patch('custom_components.roost_scheduler.inspect.signature', wraps=inspect.signature) as mock_signature:
+        _construct_raw_result_message(1, "{}")
+        _construct_raw_result_message(2, "{}")
+    
+    mock_signature.assert_called_once()
+
+
 class TestScheduleManagerEventEmission:
     """Test event emission in schedule manager."""
     
@@ -0,0 +1,90 @@
+"""Tests for the minute-level resolution arrays."""
+from custom_components.roost_scheduler.models import ScheduleSlot
+from custom_components.roost_scheduler.resolution import (
+    EMPTY,
+    DayCells,
+    build_slots,
+    changed_minutes,
+    diff_runs,
+    expand,
+    runs,
+)
+
+
+def _slot(start, end, value=20.0):
+    return ScheduleSlot(
+        day="monday",
+        start_time=start,
+        end_time=end,
+        target_value=value,
+        entity_domain="climate"
+    )
+
+
+class TestDayCells:
+    """Test cases for DayCells."""
+
+    def test_rasterise_shares_palette_entries(self):
+        """Test that identical targets share one palette entry."""
+        cells = DayCells([_slot("06:00", "07:00"), _slot("08:00", "09:00"), _slot("09:00", "10:00", 18.0)])
+
+        assert len(cells.palette) == 2
+        assert cells.cells[359] == EMPTY
+        assert cells.cells[360] == 0
+        assert cells.cells[480] == 0
+        assert cells.cells[540] == 1
+
+    def test_end_of_day_covers_last_minute(self):
+        """Test that a slot ending at 23:59 covers the final minute."""
+        cells = DayCells([_slot("23:00", "23:59")])
+
+        assert cells.cells[-1] == 0
+
+    def test_regrid_partial_cell_is_occupied(self):
+        """Test that partially covered cells are taken by the slot."""
+        cells = DayCells([_slot("06:10", "08:25")])
+
+        assert runs(cells.regrid(15), 15) == [(360, 510, 0)]
+
+    def test_regrid_aligns_to_resolution(self):
+        """Test that regridded runs start and end on resolution boundaries."""
+        assert runs(DayCells([_slot("06:10", "06:20")]).regrid(15), 15) == [(360, 390, 0)]
+        assert runs(DayCells([_slot("06:30", "06:40")]).regrid(60), 60) == [(360, 420, 0)]
+
+    def test_adjacent_equal_targets_merge(self):
+        """Test that adjacent slots with the same target become one slot."""
+        cells = DayCells([
+            _slot("06:00", "07:00", 20.0),
+            _slot("07:00", "08:00", 20.0),
+            _slot("08:00", "09:00", 21.0),
+        ])
+
+        merged = build_slots("monday", runs(cells.cells), cells.palette)
+
+        assert [(slot.start_time, slot.end_time, slot.target_value) for slot in merged] == [
+            ("06:00", "08:00", 20.0),
+            ("08:00", "09:00", 21.0),
+        ]
+
+    def test_regrid_majority_then_first_wins(self):
+        """Test the merge rule for cells shared by several targets."""
+        cells = DayCells([
+            _slot("06:00", "06:40", 20.0),
+            _slot("06:40", "07:30", 18.0),
+            _slot("07:30", "08:00", 21.0),
+        ])
+
+        # 06:00-07:00 is 40 min of 20.0 vs 20 min of 18.0; 07:00-08:00 is a 30/30 tie
+        assert cells.regrid(60)[6:8] == [0, 1]
+
+    def test_runs_and_diff(self):
+        """Test collapsing cells into runs and diffing them."""
+        cells = DayCells([_slot("06:10", "07:00"), _slot("07:00", "08:00")])
+        coarse = cells.regrid(60)
+        before = runs(cells.cells)
+        after = runs(coarse, 60)
+
+        assert before == [(370, 480, 0)]
+        assert after == [(360, 480, 0)]
+        assert diff_runs(before, after) == [((370, 480, 0), (360, 480, 0))]
+        assert changed_minutes(cells.cells, expand(coarse, 60)) == 10
@@ -148,13 +148,6 @@ class TestResolutionMigration:
         with pytest.raises(ValueError, match="No schedule data available"):
             await schedule_manager.migrate_resolution(15, preview=True)
     
-    def test_time_to_minutes_conversion(self, schedule_manager):
-        """Test time string to minutes conversion."""
-        assert schedule_manager._time_to_minutes("00:00") == 0
-        assert schedule_manager._time_to_minutes("06:30") == 390
-        assert schedule_manager._time_to_minutes("12:00") == 720
-        assert schedule_manager._time_to_minutes("23:59") == 1439
-    
     def test_minutes_to_time_conversion(self, schedule_manager):
         """Test minutes to time string conversion."""
         assert schedule_manager._minutes_to_time(0) == "00:00"
@@ -163,16 +156,6 @@ class TestResolutionMigration:
         assert schedule_manager._minutes_to_time(1439) == "23:59"
         assert schedule_manager._minutes_to_time(1440) == "23:59"  # Overflow handling - cap at 23:59
     
-    def test_align_to_resolution(self, schedule_manager):
-        """Test time alignment to resolution boundaries."""
-        # Test 15-minute alignment
-        assert schedule_manager._align_to_resolution(370, 15) == 360  # 6:10 -> 6:00
-        assert schedule_manager._align_to_resolution(370, 15, align_up=True) == 375  # 6:10 -> 6:15
-        
-        # Test 60-minute alignment
-        assert schedule_manager._align_to_resolution(390, 60) == 360  # 6:30 -> 6:00
-        assert schedule_manager._align_to_resolution(390, 60, align_up=True) == 420  # 6:30 -> 7:00
-    
     def test_migrate_day_slots_increase_resolution(self, schedule_manager):
         """Test migrating day slots to higher resolution (30 to 15 minutes)."""
         slots = [
@@ -210,42 +193,6 @@ class TestResolutionMigration:
         assert migrated_slots[0].start_time == "06:00"  # Aligned down
         assert migrated_slots[0].end_time == "08:00"    # Aligned up, minimum 1 hour
     
-    def test_merge_overlapping_slots(self, schedule_manager):
-        """Test merging overlapping slots with same target value."""
-        slots = [
-            ScheduleSlot(
-                day="monday",
-                start_time="06:00",
-                end_time="07:00",
-                target_value=20.0,
-                entity_domain="climate"
-            ),
-            ScheduleSlot(
-                day="monday",
-                start_time="07:00",
-                end_time="08:00",
-                target_value=20.0,  # Same target value
-                entity_domain="climate"
-            ),
-            ScheduleSlot(
-                day="monday",
-                start_time="08:00",
-                end_time="09:00",
-                target_value=21.0,  # Different target value
-                entity_domain="climate"
-            )
-        ]
-        
-        merged = schedule_manager._merge_overlapping_slots(slots)
-        
-        assert len(merged) == 2  # First two should be merged
-        assert merged[0].start_time == "06:00"
-        assert merged[0].end_time == "08:00"
-        assert merged[0].target_value == 20.0
-        assert merged[1].start_time == "08:00"
-        assert merged[1].end_time == "09:00"
-        assert merged[1].target_value == 21.0
-    
     def test_validate_migrated_slots_overlaps(self, schedule_manager):
         """Test validation of migrated slots for overlaps."""
         slots = [
@@ -426,4 +373,51 @@ async def test_integration_resolution_migration_workflow():
     # Verify metadata was updated
     assert "last_migration" in manager._schedule_data.metadata
     assert manager._schedule_data.metadata["last_migration"]["from_resolution"] == 30
-    assert manager._schedule_data.metadata["last_migration"]["to_resolution"] == 60
\ No newline at end of file
+    assert manager._schedule_data.metadata["last_migration"]["to_resolution"] == 60
+
+class TestArrayResolutionMigration:
+    """Test the array-based migration rules."""
+    
+    def test_conflicting_slots_do_not_overlap_after_migration(self, schedule_manager):
+        """Test that coarse cells shared by two targets are resolved deterministically."""
+        slots = [
+            ScheduleSlot(day="monday", start_time="06:00", end_time="06:45", target_value=20.0, entity_domain="climate"),
+            ScheduleSlot(day="monday", start_time="06:45", end_time="08:00", target_value=18.0, entity_domain="climate"),
+        ]
+        
+        migrated_slots, changes = schedule_manager._migrate_day_slots(slots, 15, 60)
+        
+        assert [(s.start_time, s.end_time, s.target_value) for s in migrated_slots] == [
+            ("06:00", "07:00", 20.0),
+            ("07:00", "08:00", 18.0),
+        ]
+        assert schedule_manager._validate_migrated_slots(migrated_slots, "monday", "home") == []
+        assert changes["minutes_changed"] == 15
+        assert changes["changes"] == [{
+            "original": {"start": "06:00", "end": "06:45"},
+            "migrated": {"start": "06:00", "end": "07:00"},
+            "target_value": 20.0
+        }, {
+            "original": {"start": "06:45", "end": "08:00"},
+            "migrated": {"start": "07:00", "end": "08:00"},
+            "target_value": 18.0
+        }]
+    
+    def test_end_of_day_slot_is_preserved(self, schedule_manager):
+        """Test that a slot running to midnight keeps its 23:59 end."""
+        slots = [
+            ScheduleSlot(day="monday", start_time="22:15", end_time="23:59", target_value=17.0, entity_domain="climate"),
+        ]
+        
+        migrated_slots, _ = schedule_manager._migrate_day_slots(slots, 15, 60)
+        
+        assert (migrated_slots[0].start_time, migrated_slots[0].end_time) == ("22:00", "23:59")
+    
+    @pytest.mark.asyncio
+    async def test_apply_saves_schedule_data(self, schedule_manager):
+        """Test that applying a migration saves the ScheduleData object."""
+        schedule_manager.storage_service.save_schedules = AsyncMock()
+        
+        await schedule_manager.migrate_resolution(60, preview=False)
+        
+        schedule_manager.storage_service.save_schedules.assert_called_once_with(schedule_manager._schedule_data)
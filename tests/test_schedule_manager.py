@@ -1,10 +1,10 @@
 """Tests for the ScheduleManager class."""
 import pytest
 import pytest_asyncio
-from datetime import datetime, time
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from custom_components.roost_scheduler.schedule_manager import ScheduleManager
+from custom_components.roost_scheduler.schedule_manager import ScheduleManager, PendingWrite
 from custom_components.roost_scheduler.models import ScheduleSlot, ScheduleData, BufferConfig
 from custom_components.roost_scheduler.const import MODE_HOME, MODE_AWAY, WEEKDAYS
 
@@ -95,6 +95,14 @@ def schedule_manager(mock_hass, mock_storage_service, mock_presence_manager, moc
     )
 
 
+@pytest.fixture
+def monday_morning():
+    """Freeze time inside the sample slot."""
+    with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
+        mock_dt.now.return_value = datetime(2025, 9, 15, 10, 0)
+        yield mock_dt
+
+
 class TestScheduleManager:
     """Test cases for ScheduleManager."""
     
@@ -108,7 +116,7 @@ class TestScheduleManager:
         
         # Mock current time to be within the slot (10:00 AM on Monday)
         mock_datetime = datetime(2025, 9, 15, 10, 0)  # Monday 10:00 AM
-        with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
             mock_dt.now.return_value = mock_datetime
             
             # Test
@@ -120,6 +128,16 @@ class TestScheduleManager:
             assert result.start_time == "08:00"
             assert result.end_time == "18:00"
     
+    @pytest.mark.asyncio
+    async def test_load_shares_storage_instance(self, schedule_manager, mock_storage_service,
+                                                sample_schedule_data):
+        """Test that loaded ScheduleData is shared with the storage service, not copied."""
+        mock_storage_service.load_schedules.return_value = sample_schedule_data
+        
+        await schedule_manager._load_schedule_data()
+        
+        assert schedule_manager._schedule_data is sample_schedule_data
+    
     @pytest.mark.asyncio
     async def test_evaluate_current_slot_not_found(self, schedule_manager, mock_storage_service,
                                                   mock_presence_manager, sample_schedule_data):
@@ -130,7 +148,7 @@ class TestScheduleManager:
         
         # Mock current time to be outside the slot (6:00 AM on Monday)
         mock_datetime = datetime(2025, 9, 15, 6, 0)  # Monday 6:00 AM
-        with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
             mock_dt.now.return_value = mock_datetime
             
             # Test
@@ -153,7 +171,8 @@ class TestScheduleManager:
         assert result is None
     
     @pytest.mark.asyncio
-    async def test_get_schedule_grid_success(self, schedule_manager, mock_storage_service, sample_schedule_data):
+    async def test_get_schedule_grid_success(self, schedule_manager, mock_storage_service, sample_schedule_data,
+                                             monday_morning):
         """Test getting schedule grid successfully."""
         # Setup
         mock_storage_service.load_schedules.return_value = sample_schedule_data.to_dict()
@@ -200,7 +219,7 @@ class TestScheduleManager:
         
         # Mock current time to be within the slot
         mock_datetime = datetime(2025, 9, 15, 10, 0)  # Monday 10:00 AM
-        with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
             mock_dt.now.return_value = mock_datetime
             
             # Test
@@ -232,7 +251,7 @@ class TestScheduleManager:
         
         # Mock current time to be within the slot
         mock_datetime = datetime(2025, 9, 15, 10, 0)  # Monday 10:00 AM
-        with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
             mock_dt.now.return_value = mock_datetime
             
             # Test
@@ -258,7 +277,7 @@ class TestScheduleManager:
         
         # Mock current time to be within the slot
         mock_datetime = datetime(2025, 9, 15, 10, 0)  # Monday 10:00 AM
-        with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
             mock_dt.now.return_value = mock_datetime
             
             # Test
@@ -278,7 +297,7 @@ class TestScheduleManager:
         
         # Mock current time to be outside any slot
         mock_datetime = datetime(2025, 9, 15, 6, 0)  # Monday 6:00 AM (outside slot)
-        with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
             mock_dt.now.return_value = mock_datetime
             
             # Test
@@ -379,7 +398,7 @@ class TestScheduleManager:
         
         # Mock current time to be within the slot
         mock_datetime = datetime(2025, 9, 15, 10, 0)  # Monday 10:00 AM
-        with patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util') as mock_dt:
             mock_dt.now.return_value = mock_datetime
             
             # Test
@@ -390,42 +409,498 @@ class TestScheduleManager:
             assert results["climate.living_room"] is True
             mock_hass.services.async_call.assert_called_once()
     
-    def test_time_in_slot_normal_range(self, schedule_manager):
-        """Test time_in_slot method with normal time range."""
-        current_time = time(10, 0)
-        assert schedule_manager._time_in_slot(current_time, "08:00", "18:00") is True
-        assert schedule_manager._time_in_slot(current_time, "12:00", "18:00") is False
+    def test_minutes_to_time(self, schedule_manager):
+        """Test minutes to time conversion."""
+        assert schedule_manager._minutes_to_time(0) == "00:00"
+        assert schedule_manager._minutes_to_time(720) == "12:00"
+        assert schedule_manager._minutes_to_time(1439) == "23:59"
+
+class TestBoundaryTimer:
+    """Test cases for the slot boundary timer."""
+    
+    @pytest.fixture
+    def berlin(self):
+        """Return a timezone with DST transitions."""
+        from zoneinfo import ZoneInfo
+        return ZoneInfo("Europe/Berlin")
     
-    def test_time_in_slot_midnight_crossover(self, schedule_manager):
-        """Test time_in_slot method with midnight crossover."""
-        # Test time that crosses midnight (22:00 to 06:00)
-        current_time = time(23, 0)  # 11 PM
-        assert schedule_manager._time_in_slot(current_time, "22:00", "06:00") is True
+    def test_next_boundary_same_day(self, schedule_manager, sample_schedule_data, berlin):
+        """Test the next boundary later on the same day."""
+        schedule_manager._schedule_data = sample_schedule_data
+        now = datetime(2025, 9, 15, 7, 0, tzinfo=berlin)  # Monday
         
-        current_time = time(2, 0)  # 2 AM
-        assert schedule_manager._time_in_slot(current_time, "22:00", "06:00") is True
+        boundary = schedule_manager.get_next_boundary(MODE_HOME, now)
         
-        current_time = time(10, 0)  # 10 AM
-        assert schedule_manager._time_in_slot(current_time, "22:00", "06:00") is False
+        assert boundary == datetime(2025, 9, 15, 8, 0, tzinfo=berlin)
     
-    def test_calculate_slot_duration(self, schedule_manager):
-        """Test slot duration calculation."""
-        # Normal duration
-        duration = schedule_manager._calculate_slot_duration("08:00", "18:00")
-        assert duration == 600  # 10 hours * 60 minutes
+    def test_next_boundary_wraps_to_next_week(self, schedule_manager, sample_schedule_data, berlin):
+        """Test that the boundary wraps around the end of the week."""
+        schedule_manager._schedule_data = sample_schedule_data
+        now = datetime(2025, 9, 15, 8, 0, tzinfo=berlin)  # Monday, slot just started
         
-        # Midnight crossover
-        duration = schedule_manager._calculate_slot_duration("22:00", "06:00")
-        assert duration == 480  # 8 hours * 60 minutes
+        boundary = schedule_manager.get_next_boundary(MODE_HOME, now)
+        
+        assert boundary == datetime(2025, 9, 22, 8, 0, tzinfo=berlin)
     
-    def test_time_to_minutes(self, schedule_manager):
-        """Test time to minutes conversion."""
-        assert schedule_manager._time_to_minutes("00:00") == 0
-        assert schedule_manager._time_to_minutes("12:00") == 720
-        assert schedule_manager._time_to_minutes("23:59") == 1439
+    def test_next_boundary_across_dst_change(self, schedule_manager, sample_schedule_data, berlin):
+        """Test that the boundary keeps its wall-clock time across a DST change."""
+        sample_schedule_data.schedules[MODE_HOME]["sunday"] = [
+            ScheduleSlot(day="sunday", start_time="08:00", end_time="10:00",
+                         target_value=20.0, entity_domain="climate")
+        ]
+        schedule_manager._schedule_data = sample_schedule_data
+        now = datetime(2025, 10, 25, 12, 0, tzinfo=berlin)  # Saturday, CEST
+        
+        boundary = schedule_manager.get_next_boundary(MODE_HOME, now)
+        
+        # Clocks go back on Sunday 26 October, so 08:00 local is 07:00 UTC
+        assert (boundary.hour, boundary.minute) == (8, 0)
+        assert boundary.utcoffset().total_seconds() == 3600
+        assert boundary.astimezone(timezone.utc) == datetime(2025, 10, 26, 7, 0, tzinfo=timezone.utc)
     
-    def test_minutes_to_time(self, schedule_manager):
-        """Test minutes to time conversion."""
-        assert schedule_manager._minutes_to_time(0) == "00:00"
-        assert schedule_manager._minutes_to_time(720) == "12:00"
-        assert schedule_manager._minutes_to_time(1439) == "23:59"
\ No newline at end of file
+    def test_next_boundary_no_slots(self, schedule_manager, sample_schedule_data, berlin):
+        """Test that a mode without slots has no boundary."""
+        sample_schedule_data.schedules[MODE_AWAY] = {}
+        schedule_manager._schedule_data = sample_schedule_data
+        
+        assert schedule_manager.get_next_boundary(MODE_AWAY, datetime(2025, 9, 15, 7, 0, tzinfo=berlin)) is None
+    
+    @pytest.mark.asyncio
+    async def test_boundary_evaluates_in_home_assistant_time_zone(self, schedule_manager, sample_schedule_data,
+                                                                 berlin):
+        """Test that a boundary in a non-UTC HA time zone evaluates the slot it starts, not host time."""
+        schedule_manager._schedule_data = sample_schedule_data
+        boundary = schedule_manager.get_next_boundary(MODE_HOME, datetime(2025, 9, 15, 7, 30, tzinfo=berlin))
+        
+        # The host clock runs in UTC, two hours behind Berlin summer time
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util.now', return_value=boundary), \
+             patch('custom_components.roost_scheduler.schedule_manager.datetime') as mock_dt:
+            mock_dt.now.return_value = boundary.astimezone(timezone.utc).replace(tzinfo=None)
+            slot = await schedule_manager.evaluate_current_slot("climate.living_room", MODE_HOME)
+        
+        assert boundary == datetime(2025, 9, 15, 8, 0, tzinfo=berlin)
+        assert slot is sample_schedule_data.schedules[MODE_HOME]["monday"][0]
+    
+    @pytest.mark.asyncio
+    async def test_start_and_cancel_boundary_timer(self, schedule_manager, mock_presence_manager,
+                                                   sample_schedule_data, berlin):
+        """Test that starting arms a single timer and cancelling removes it."""
+        schedule_manager._schedule_data = sample_schedule_data
+        mock_presence_manager.register_mode_change_callback = AsyncMock()
+        unsub = MagicMock()
+        
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util.now',
+                   return_value=datetime(2025, 9, 15, 7, 0, tzinfo=berlin)), \
+             patch('custom_components.roost_scheduler.schedule_manager.async_track_point_in_time',
+                   return_value=unsub) as mock_track:
+            await schedule_manager.async_start_boundary_timer()
+            await schedule_manager.async_start_boundary_timer()
+        
+        mock_track.assert_called_once()
+        assert mock_track.call_args[0][2] == datetime(2025, 9, 15, 8, 0, tzinfo=berlin)
+        mock_presence_manager.register_mode_change_callback.assert_called_once()
+        
+        schedule_manager.cancel_boundary_timer()
+        
+        unsub.assert_called_once()
+        assert schedule_manager._boundary_unsub is None
+    
+    @pytest.mark.asyncio
+    async def test_slot_boundary_applies_and_rearms(self, schedule_manager, sample_schedule_data, berlin):
+        """Test that reaching a boundary applies schedules and arms the next one."""
+        schedule_manager._schedule_data = sample_schedule_data
+        schedule_manager._boundary_timer_active = True
+        schedule_manager.apply_all_tracked_entities = AsyncMock(return_value={})
+        
+        fired_at = datetime(2025, 9, 15, 8, 0, tzinfo=berlin)
+        with patch('custom_components.roost_scheduler.schedule_manager.dt_util.now',
+                   return_value=fired_at), \
+             patch('custom_components.roost_scheduler.schedule_manager.async_track_point_in_time') as mock_track:
+            await schedule_manager._handle_slot_boundary(fired_at)
+        
+        schedule_manager.apply_all_tracked_entities.assert_called_once()
+        assert mock_track.call_args[0][2] == datetime(2025, 9, 22, 8, 0, tzinfo=berlin)
+    
+    @pytest.mark.asyncio
+    async def test_slot_edit_does_not_arm_inactive_timer(self, schedule_manager, sample_schedule_data):
+        """Test that re-arming is a no-op until the timer has been started."""
+        schedule_manager._schedule_data = sample_schedule_data
+        
+        with patch('custom_components.roost_scheduler.schedule_manager.async_track_point_in_time') as mock_track:
+            await schedule_manager._async_arm_boundary_timer()
+        
+        mock_track.assert_not_called()
+
+
+class TestBulkApply:
+    """Test cases for concurrent bulk application."""
+    
+    @pytest.fixture
+    def many_entities_data(self, sample_schedule_data):
+        """Track several entities with the sample schedules."""
+        sample_schedule_data.entities_tracked = [f"climate.room_{i}" for i in range(6)]
+        return sample_schedule_data
+    
+    @pytest.fixture
+    def available_state(self, mock_hass):
+        """Report every entity as available at 20 degrees."""
+        state = MagicMock()
+        state.state = "heat"
+        state.attributes = {"temperature": 20.0}
+        mock_hass.states.get.return_value = state
+        return state
+    
+    @pytest.mark.asyncio
+    async def test_bulk_apply_coalesces_identical_setpoints(self, schedule_manager, mock_hass,
+                                                            mock_presence_manager, mock_buffer_manager,
+                                                            many_entities_data, available_state,
+                                                            monday_morning):
+        """Test that entities sharing a setpoint are written with one service call."""
+        schedule_manager._schedule_data = many_entities_data
+        
+        report = await schedule_manager.bulk_apply()
+        
+        mock_presence_manager.get_current_mode.assert_called_once()
+        mock_hass.services.async_call.assert_called_once_with(
+            "climate", "set_temperature",
+            {"entity_id": many_entities_data.entities_tracked, "temperature": 22.0}
+        )
+        assert mock_buffer_manager.update_scheduled_change.call_count == 6
+        
+        assert report["mode"] == MODE_HOME
+        assert report["total"] == 6
+        assert report["successful"] == 6
+        assert report["service_calls"] == 1
+        assert list(report["entities"]) == many_entities_data.entities_tracked
+        assert all(result["group_size"] == 6 for result in report["entities"].values())
+        assert all("duration_seconds" in result for result in report["entities"].values())
+    
+    @pytest.mark.asyncio
+    async def test_bulk_apply_respects_concurrency_limit(self, schedule_manager, mock_hass,
+                                                         many_entities_data, available_state,
+                                                         monday_morning):
+        """Test that no more than max_concurrency service calls are in flight."""
+        import asyncio
+        
+        many_entities_data.entities_tracked = ["climate.a", "input_number.b", "number.c"]
+        schedule_manager._schedule_data = many_entities_data
+        in_flight = 0
+        peak = 0
+        
+        async def slow_call(domain, service, data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+        
+        mock_hass.services.async_call = AsyncMock(side_effect=slow_call)
+        
+        report = await schedule_manager.bulk_apply(max_concurrency=2)
+        
+        assert peak == 2
+        assert report["max_concurrency"] == 2
+        assert report["service_calls"] == 3
+        assert report["successful"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_bulk_apply_isolates_failing_entity(self, schedule_manager, mock_hass,
+                                                      mock_buffer_manager, many_entities_data,
+                                                      available_state, monday_morning):
+        """Test that a failed group call is retried per entity."""
+        schedule_manager._schedule_data = many_entities_data
+        
+        async def flaky_call(domain, service, data):
+            if isinstance(data["entity_id"], list) or data["entity_id"] == "climate.room_3":
+                raise RuntimeError("cloud timeout")
+        
+        mock_hass.services.async_call = AsyncMock(side_effect=flaky_call)
+        
+        report = await schedule_manager.bulk_apply()
+        
+        assert report["failed"] == 1
+        assert report["service_calls"] == 7
+        assert report["entities"]["climate.room_3"]["success"] is False
+        assert report["entities"]["climate.room_0"]["success"] is True
+        assert mock_buffer_manager.update_scheduled_change.call_count == 5
+    
+    @pytest.mark.asyncio
+    async def test_bulk_apply_reports_evaluation_errors(self, schedule_manager, many_entities_data):
+        """Test that one failing evaluation does not abort the pass."""
+        schedule_manager._schedule_data = many_entities_data
+        
+        async def flaky_prepare(entity_id, force=False, mode=None):
+            if entity_id == "climate.room_3":
+                raise RuntimeError("bad state")
+            return PendingWrite(entity_id=entity_id, mode=mode, result=True)
+        
+        schedule_manager._prepare_schedule_write = flaky_prepare
+        
+        report = await schedule_manager.bulk_apply()
+        results = await schedule_manager.apply_all_tracked_entities()
+        
+        assert report["failed"] == 1
+        assert report["service_calls"] == 0
+        assert report["entities"]["climate.room_3"]["error"] == "bad state"
+        assert results["climate.room_3"] is False
+        assert results["climate.room_0"] is True
+
+
+class TestScheduleGridCache:
+    """Test cases for the revision-keyed grid cache."""
+    
+    @pytest.mark.asyncio
+    async def test_repeated_grid_fetch_is_cached(self, schedule_manager, sample_schedule_data, monday_morning):
+        """Test that repeated fetches reuse the cached payload."""
+        schedule_manager._schedule_data = sample_schedule_data
+        
+        with patch.object(schedule_manager, '_build_grid_payload',
+                          wraps=schedule_manager._build_grid_payload) as mock_build:
+            first = await schedule_manager.get_schedule_grid("climate.living_room", MODE_HOME)
+            second = await schedule_manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        assert mock_build.call_count == 1
+        assert first == second
+        assert second["current_slot"]["target_value"] == 22.0
+        assert second["revision"] == schedule_manager.schedule_revision
+    
+    @pytest.mark.asyncio
+    async def test_write_invalidates_grid(self, schedule_manager, sample_schedule_data, monday_morning):
+        """Test that a slot update bumps the revision and rebuilds the grid."""
+        schedule_manager._schedule_data = sample_schedule_data
+        before = await schedule_manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        result = await schedule_manager.update_slot(
+            "climate.living_room", MODE_HOME, "tuesday", "07:00-09:00", {"temperature": 20.0}
+        )
+        after = await schedule_manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        assert result is True
+        assert after["revision"] > before["revision"]
+        assert before["total_slots"] == 1
+        assert after["total_slots"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_replaced_schedule_data_invalidates_grid(self, schedule_manager, sample_schedule_data,
+                                                           monday_morning):
+        """Test that swapping the schedule data object is detected."""
+        schedule_manager._schedule_data = sample_schedule_data
+        await schedule_manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        replacement = ScheduleData.from_dict(sample_schedule_data.to_dict())
+        replacement.schedules[MODE_HOME]["monday"] = []
+        schedule_manager._schedule_data = replacement
+        grid = await schedule_manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        assert grid["total_slots"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_grid_json_matches_grid(self, schedule_manager, sample_schedule_data, monday_morning):
+        """Test that the pre-serialized grid matches the dictionary response."""
+        import json
+        
+        schedule_manager._schedule_data = sample_schedule_data
+        
+        grid = await schedule_manager.get_schedule_grid("climate.living_room", MODE_AWAY)
+        grid_json = await schedule_manager.get_schedule_grid_json("climate.living_room", MODE_AWAY)
+        
+        assert json.loads(grid_json) == grid
+        
+        error_json = await schedule_manager.get_schedule_grid_json("climate.unknown", MODE_AWAY)
+        assert "error" in json.loads(error_json)
+
+
+class TestSharedStorageInstance:
+    """Test that the manager follows the storage service's shared schedule data."""
+    
+    @pytest.fixture
+    def storage_service(self, mock_hass):
+        """Create a real storage service over a mocked store."""
+        from custom_components.roost_scheduler.storage import StorageService
+        
+        mock_hass.config.config_dir = "/config"
+        with patch('custom_components.roost_scheduler.storage.Store', return_value=AsyncMock()):
+            return StorageService(mock_hass, "test_entry")
+    
+    @pytest.fixture
+    def manager(self, mock_hass, storage_service, mock_presence_manager, mock_buffer_manager, monday_morning):
+        """Create a schedule manager on the real storage service, at a fixed time."""
+        return ScheduleManager(mock_hass, storage_service, mock_presence_manager, mock_buffer_manager)
+    
+    @pytest.mark.asyncio
+    async def test_replaced_instance_is_not_saved_back(self, manager, storage_service, sample_schedule_data):
+        """Test that data installed by an import is what the next edit patches and saves."""
+        storage_service._set_schedule_data(sample_schedule_data)
+        await manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        imported = ScheduleData.from_dict(sample_schedule_data.to_dict())
+        imported.schedules[MODE_HOME]["monday"] = []
+        storage_service._set_schedule_data(imported)
+        await manager.update_slot(
+            "climate.living_room", MODE_HOME, "tuesday", "07:00-09:00", {"temperature": 20.0}
+        )
+        
+        assert storage_service.get_schedule_data() is imported
+        assert imported.schedules[MODE_HOME]["monday"] == []
+        assert len(imported.schedules[MODE_HOME]["tuesday"]) == 1
+        assert "tuesday" not in sample_schedule_data.schedules[MODE_HOME]
+    
+    @pytest.mark.asyncio
+    async def test_grid_follows_storage_revision(self, manager, storage_service, sample_schedule_data):
+        """Test that a save made through another manager invalidates the cached grid."""
+        storage_service._set_schedule_data(sample_schedule_data)
+        before = await manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        sample_schedule_data.ui["resolution_minutes"] = 15
+        await storage_service.save_schedules(sample_schedule_data)
+        after = await manager.get_schedule_grid("climate.living_room", MODE_HOME)
+        
+        assert before["resolution_minutes"] == 30
+        assert after["resolution_minutes"] == 15
+
+
+class TestIncrementalCoverage:
+    """Test cases for per-day coverage analysis."""
+    
+    def test_cached_coverage_matches_full_analysis(self, schedule_manager, sample_schedule_data):
+        """Test that the per-day cache produces the full analysis format."""
+        schedule_manager._schedule_data = sample_schedule_data
+        
+        expected = schedule_manager._analyze_schedule_coverage(sample_schedule_data.schedules[MODE_HOME])
+        
+        assert schedule_manager._get_mode_coverage(MODE_HOME) == expected
+        assert expected["days_with_schedules"] == 1
+        assert len(expected["gaps"]) == 8
+    
+    @pytest.mark.asyncio
+    async def test_slot_update_recomputes_only_touched_day(self, schedule_manager, sample_schedule_data):
+        """Test that a slot update only re-analyzes the changed day."""
+        schedule_manager._schedule_data = sample_schedule_data
+        schedule_manager._get_mode_coverage(MODE_HOME)
+        
+        await schedule_manager.update_slot(
+            "climate.living_room", MODE_HOME, "tuesday", "07:00-09:00", {"temperature": 20.0}
+        )
+        
+        with patch.object(schedule_manager, '_analyze_day_coverage',
+                          wraps=schedule_manager._analyze_day_coverage) as mock_analyze:
+            coverage = schedule_manager._get_mode_coverage(MODE_HOME)
+        
+        mock_analyze.assert_called_once()
+        assert mock_analyze.call_args[0][0] == "tuesday"
+        assert coverage["days_with_schedules"] == 2
+        assert coverage == schedule_manager._analyze_schedule_coverage(sample_schedule_data.schedules[MODE_HOME])
+
+
+class TestBatchSlotUpdates:
+    """Test cases for transactional batch slot updates."""
+    
+    @pytest.mark.asyncio
+    async def test_batch_persists_and_notifies_once(self, schedule_manager, mock_hass, mock_storage_service,
+                                                    sample_schedule_data):
+        """Test that a batch is saved once and announced with one event."""
+        schedule_manager._schedule_data = sample_schedule_data
+        revision = schedule_manager.schedule_revision
+        
+        result = await schedule_manager.update_slots("climate.living_room", MODE_HOME, [
+            {"day": "tuesday", "time": "06:00-07:00", "value": 20.0},
+            {"day": "tuesday", "time": "07:00", "value": 21.0},
+            {"day": "Wednesday", "time": "06:00-07:00", "target": {"temperature": 19.5}},
+        ], event_data={"update_id": "abc"})
+        
+        assert result["success"] is True
+        assert result["errors"] == []
+        assert len(result["applied"]) == 3
+        assert result["revision"] > revision
+        mock_storage_service.save_schedules.assert_called_once_with(sample_schedule_data)
+        mock_hass.bus.async_fire.assert_called_once()
+        
+        event_data = mock_hass.bus.async_fire.call_args[0][1]
+        assert event_data["update_id"] == "abc"
+        assert [change["value"] for change in event_data["changes"]] == [20.0, 21.0, 19.5]
+        
+        tuesday = sample_schedule_data.schedules[MODE_HOME]["tuesday"]
+        assert [(s.start_time, s.end_time) for s in tuesday] == [("06:00", "07:00"), ("07:00", "07:30")]
+        assert sample_schedule_data.schedules[MODE_HOME]["wednesday"][0].target_value == 19.5
+    
+    @pytest.mark.asyncio
+    async def test_invalid_change_rejects_whole_batch(self, schedule_manager, mock_hass, mock_storage_service,
+                                                      sample_schedule_data):
+        """Test that one invalid change leaves the schedule untouched."""
+        schedule_manager._schedule_data = sample_schedule_data
+        revision = schedule_manager.schedule_revision
+        
+        result = await schedule_manager.update_slots("climate.living_room", MODE_HOME, [
+            {"day": "tuesday", "time": "06:00-07:00", "value": 20.0},
+            {"day": "tuesday", "time": "09:00-10:00", "value": "warm"},
+        ])
+        
+        assert result["success"] is False
+        assert result["errors"][0]["error"] == "Invalid target temperature: warm"
+        assert "tuesday" not in sample_schedule_data.schedules[MODE_HOME]
+        assert schedule_manager.schedule_revision == revision
+        mock_storage_service.save_schedules.assert_not_called()
+        mock_hass.bus.async_fire.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_overlapping_batch_is_rejected(self, schedule_manager, mock_storage_service,
+                                                 sample_schedule_data):
+        """Test that overlaps created by a batch are rejected."""
+        schedule_manager._schedule_data = sample_schedule_data
+        
+        result = await schedule_manager.update_slots("climate.living_room", MODE_HOME, [
+            {"day": "monday", "time": "07:00-09:00", "value": 20.0},
+        ])
+        
+        assert result["success"] is False
+        assert "overlap on monday" in result["errors"][0]["error"]
+        assert len(sample_schedule_data.schedules[MODE_HOME]["monday"]) == 1
+        mock_storage_service.save_schedules.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_failed_save_rolls_back(self, schedule_manager, mock_hass, mock_storage_service,
+                                          sample_schedule_data):
+        """Test that a storage failure restores the previous schedule."""
+        schedule_manager._schedule_data = sample_schedule_data
+        original_monday = sample_schedule_data.schedules[MODE_HOME]["monday"]
+        mock_storage_service.save_schedules.side_effect = Exception("disk full")
+        
+        result = await schedule_manager.update_slots("climate.living_room", MODE_HOME, [
+            {"day": "monday", "time": "08:00-18:00", "value": 23.0},
+            {"day": "friday", "time": "08:00-18:00", "value": 23.0},
+        ])
+        
+        assert result["success"] is False
+        assert "disk full" in result["errors"][0]["error"]
+        assert sample_schedule_data.schedules[MODE_HOME]["monday"] is original_monday
+        assert original_monday[0].target_value == 22.0
+        assert "friday" not in sample_schedule_data.schedules[MODE_HOME]
+        mock_hass.bus.async_fire.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_undo_adopts_restored_data(self, schedule_manager, mock_hass, mock_storage_service,
+                                             sample_schedule_data):
+        """Test that undo switches to the restored data and notifies every tracked entity."""
+        schedule_manager._schedule_data = MagicMock()
+        revision = schedule_manager.schedule_revision
+        mock_storage_service.undo_last_change = AsyncMock(return_value=sample_schedule_data)
+        
+        with patch.object(schedule_manager, '_async_arm_boundary_timer', AsyncMock()):
+            result = await schedule_manager.undo_last_change()
+        
+        assert result["success"] is True
+        assert result["revision"] > revision
+        assert schedule_manager._schedule_data is sample_schedule_data
+        fired = [call[0][1]["entity_id"] for call in mock_hass.bus.async_fire.call_args_list]
+        assert fired == sample_schedule_data.entities_tracked
+    
+    @pytest.mark.asyncio
+    async def test_undo_without_history(self, schedule_manager, mock_hass, mock_storage_service):
+        """Test that undo reports when there is nothing to revert."""
+        mock_storage_service.undo_last_change = AsyncMock(return_value=None)
+        
+        result = await schedule_manager.undo_last_change()
+        
+        assert result["success"] is False
+        assert result["error"] == "Nothing to undo"
+        mock_hass.bus.async_fire.assert_not_called()
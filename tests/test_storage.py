@@ -1,4 +1,6 @@
 """Tests for the storage service."""
+import gzip
+import hashlib
 import json
 import os
 import tempfile
@@ -11,8 +13,14 @@ import pytest_asyncio
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
 
-from custom_components.roost_scheduler.models import BufferConfig, ScheduleData, ScheduleSlot
-from custom_components.roost_scheduler.storage import CorruptedDataError, StorageError, StorageService
+from custom_components.roost_scheduler.models import BufferConfig, GlobalBufferConfig, ScheduleData, ScheduleSlot
+from custom_components.roost_scheduler.const import SAVE_RETRY_DELAY_SECONDS, VERSION
+from custom_components.roost_scheduler.storage import (
+    CorruptedDataError,
+    StorageError,
+    StorageService,
+    _write_backup_file,
+)
 
 
 @pytest.fixture
@@ -21,6 +29,7 @@ def mock_hass():
     hass = MagicMock()
     hass.config = MagicMock()
     hass.config.config_dir = "/config"
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda target, *args: target(*args))
     return hass
 
 
@@ -62,6 +71,15 @@ def storage_service(mock_hass):
         return service
 
 
+@pytest.fixture
+def backup_dir(storage_service, sample_schedule_data):
+    """Point the service at a temporary backup directory."""
+    storage_service._schedule_data = sample_schedule_data
+    with tempfile.TemporaryDirectory() as temp_dir:
+        storage_service._backup_dir = Path(temp_dir)
+        yield Path(temp_dir)
+
+
 class TestStorageService:
     """Test the StorageService class."""
     
@@ -453,6 +471,1061 @@ class TestStorageService:
                 assert len(imported_data.schedules) == len(sample_schedule_data.schedules)
 
 
+class TestSharedScheduleData:
+    """Test the shared in-memory schedule data."""
+    
+    @pytest.mark.asyncio
+    async def test_load_reads_store_once(self, storage_service, sample_schedule_data):
+        """Test that later loads return the same instance without touching the store."""
+        storage_service._store.async_load.return_value = sample_schedule_data.to_dict()
+        
+        first = await storage_service.load_schedules()
+        second = await storage_service.load_schedules()
+        
+        assert first is second
+        assert storage_service.get_schedule_data() is first
+        storage_service._store.async_load.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_patch_and_save_bumps_revision(self, storage_service, sample_schedule_data):
+        """Test that patching the shared data and saving persists once and bumps the revision."""
+        storage_service._store.async_load.return_value = sample_schedule_data.to_dict()
+        schedule_data = await storage_service.load_schedules()
+        revision = storage_service.revision
+        storage_service._store.async_save.reset_mock()
+        
+        schedule_data.presence_timeout_seconds = 300
+        await storage_service.save_schedules(schedule_data)
+        
+        assert storage_service.revision == revision + 1
+        storage_service._store.async_save.assert_called_once()
+        assert storage_service._store.async_save.call_args[0][0]["presence_timeout_seconds"] == 300
+        assert (await storage_service.load_schedules()).presence_timeout_seconds == 300
+    
+    @pytest.mark.asyncio
+    async def test_get_schedule_data_before_load(self, storage_service):
+        """Test that nothing is returned before the first load."""
+        assert storage_service.get_schedule_data() is None
+        assert storage_service.revision == 0
+
+
+class TestChecksumFastPath:
+    """Test the checksum-verified load path."""
+    
+    @pytest.fixture
+    def current_data(self, sample_schedule_data):
+        """Return stored data at the current version."""
+        sample_schedule_data.version = VERSION
+        return sample_schedule_data.to_dict()
+    
+    @pytest.mark.asyncio
+    async def test_checksum_written_on_save(self, storage_service, sample_schedule_data):
+        """Test that saved data carries a checksum of its content."""
+        await storage_service.save_schedules(sample_schedule_data)
+        
+        saved = storage_service._store.async_save.call_args[0][0]
+        content = {key: value for key, value in saved.items() if key != "content_checksum"}
+        assert saved["content_checksum"] == StorageService._content_checksum(content)
+    
+    @pytest.mark.asyncio
+    async def test_matching_checksum_skips_migration(self, storage_service, current_data):
+        """Test that verified data bypasses migration and structural validation."""
+        storage_service._store.async_load.return_value = storage_service._with_checksum(current_data)
+        storage_service._migration_manager.migrate_if_needed = AsyncMock()
+        storage_service._migration_manager.validate_migrated_data = AsyncMock()
+        
+        result = await storage_service.load_schedules()
+        
+        assert result.to_dict() == current_data
+        storage_service._migration_manager.migrate_if_needed.assert_not_called()
+        storage_service._migration_manager.validate_migrated_data.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_checksum_mismatch_runs_full_validation(self, storage_service, current_data):
+        """Test that edited data goes through the normal load path."""
+        stored = storage_service._with_checksum(current_data)
+        stored["presence_timeout_seconds"] = 1200
+        storage_service._store.async_load.return_value = stored
+        storage_service._migration_manager.validate_migrated_data = AsyncMock(return_value=True)
+        
+        result = await storage_service.load_schedules()
+        
+        assert result.presence_timeout_seconds == 1200
+        storage_service._migration_manager.validate_migrated_data.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_checksum_mismatch_validates_slots(self, storage_service, current_data):
+        """Test that unverified data with overlapping slots is not loaded."""
+        stored = storage_service._with_checksum(current_data)
+        stored["schedules"]["home"]["monday"].append(
+            {"start": "07:00", "end": "09:00", "target": {"domain": "climate", "temperature": 99}}
+        )
+        storage_service._store.async_load.return_value = stored
+        storage_service._migration_manager.validate_migrated_data = AsyncMock(return_value=True)
+        
+        with patch.object(storage_service, '_attempt_recovery', AsyncMock(return_value=None)) as mock_recovery:
+            result = await storage_service.load_schedules()
+        
+        assert result is None
+        mock_recovery.assert_awaited_once()
+        assert storage_service.get_schedule_data() is None
+    
+    @pytest.mark.asyncio
+    async def test_old_version_is_migrated(self, storage_service, sample_schedule_data):
+        """Test that a valid checksum does not bypass migration of older versions."""
+        storage_service._store.async_load.return_value = storage_service._with_checksum(
+            sample_schedule_data.to_dict()
+        )
+        
+        result = await storage_service.load_schedules()
+        
+        assert result.version == VERSION
+        saved = storage_service._store.async_save.call_args[0][0]
+        assert saved["version"] == VERSION
+        assert "content_checksum" in saved
+
+
+class TestOffLoopImport:
+    """Test that backup imports are read, validated and parsed off the loop."""
+    
+    @pytest.mark.asyncio
+    async def test_current_version_skips_migration(self, storage_service, sample_schedule_data):
+        """Test that a current-version backup is parsed by the validation pass."""
+        sample_schedule_data.version = VERSION
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "backup_test_entry.json"
+            path.write_text(sample_schedule_data.to_json())
+            storage_service._migration_manager = MagicMock()
+            
+            with patch.object(storage_service, 'save_schedules') as mock_save:
+                assert await storage_service.import_backup(str(path)) is True
+            
+            storage_service._migration_manager.migrate_if_needed.assert_not_called()
+            storage_service._migration_manager.validate_migrated_data.assert_not_called()
+            storage_service.hass.async_add_executor_job.assert_called_once()
+            assert mock_save.call_args[0][0].schedules == sample_schedule_data.schedules
+    
+    @pytest.mark.asyncio
+    async def test_older_version_is_migrated(self, storage_service, sample_schedule_data):
+        """Test that an older backup still goes through migration."""
+        data = sample_schedule_data.to_dict()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "backup_test_entry.json"
+            path.write_text(json.dumps(data))
+            
+            with patch.object(storage_service, 'save_schedules') as mock_save:
+                assert await storage_service.import_backup(str(path)) is True
+            
+            assert mock_save.call_args[0][0].version == VERSION
+            executor_targets = [
+                call[0][0] for call in storage_service.hass.async_add_executor_job.call_args_list
+            ]
+            assert storage_service._load_backup_file in executor_targets
+            assert storage_service._parse_migrated_backup in executor_targets
+    
+    @pytest.mark.asyncio
+    async def test_overlapping_slots_rejected(self, storage_service, sample_schedule_data):
+        """Test that slots parsed during validation are still checked for overlaps."""
+        sample_schedule_data.version = VERSION
+        data = sample_schedule_data.to_dict()
+        slot = data["schedules"]["home"]["monday"][0]
+        data["schedules"]["home"]["monday"].append(dict(slot))
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "backup_test_entry.json"
+            path.write_text(json.dumps(data))
+            
+            with patch.object(storage_service, 'save_schedules') as mock_save:
+                assert await storage_service.import_backup(str(path)) is False
+            
+            mock_save.assert_not_called()
+    
+    def test_validation_returns_schedule_data(self, storage_service, sample_schedule_data):
+        """Test that validating current-version data yields the parsed schedules."""
+        sample_schedule_data.version = VERSION
+        
+        result = storage_service._validate_backup_data_structure(
+            sample_schedule_data.to_dict(), "test.json"
+        )
+        
+        assert result["valid"] is True
+        assert result["schedule_data"].schedules == sample_schedule_data.schedules
+    
+    def test_validation_of_old_version_defers_parsing(self, storage_service, sample_schedule_data):
+        """Test that data needing migration is validated but not parsed."""
+        result = storage_service._validate_backup_data_structure(
+            sample_schedule_data.to_dict(), "test.json"
+        )
+        
+        assert result["valid"] is True
+        assert result["schedule_data"] is None
+
+
+class TestCompressedExport:
+    """Test off-loop, optionally compressed backup export."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compression,suffix", [("gzip", ".json.gz"), ("lzma", ".json.xz")])
+    async def test_compressed_round_trip(self, storage_service, sample_schedule_data, compression, suffix):
+        """Test that compressed exports are named by suffix and import back."""
+        storage_service._schedule_data = sample_schedule_data
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage_service._backup_dir = Path(temp_dir)
+            
+            path = await storage_service.export_backup(compression=compression)
+            
+            assert path.endswith(suffix)
+            executor_targets = [c[0][0] for c in storage_service.hass.async_add_executor_job.call_args_list]
+            assert _write_backup_file in executor_targets
+            with patch.object(storage_service, 'save_schedules') as mock_save:
+                assert await storage_service.import_backup(path) is True
+            assert mock_save.call_args[0][0].schedules == sample_schedule_data.schedules
+    
+    @pytest.mark.asyncio
+    async def test_compression_inferred_from_path(self, storage_service, sample_schedule_data):
+        """Test that an explicit .json.gz path is written gzip-compressed."""
+        storage_service._schedule_data = sample_schedule_data
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage_service._backup_dir = Path(temp_dir)
+            path = str(Path(temp_dir) / "manual_test_entry.json.gz")
+            
+            await storage_service.export_backup(path)
+            
+            with gzip.open(path, "rt") as f:
+                assert json.load(f)["version"] == sample_schedule_data.version
+            assert [p.name for p in Path(temp_dir).glob("manual_*")] == ["manual_test_entry.json.gz"]
+    
+    def test_write_reports_uncompressed_size(self, sample_schedule_data):
+        """Test that a compressed write reports the JSON size, not the compressed one."""
+        data = sample_schedule_data.to_dict()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = str(Path(temp_dir) / "backup.json.gz")
+            json_size, written_size, _ = _write_backup_file(path, data, "gzip")
+        
+        assert json_size == len(json.dumps(data, indent=2).encode("utf-8"))
+        assert written_size < json_size
+    
+    @pytest.mark.asyncio
+    async def test_unknown_compression_rejected(self, storage_service, sample_schedule_data):
+        """Test that an unsupported compression raises StorageError."""
+        storage_service._schedule_data = sample_schedule_data
+        
+        with pytest.raises(StorageError, match="Unsupported backup compression"):
+            await storage_service.export_backup(compression="zip")
+    
+    @pytest.mark.asyncio
+    async def test_recovery_finds_compressed_backups(self, storage_service, sample_schedule_data):
+        """Test that recovery considers compressed backups."""
+        storage_service._schedule_data = sample_schedule_data
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage_service._backup_dir = Path(temp_dir)
+            path = await storage_service.export_backup(compression="gzip")
+            
+            with patch.object(storage_service, 'import_backup', return_value=True) as mock_import:
+                await storage_service._attempt_recovery()
+            
+            mock_import.assert_called_once_with(path)
+
+
+class TestIncrementalBackups:
+    """Test content-addressed nightly backups."""
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_data_writes_nothing(self, storage_service, backup_dir):
+        """Test that a second backup of the same data reuses the first manifest."""
+        first = await storage_service.create_nightly_backup()
+        files = sorted(backup_dir.rglob("*"))
+        
+        second = await storage_service.create_nightly_backup()
+        
+        assert first == second
+        assert first.endswith(".manifest.json")
+        assert sorted(backup_dir.rglob("*")) == files
+        assert len(list((backup_dir / "objects").iterdir())) == 1
+    
+    @pytest.mark.asyncio
+    async def test_last_modified_does_not_change_object(self, storage_service, backup_dir, sample_schedule_data):
+        """Test that a save that only touched metadata.last_modified reuses the latest manifest."""
+        first = await storage_service.create_nightly_backup()
+        sample_schedule_data.metadata["last_modified"] = datetime.now().isoformat()
+        
+        second = await storage_service.create_nightly_backup()
+        
+        assert first == second
+        assert len(list((backup_dir / "objects").iterdir())) == 1
+    
+    @pytest.mark.asyncio
+    async def test_backup_files_written_in_executor(self, storage_service, backup_dir, mock_hass):
+        """Test that the nightly backup does its file I/O in one executor job."""
+        await storage_service.create_nightly_backup()
+        
+        targets = [call[0][0] for call in mock_hass.async_add_executor_job.call_args_list]
+        assert targets.count(storage_service._write_nightly_backup) == 1
+    
+    @pytest.mark.asyncio
+    async def test_torn_object_is_rewritten(self, storage_service, backup_dir, sample_schedule_data):
+        """Test that a half-written object is replaced instead of being reused."""
+        path = await storage_service.create_nightly_backup()
+        object_path = next((backup_dir / "objects").iterdir())
+        object_path.write_text(object_path.read_text()[:20])
+        Path(path).unlink()
+        
+        await storage_service.create_nightly_backup()
+        
+        assert json.loads(object_path.read_text()) == sample_schedule_data.to_dict()
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_runs_in_executor(self, storage_service, backup_dir, mock_hass):
+        """Test that deleting and pruning backups happens off the event loop."""
+        path = Path(await storage_service.create_nightly_backup())
+        mock_hass.async_add_executor_job.reset_mock()
+        
+        assert await storage_service.delete_backup(path.name) is True
+        
+        targets = [call[0][0] for call in mock_hass.async_add_executor_job.call_args_list]
+        assert storage_service._prune_backup_objects in targets
+    
+    @pytest.mark.asyncio
+    async def test_manifest_references_object(self, storage_service, backup_dir, sample_schedule_data):
+        """Test that the manifest points at the content stored by its checksum."""
+        path = await storage_service.create_nightly_backup()
+        
+        manifest = json.loads(Path(path).read_text())
+        object_path = backup_dir / "objects" / f"{manifest['object']}.json"
+        assert json.loads(object_path.read_text()) == sample_schedule_data.to_dict()
+        assert manifest["size"] == object_path.stat().st_size
+    
+    @pytest.mark.asyncio
+    async def test_shared_objects_counted_once(self, storage_service, backup_dir):
+        """Test that manifests sharing an object do not double the reported size."""
+        path = Path(await storage_service.create_nightly_backup())
+        copy = backup_dir / "nightly_backup_test_entry_20250101.manifest.json"
+        copy.write_text(path.read_text())
+        await storage_service.async_rebuild_backup_index()
+        
+        info = await storage_service.get_backup_info()
+        
+        manifest_sizes = sum(backup["size"] for backup in info["backups"])
+        assert len(info["backups"]) == 2
+        assert info["total_size"] == manifest_sizes + info["backups"][0]["content_size"]
+    
+    @pytest.mark.asyncio
+    async def test_import_resolves_manifest(self, storage_service, backup_dir, sample_schedule_data):
+        """Test that importing a manifest restores the referenced data."""
+        path = await storage_service.create_nightly_backup()
+        storage_service._schedule_data = None
+        
+        assert await storage_service.import_backup(path) is True
+        assert storage_service._schedule_data.schedules == sample_schedule_data.schedules
+    
+    @pytest.mark.asyncio
+    async def test_import_rejects_tampered_object(self, storage_service, backup_dir):
+        """Test that an object not matching its checksum is not imported."""
+        path = await storage_service.create_nightly_backup()
+        object_path = next((backup_dir / "objects").iterdir())
+        data = json.loads(object_path.read_text())
+        data["presence_timeout_seconds"] = 1
+        object_path.write_text(json.dumps(data))
+        
+        assert await storage_service.import_backup(path) is False
+    
+    @pytest.mark.asyncio
+    async def test_unreferenced_objects_pruned(self, storage_service, backup_dir):
+        """Test that deleting the last manifest for an object removes the object."""
+        path = Path(await storage_service.create_nightly_backup())
+        
+        assert await storage_service.delete_backup(path.name) is True
+        assert list((backup_dir / "objects").iterdir()) == []
+    
+    @pytest.mark.asyncio
+    async def test_retention_keeps_recent_manifests(self, storage_service, backup_dir):
+        """Test that manifests inside the retention period survive cleanup."""
+        storage_service.configure_nightly_backup(True, retention_days=90)
+        now = datetime.now().timestamp()
+        for day in range(30):
+            manifest = backup_dir / f"nightly_backup_test_entry_202501{day:02d}.manifest.json"
+            manifest.write_text(json.dumps({"object": "abc"}))
+            os.utime(manifest, (now - day * 86400, now - day * 86400))
+        
+        await storage_service._cleanup_old_backups()
+        
+        assert len(list(backup_dir.glob("nightly_backup_test_entry_*.json"))) == 30
+
+
+class TestBackupIndex:
+    """Test the persistent per-entry backup index."""
+    
+    def read_index(self, backup_dir):
+        """Read the persisted index entries."""
+        return json.loads((backup_dir / "index" / "test_entry.json").read_text())["backups"]
+    
+    @pytest.mark.asyncio
+    async def test_writes_are_indexed(self, storage_service, backup_dir, sample_schedule_data):
+        """Test that exports and nightly backups are recorded with their checksums."""
+        export_path = Path(await storage_service.export_backup())
+        nightly_path = Path(await storage_service.create_nightly_backup())
+        
+        index = self.read_index(backup_dir)
+        
+        assert set(index) == {export_path.name, nightly_path.name}
+        assert index[export_path.name]["type"] == "manual"
+        assert index[export_path.name]["size"] == export_path.stat().st_size
+        assert index[export_path.name]["schema_version"] == sample_schedule_data.version
+        assert index[nightly_path.name]["type"] == "nightly"
+        assert index[nightly_path.name]["checksum"] == json.loads(nightly_path.read_text())["object"]
+    
+    @pytest.mark.asyncio
+    async def test_migration_backups_are_indexed(self, storage_service, mock_hass, sample_schedule_data):
+        """Test that a pre-migration backup shows up in listings and recovery candidates."""
+        with tempfile.TemporaryDirectory() as config_dir:
+            mock_hass.config.config_dir = config_dir
+            storage_service._backup_dir = Path(config_dir) / "roost_scheduler_backups"
+            
+            await storage_service._migration_manager._create_migration_backup(
+                sample_schedule_data.to_dict(), "0.3.0"
+            )
+            
+            with patch('pathlib.Path.glob', side_effect=AssertionError("directory scanned")):
+                info = await storage_service.get_backup_info()
+            
+            [backup] = info["backups"]
+            assert backup["filename"].startswith("pre_migration_0.3.0_to_")
+            assert backup["schema_version"] == "0.3.0"
+            content = (storage_service._backup_dir / backup["filename"]).read_text()
+            assert backup["checksum"] == hashlib.sha256(content.encode("utf-8")).hexdigest()
+            assert self.read_index(storage_service._backup_dir) == storage_service._backup_index
+    
+    @pytest.mark.asyncio
+    async def test_listing_reads_index_not_directory(self, storage_service, backup_dir):
+        """Test that listing does not scan once the index is loaded."""
+        await storage_service.export_backup()
+        
+        with patch('pathlib.Path.glob', side_effect=AssertionError("directory scanned")):
+            info = await storage_service.get_backup_info()
+        
+        assert len(info["backups"]) == 1
+        assert info["backups"][0]["checksum"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_delete_removes_index_entry(self, storage_service, backup_dir):
+        """Test that deleting a backup drops it from the index."""
+        path = Path(await storage_service.export_backup())
+        
+        assert await storage_service.delete_backup(path.name) is True
+        
+        assert self.read_index(backup_dir) == {}
+    
+    @pytest.mark.asyncio
+    async def test_missing_index_rebuilt_from_scan(self, storage_service, backup_dir):
+        """Test that a missing index is rebuilt with the same entries."""
+        path = Path(await storage_service.export_backup(compression="gzip"))
+        expected = self.read_index(backup_dir)[path.name]
+        (backup_dir / "index" / "test_entry.json").unlink()
+        storage_service._backup_index = None
+        
+        info = await storage_service.get_backup_info()
+        
+        rebuilt = self.read_index(backup_dir)[path.name]
+        assert [b["filename"] for b in info["backups"]] == [path.name]
+        assert rebuilt["checksum"] == expected["checksum"]
+        assert rebuilt["schema_version"] == expected["schema_version"]
+        assert rebuilt["size"] == expected["size"]
+    
+    @pytest.mark.asyncio
+    async def test_recovery_order_follows_index(self, storage_service, backup_dir):
+        """Test that recovery tries backups newest first by their recorded creation time."""
+        for name, created in (("old", "2025-01-01T00:00:00"), ("new", "2025-06-01T00:00:00")):
+            filename = f"backup_test_entry_{name}.json"
+            (backup_dir / filename).write_text('{"test": "data"}')
+            await storage_service._async_update_backup_index(add={
+                filename: {"size": 16, "created": created, "type": "manual", "checksum": None, "schema_version": None}
+            })
+        
+        with patch.object(storage_service, 'import_backup', return_value=False) as mock_import, \
+             patch.object(storage_service, '_create_default_schedule_data', return_value=MagicMock()):
+            await storage_service._attempt_recovery()
+        
+        assert [Path(c[0][0]).name for c in mock_import.call_args_list] == [
+            "backup_test_entry_new.json", "backup_test_entry_old.json"
+        ]
+
+
+class TestParallelRecovery:
+    """Test checksum-first recovery from backups."""
+    
+    async def export_two(self, storage_service, backup_dir):
+        """Export an older and a newer backup and return their paths."""
+        old = Path(await storage_service.export_backup(str(backup_dir / "backup_test_entry_old.json")))
+        new = Path(await storage_service.export_backup(str(backup_dir / "backup_test_entry_new.json")))
+        storage_service._backup_index[old.name]["created"] = "2025-01-01T00:00:00"
+        return old, new
+    
+    @pytest.mark.asyncio
+    async def test_checksum_mismatch_skips_import(self, storage_service, backup_dir):
+        """Test that a newer backup failing its checksum is never imported."""
+        old, new = await self.export_two(storage_service, backup_dir)
+        new.write_text(new.read_text().replace("anyone_home", "everyone_home"))
+        
+        with patch.object(storage_service, 'import_backup', return_value=True) as mock_import:
+            await storage_service._attempt_recovery()
+        
+        mock_import.assert_called_once_with(str(old))
+    
+    @pytest.mark.asyncio
+    async def test_bad_header_rejected(self, storage_service, backup_dir):
+        """Test that a compressed backup without its magic bytes fails verification."""
+        path = Path(await storage_service.export_backup(compression="gzip"))
+        path.write_bytes(b"not gzip")
+        entry = storage_service._backup_index[path.name]
+        
+        assert storage_service._verify_backup_candidate(path, entry) == "Invalid file header"
+    
+    @pytest.mark.asyncio
+    async def test_candidates_verified_in_executor(self, storage_service, backup_dir):
+        """Test that all candidates in a batch are verified off the loop before importing."""
+        await self.export_two(storage_service, backup_dir)
+        storage_service.hass.async_add_executor_job.reset_mock()
+        
+        with patch.object(storage_service, 'import_backup', return_value=True) as mock_import:
+            await storage_service._attempt_recovery()
+        
+        executor_targets = [c[0][0] for c in storage_service.hass.async_add_executor_job.call_args_list]
+        assert executor_targets == [storage_service._verify_backup_candidate] * 2
+        assert Path(mock_import.call_args[0][0]).name == "backup_test_entry_new.json"
+    
+    @pytest.mark.asyncio
+    async def test_newest_verified_backup_promoted(self, storage_service, backup_dir, sample_schedule_data):
+        """Test that recovery restores the newest backup that verifies."""
+        await self.export_two(storage_service, backup_dir)
+        storage_service._schedule_data = None
+        
+        result = await storage_service._attempt_recovery()
+        
+        assert result.schedules == sample_schedule_data.schedules
+
+
+class TestColumnarStorage:
+    """Test the opt-in columnar storage layout."""
+    
+    @pytest.fixture
+    def columnar_service(self, storage_service):
+        """Write schedules in the columnar layout."""
+        storage_service._storage_format = "columnar"
+        return storage_service
+    
+    def test_unknown_format_falls_back_to_legacy(self, mock_hass):
+        """Test that an unknown storage format option is ignored."""
+        with patch('custom_components.roost_scheduler.storage.Store'):
+            service = StorageService(mock_hass, "test_entry", storage_format="packed")
+        
+        assert service.storage_format == "legacy"
+    
+    @pytest.mark.asyncio
+    async def test_save_writes_columnar_layout(self, columnar_service, sample_schedule_data):
+        """Test that saves use parallel arrays per mode/day."""
+        await columnar_service.save_schedules(sample_schedule_data)
+        
+        saved = columnar_service._store.async_save.call_args[0][0]
+        assert saved["storage_format"] == "columnar"
+        assert saved["schedules"]["home"]["monday"]["start"] == [360]
+    
+    @pytest.mark.asyncio
+    async def test_verified_columnar_load(self, columnar_service, sample_schedule_data):
+        """Test that checksum-verified columnar data loads without a rewrite."""
+        sample_schedule_data.version = VERSION
+        columnar_service._store.async_load.return_value = columnar_service._with_checksum(
+            sample_schedule_data.to_dict(columnar=True)
+        )
+        
+        result = await columnar_service.load_schedules()
+        
+        assert result == sample_schedule_data
+        columnar_service._store.async_save.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_legacy_store_converted_on_load(self, columnar_service, sample_schedule_data):
+        """Test that a legacy store is rewritten once in the columnar layout."""
+        sample_schedule_data.version = VERSION
+        columnar_service._store.async_load.return_value = columnar_service._with_checksum(
+            sample_schedule_data.to_dict()
+        )
+        
+        result = await columnar_service.load_schedules()
+        
+        assert result == sample_schedule_data
+        saved = columnar_service._store.async_save.call_args[0][0]
+        assert saved["storage_format"] == "columnar"
+    
+    @pytest.mark.asyncio
+    async def test_old_columnar_data_is_migrated(self, storage_service, sample_schedule_data):
+        """Test that unverified columnar data is migrated and saved in the configured layout."""
+        storage_service._store.async_load.return_value = sample_schedule_data.to_dict(columnar=True)
+        
+        result = await storage_service.load_schedules()
+        
+        assert result.version == VERSION
+        saved = storage_service._store.async_save.call_args[0][0]
+        assert "storage_format" not in saved
+        assert saved["schedules"]["home"]["monday"][0]["start"] == "06:00"
+
+
+class TestWriteBehind:
+    """Test the write-behind save mode."""
+    
+    @pytest.fixture
+    def write_behind_service(self, storage_service):
+        """Enable a 10 second save delay."""
+        storage_service.configure_write_behind(10)
+        return storage_service
+    
+    @pytest.mark.asyncio
+    async def test_saves_are_coalesced_until_flush(self, write_behind_service, sample_schedule_data):
+        """Test that saves only mark the data dirty and one flush writes it."""
+        with patch('custom_components.roost_scheduler.storage.async_call_later') as mock_call_later:
+            await write_behind_service.save_schedules(sample_schedule_data)
+            await write_behind_service.save_schedules(sample_schedule_data)
+        
+        mock_call_later.assert_called_once()
+        assert mock_call_later.call_args[0][1] == 10
+        write_behind_service._store.async_save.assert_not_called()
+        assert write_behind_service.has_pending_changes is True
+        
+        await write_behind_service.flush()
+        await write_behind_service.flush()
+        
+        write_behind_service._store.async_save.assert_called_once()
+        saved = write_behind_service._store.async_save.call_args[0][0]
+        saved.pop("content_checksum")
+        assert saved == sample_schedule_data.to_dict()
+        assert write_behind_service.has_pending_changes is False
+        mock_call_later.return_value.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_timer_and_shutdown_flush(self, write_behind_service, mock_hass, sample_schedule_data):
+        """Test that the debounce timer and the final write event flush pending data."""
+        with patch('custom_components.roost_scheduler.storage.async_call_later') as mock_call_later:
+            await write_behind_service.save_schedules(sample_schedule_data)
+            flush_callback = mock_call_later.call_args[0][2]
+            final_write_callback = mock_hass.bus.async_listen_once.call_args[0][1]
+            
+            await flush_callback(datetime.now())
+            assert write_behind_service._store.async_save.call_count == 1
+            
+            await write_behind_service.save_schedules(sample_schedule_data)
+            await final_write_callback(MagicMock())
+            assert write_behind_service._store.async_save.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_load_returns_unflushed_data(self, write_behind_service, sample_schedule_data):
+        """Test that loading while dirty does not read stale data from disk."""
+        with patch('custom_components.roost_scheduler.storage.async_call_later'):
+            await write_behind_service.save_schedules(sample_schedule_data)
+        
+        assert await write_behind_service.load_schedules() is sample_schedule_data
+        write_behind_service._store.async_load.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_immediate_save_bypasses_delay(self, write_behind_service, sample_schedule_data):
+        """Test that immediate saves are written straight through."""
+        await write_behind_service.save_schedules(sample_schedule_data, immediate=True)
+        
+        write_behind_service._store.async_save.assert_called_once()
+        assert write_behind_service.has_pending_changes is False
+    
+    @pytest.mark.asyncio
+    async def test_failed_flush_stays_dirty(self, write_behind_service, sample_schedule_data):
+        """Test that a failed write keeps the data dirty."""
+        with patch('custom_components.roost_scheduler.storage.async_call_later'):
+            await write_behind_service.save_schedules(sample_schedule_data)
+            write_behind_service._store.async_save.side_effect = OSError("read-only file system")
+            
+            with pytest.raises(StorageError):
+                await write_behind_service.flush()
+        
+        assert write_behind_service.has_pending_changes is True
+    
+    @pytest.mark.asyncio
+    async def test_failed_write_retries_after_fixed_delay(self, storage_service, sample_schedule_data):
+        """Test that a failed write with no save delay does not re-arm a zero-second timer."""
+        storage_service._store.async_save.side_effect = OSError("read-only file system")
+        
+        with patch('custom_components.roost_scheduler.storage.async_call_later') as mock_call_later:
+            with pytest.raises(StorageError):
+                await storage_service.save_schedules(sample_schedule_data)
+        
+        mock_call_later.assert_called_once()
+        assert mock_call_later.call_args[0][1] == SAVE_RETRY_DELAY_SECONDS
+        assert storage_service.has_pending_changes is True
+
+
+class TestJournaledStorage:
+    """Test the journaled persistence mode."""
+    
+    @pytest.fixture
+    def journal_service(self, mock_hass):
+        """Create a storage service with journaling enabled."""
+        with patch('custom_components.roost_scheduler.storage.Store') as mock_store_class, \
+             patch('custom_components.roost_scheduler.journal.Store') as mock_journal_store_class:
+            mock_store_class.return_value = AsyncMock(spec=Store)
+            mock_journal_store_class.return_value = AsyncMock(spec=Store)
+            mock_journal_store_class.return_value.async_load.return_value = None
+            
+            service = StorageService(mock_hass, "test_entry", journal=True)
+            service._store = mock_store_class.return_value
+        return service
+    
+    @pytest.fixture
+    def snapshot(self, journal_service, sample_schedule_data):
+        """Store a checksum-verified snapshot at the current version."""
+        sample_schedule_data.version = VERSION
+        stored = journal_service._with_checksum(sample_schedule_data.to_dict())
+        journal_service._store.async_load.return_value = stored
+        return stored
+    
+    @staticmethod
+    def _slot(start, end, value):
+        """Create a monday slot."""
+        return ScheduleSlot(day="monday", start_time=start, end_time=end,
+                            target_value=value, entity_domain="climate")
+    
+    @pytest.mark.asyncio
+    async def test_save_appends_changed_sections_only(self, journal_service, snapshot):
+        """Test that an edit is journaled as a delta instead of rewriting the snapshot."""
+        data = await journal_service.load_schedules()
+        journal_service._store.async_save.assert_not_called()
+        
+        data.schedules["home"]["monday"] = [self._slot("06:00", "09:00", 21.0)]
+        with patch('custom_components.roost_scheduler.storage.async_call_later') as mock_call_later:
+            await journal_service.save_schedules(data)
+        
+        journal_service._store.async_save.assert_not_called()
+        mock_call_later.assert_called_once()
+        saved = journal_service._journal._store.async_save.call_args[0][0]
+        assert saved["base"] == snapshot["content_checksum"]
+        record = saved["records"][-1]
+        assert set(record["set"]) == {"schedules/home/monday", "metadata"}
+        assert record["set"]["schedules/home/monday"][0]["end"] == "09:00"
+        assert record["unset"] == []
+    
+    @pytest.mark.asyncio
+    async def test_load_replays_journal_and_compacts(self, journal_service, snapshot):
+        """Test that records written against the snapshot are replayed on load."""
+        journal_service._journal._store.async_load.return_value = {
+            "base": snapshot["content_checksum"],
+            "seq": 1,
+            "records": [{
+                "seq": 1,
+                "timestamp": "2026-01-01T00:00:00",
+                "set": {"schedules/away/sunday": [
+                    {"day": "sunday", "start": "10:00", "end": "12:00", "target": {"temperature": 16.0}}
+                ]},
+                "unset": ["schedules/home/monday"],
+            }],
+            "undo": [],
+        }
+        
+        result = await journal_service.load_schedules()
+        
+        assert "monday" not in result.schedules["home"]
+        assert result.schedules["away"]["sunday"][0].target_value == 16.0
+        # Folded into a fresh snapshot, and the journal starts over on it
+        snapshot_saved = journal_service._store.async_save.call_args[0][0]
+        journal_saved = journal_service._journal._store.async_save.call_args[0][0]
+        assert journal_saved["records"] == []
+        assert journal_saved["base"] == snapshot_saved["content_checksum"]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_journal_falls_back_to_snapshot(self, journal_service, snapshot, sample_schedule_data):
+        """Test that records producing invalid slots are dropped instead of compacted."""
+        journal_service._journal._store.async_load.return_value = {
+            "base": snapshot["content_checksum"],
+            "seq": 1,
+            "records": [{
+                "seq": 1,
+                "timestamp": "2026-01-01T00:00:00",
+                "set": {"schedules/home/monday": [
+                    {"start": "06:00", "end": "08:00", "target": {"domain": "climate", "temperature": 20.0}},
+                    {"start": "07:00", "end": "09:00", "target": {"domain": "climate", "temperature": 99}},
+                ]},
+                "unset": [],
+            }],
+            "undo": [],
+        }
+        
+        result = await journal_service.load_schedules()
+        
+        assert result == sample_schedule_data
+        journal_service._store.async_save.assert_not_called()
+        assert journal_service._journal.pending_records == 0
+        assert journal_service._journal.started
+    
+    @pytest.mark.asyncio
+    async def test_compaction_refuses_invalid_data(self, journal_service, snapshot):
+        """Test that compaction does not write a checksummed snapshot of invalid slots."""
+        data = await journal_service.load_schedules()
+        data.schedules["home"]["monday"].append(self._slot("07:00", "09:00", 21.0))
+        
+        with pytest.raises(StorageError):
+            await journal_service.compact_journal()
+        
+        journal_service._store.async_save.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_records_for_older_snapshot_are_ignored(self, journal_service, snapshot, sample_schedule_data):
+        """Test that records already folded by an interrupted compaction are not replayed."""
+        journal_service._journal._store.async_load.return_value = {
+            "base": "checksum-of-previous-snapshot",
+            "seq": 1,
+            "records": [{"seq": 1, "timestamp": "", "set": {}, "unset": ["schedules/home/monday"]}],
+            "undo": [],
+        }
+        
+        result = await journal_service.load_schedules()
+        
+        assert result == sample_schedule_data
+        journal_service._store.async_save.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_compaction_timer_writes_snapshot(self, journal_service, snapshot):
+        """Test that the compactor folds pending records into the snapshot."""
+        data = await journal_service.load_schedules()
+        data.ui["resolution_minutes"] = 15
+        
+        with patch('custom_components.roost_scheduler.storage.async_call_later') as mock_call_later:
+            await journal_service.save_schedules(data)
+            compact_callback = mock_call_later.call_args[0][2]
+            await compact_callback(datetime.now())
+        
+        saved = journal_service._store.async_save.call_args[0][0]
+        assert saved["ui"]["resolution_minutes"] == 15
+        assert journal_service._journal.pending_records == 0
+        journal_saved = journal_service._journal._store.async_save.call_args[0][0]
+        assert journal_saved["base"] == saved["content_checksum"]
+        # Undo history survives compaction
+        assert len(journal_saved["undo"]) == 1
+    
+    @pytest.mark.asyncio
+    async def test_compacts_when_journal_is_full(self, journal_service, snapshot):
+        """Test that reaching the record limit compacts straight away."""
+        data = await journal_service.load_schedules()
+        
+        with patch('custom_components.roost_scheduler.storage.JOURNAL_COMPACT_MAX_RECORDS', 2), \
+             patch('custom_components.roost_scheduler.storage.async_call_later'):
+            for minutes in (15, 60):
+                data.ui["resolution_minutes"] = minutes
+                await journal_service.save_schedules(data)
+        
+        journal_service._store.async_save.assert_called_once()
+        assert journal_service._journal.pending_records == 0
+    
+    @pytest.mark.asyncio
+    async def test_undo_reverts_last_change(self, journal_service, snapshot):
+        """Test that undo restores the previous sections and pops the history."""
+        data = await journal_service.load_schedules()
+        original_slots = [slot.to_dict() for slot in data.schedules["home"]["monday"]]
+        
+        with patch('custom_components.roost_scheduler.storage.async_call_later'):
+            data.schedules["home"]["tuesday"] = [
+                ScheduleSlot(day="tuesday", start_time="07:00", end_time="08:00",
+                             target_value=19.0, entity_domain="climate")
+            ]
+            data.schedules["home"]["monday"] = [self._slot("05:00", "06:00", 18.0)]
+            await journal_service.save_schedules(data)
+            
+            history = journal_service.get_change_history()
+            assert history[0]["sections"] == ["metadata", "schedules/home/monday", "schedules/home/tuesday"]
+            
+            restored = await journal_service.undo_last_change()
+        
+        assert restored is journal_service.get_schedule_data()
+        assert "tuesday" not in restored.schedules["home"]
+        assert [slot.to_dict() for slot in restored.schedules["home"]["monday"]] == original_slots
+        assert journal_service.get_change_history() == []
+        assert journal_service._journal.pending_records == 2
+        assert await journal_service.undo_last_change() is None
+    
+    @pytest.mark.asyncio
+    async def test_undo_unavailable_without_journal(self, storage_service, sample_schedule_data):
+        """Test that the default mode has no undo history."""
+        await storage_service.save_schedules(sample_schedule_data)
+        
+        assert await storage_service.undo_last_change() is None
+        assert storage_service.get_change_history() == []
+
+
+class TestShardedStorage:
+    """Test storage split into core, home, away and override shards."""
+    
+    @pytest.fixture
+    def disk(self):
+        """In-memory stand-in for the .storage directory, keyed by storage key."""
+        return {}
+    
+    @pytest.fixture
+    def store_factory(self, disk):
+        """Create Store mocks that read and write the in-memory disk."""
+        stores = {}
+        
+        def factory(hass, version, key):
+            if key not in stores:
+                store = AsyncMock(spec=Store)
+                store.async_load.side_effect = lambda: json.loads(disk[key]) if key in disk else None
+                store.async_save.side_effect = lambda data: disk.__setitem__(key, json.dumps(data))
+                store.async_remove.side_effect = lambda: disk.pop(key, None)
+                stores[key] = store
+            return stores[key]
+        
+        factory.stores = stores
+        # Shard stores are created per generation, so keep the patch for the whole test
+        with patch('custom_components.roost_scheduler.storage.Store', side_effect=factory):
+            yield factory
+    
+    @pytest.fixture
+    def current_data(self, sample_schedule_data):
+        """Schedule data at the current version with both modes and an override."""
+        sample_schedule_data.version = VERSION
+        sample_schedule_data.schedules["away"] = {"monday": [
+            ScheduleSlot(day="monday", start_time="06:00", end_time="08:00",
+                         target_value=16.0, entity_domain="climate")
+        ]}
+        sample_schedule_data.buffer_config = GlobalBufferConfig(
+            entity_overrides={"climate.living_room": BufferConfig(time_minutes=5, value_delta=1.0)}
+        )
+        return sample_schedule_data
+    
+    def _service(self, mock_hass, store_factory, sharded=True):
+        """Create a storage service on the in-memory disk."""
+        return StorageService(mock_hass, "test_entry", sharded=sharded)
+    
+    @pytest.mark.asyncio
+    async def test_single_blob_is_converted(self, mock_hass, store_factory, disk, current_data):
+        """Test that an existing single-blob store is split into shards on load."""
+        blob_service = self._service(mock_hass, store_factory, sharded=False)
+        await blob_service.save_schedules(current_data)
+        assert list(disk) == ["roost_scheduler_test_entry"]
+        
+        service = self._service(mock_hass, store_factory)
+        result = await service.load_schedules()
+        
+        assert result == current_data
+        core = json.loads(disk["roost_scheduler_test_entry"])
+        assert sorted(core["shards"]) == ["away", "home", "overrides"]
+        assert all(entry["generation"] == 1 for entry in core["shards"].values())
+        assert core["schedules"] == {}
+        assert "entity_overrides" not in core["buffer_config"]
+        assert json.loads(disk["roost_scheduler_test_entry_home_1"])["monday"][0]["start"] == "06:00"
+        assert "climate.living_room" in json.loads(disk["roost_scheduler_test_entry_overrides_1"])
+    
+    @pytest.mark.asyncio
+    async def test_sharded_data_loads_verified(self, mock_hass, store_factory, current_data):
+        """Test that reassembled shards pass the checksum fast path without any writes."""
+        await self._service(mock_hass, store_factory).save_schedules(current_data)
+        for store in store_factory.stores.values():
+            store.async_save.reset_mock()
+        
+        service = self._service(mock_hass, store_factory)
+        with patch.object(service._migration_manager, 'migrate_if_needed') as mock_migrate:
+            result = await service.load_schedules()
+        
+        assert result == current_data
+        mock_migrate.assert_not_called()
+        assert not any(store.async_save.called for store in store_factory.stores.values())
+    
+    @pytest.mark.asyncio
+    async def test_only_dirty_shards_are_written(self, mock_hass, store_factory, disk, current_data):
+        """Test that changing one override writes the overrides shard and the core only."""
+        await self._service(mock_hass, store_factory).save_schedules(current_data)
+        service = self._service(mock_hass, store_factory)
+        data = await service.load_schedules()
+        for store in store_factory.stores.values():
+            store.async_save.reset_mock()
+        
+        data.buffer_config.set_entity_override("climate.living_room", BufferConfig(time_minutes=30, value_delta=1.0))
+        await service.save_schedules(data)
+        
+        written = sorted(key for key, store in store_factory.stores.items() if store.async_save.called)
+        assert written == ["roost_scheduler_test_entry", "roost_scheduler_test_entry_overrides_2"]
+        # The superseded generation is removed once the core points past it
+        assert "roost_scheduler_test_entry_overrides_1" not in disk
+        assert json.loads(disk["roost_scheduler_test_entry"])["shards"]["home"]["generation"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_removed_shard_is_deleted(self, mock_hass, store_factory, disk, current_data):
+        """Test that a shard no longer in the data is dropped from the manifest and disk."""
+        service = self._service(mock_hass, store_factory)
+        await service.save_schedules(current_data)
+        
+        del current_data.schedules["away"]
+        await service.save_schedules(current_data)
+        
+        assert sorted(json.loads(disk["roost_scheduler_test_entry"])["shards"]) == ["home", "overrides"]
+        assert "roost_scheduler_test_entry_away_1" not in disk
+    
+    @pytest.mark.asyncio
+    async def test_disabling_sharding_writes_single_blob(self, mock_hass, store_factory, disk, current_data):
+        """Test that sharded data is still read, and rewritten as one blob, with sharding off."""
+        await self._service(mock_hass, store_factory).save_schedules(current_data)
+        
+        service = self._service(mock_hass, store_factory, sharded=False)
+        data = await service.load_schedules()
+        assert data == current_data
+        await service.save_schedules(data)
+        
+        assert list(disk) == ["roost_scheduler_test_entry"]
+        assert "shards" not in json.loads(disk["roost_scheduler_test_entry"])
+    
+    @pytest.mark.asyncio
+    async def test_missing_shard_triggers_recovery(self, mock_hass, store_factory, disk, current_data):
+        """Test that a shard listed by the core but missing on disk is treated as corruption."""
+        await self._service(mock_hass, store_factory).save_schedules(current_data)
+        del disk["roost_scheduler_test_entry_home_1"]
+        
+        service = self._service(mock_hass, store_factory)
+        with patch.object(service, '_attempt_recovery', AsyncMock(return_value=None)) as mock_recovery:
+            await service.load_schedules()
+        
+        mock_recovery.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_mismatched_shard_triggers_recovery(self, mock_hass, store_factory, disk, current_data):
+        """Test that a shard whose content does not match the manifest is treated as corruption."""
+        await self._service(mock_hass, store_factory).save_schedules(current_data)
+        disk["roost_scheduler_test_entry_home_1"] = json.dumps({"monday": []})
+        
+        service = self._service(mock_hass, store_factory)
+        with patch.object(service, '_attempt_recovery', AsyncMock(return_value=None)) as mock_recovery:
+            await service.load_schedules()
+        
+        mock_recovery.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_interrupted_save_keeps_previous_state(self, mock_hass, store_factory, current_data):
+        """Test that a crash before the core is written loads the old core with the old shards."""
+        await self._service(mock_hass, store_factory).save_schedules(current_data)
+        service = self._service(mock_hass, store_factory)
+        data = await service.load_schedules()
+        
+        data.entities_tracked.append("climate.bedroom")
+        data.schedules["home"]["monday"][0].target_value = 22.0
+        core_store = store_factory.stores["roost_scheduler_test_entry"]
+        core_save = core_store.async_save.side_effect
+        core_store.async_save.side_effect = OSError("disk full")
+        with pytest.raises(StorageError):
+            await service.save_schedules(data)
+        core_store.async_save.side_effect = core_save
+        
+        result = await self._service(mock_hass, store_factory).load_schedules()
+        
+        assert result.entities_tracked == current_data.entities_tracked
+        assert result.schedules == current_data.schedules
+
+
 class TestStorageIntegration:
     """Integration tests for storage service."""
     
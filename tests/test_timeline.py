@@ -0,0 +1,94 @@
+"""Tests for the compiled week timeline."""
+import pytest
+from datetime import datetime
+
+from custom_components.roost_scheduler.models import ScheduleSlot
+from custom_components.roost_scheduler.timeline import (
+    WeekTimeline,
+    MINUTES_PER_DAY,
+    minute_of_week,
+    slot_bounds,
+)
+
+
+def _slot(day, start, end, value=20.0):
+    return ScheduleSlot(
+        day=day,
+        start_time=start,
+        end_time=end,
+        target_value=value,
+        entity_domain="climate"
+    )
+
+
+@pytest.fixture
+def timeline():
+    """Create a timeline with a few slots spread over the week."""
+    return WeekTimeline({
+        "monday": [
+            _slot("monday", "12:00", "18:00", 21.0),
+            _slot("monday", "06:00", "12:00", 19.0),
+        ],
+        "sunday": [_slot("sunday", "20:00", "23:59", 17.0)],
+    })
+
+
+class TestWeekTimeline:
+    """Test cases for WeekTimeline."""
+
+    def test_slot_bounds_end_of_day(self):
+        """Test that 23:59 is treated as the end of the day."""
+        assert slot_bounds(_slot("monday", "20:00", "23:59")) == (1200, MINUTES_PER_DAY)
+        assert slot_bounds(_slot("monday", "08:00", "09:00")) == (480, 540)
+
+    def test_slot_duration(self):
+        """Test that a slot's bounds give its duration in minutes."""
+        start, end = slot_bounds(_slot("monday", "08:00", "18:00"))
+        assert end - start == 600
+
+    def test_lookup_within_single_slot(self):
+        """Test that only minutes inside a slot resolve to it."""
+        slot = _slot("monday", "12:00", "18:00")
+        single = WeekTimeline({"monday": [slot]})
+
+        assert single.slot_at(15 * 60) is slot
+        assert single.slot_at(10 * 60) is None
+
+    def test_minute_of_week(self):
+        """Test minute-of-week calculation."""
+        assert minute_of_week(datetime(2025, 9, 15, 0, 0)) == 0  # Monday
+        assert minute_of_week(datetime(2025, 9, 16, 1, 30)) == MINUTES_PER_DAY + 90  # Tuesday
+
+    def test_lookup_inside_slots(self, timeline):
+        """Test lookups in the middle of slots regardless of input order."""
+        assert timeline.slot_for(datetime(2025, 9, 15, 7, 0)).target_value == 19.0
+        assert timeline.slot_for(datetime(2025, 9, 15, 15, 0)).target_value == 21.0
+
+    def test_lookup_at_boundary_returns_next_slot(self, timeline):
+        """Test that a shared boundary belongs to the slot that starts there."""
+        assert timeline.slot_for(datetime(2025, 9, 15, 12, 0)).target_value == 21.0
+        assert timeline.slot_for(datetime(2025, 9, 15, 11, 59)).target_value == 19.0
+
+    def test_lookup_outside_slots(self, timeline):
+        """Test lookups in gaps and on days without slots."""
+        assert timeline.slot_for(datetime(2025, 9, 15, 5, 59)) is None
+        assert timeline.slot_for(datetime(2025, 9, 15, 18, 0)) is None
+        assert timeline.slot_for(datetime(2025, 9, 17, 10, 0)) is None
+
+    def test_lookup_last_minute_of_week(self, timeline):
+        """Test that a slot ending at 23:59 covers the final minute."""
+        assert timeline.slot_for(datetime(2025, 9, 21, 23, 59)).target_value == 17.0
+
+    def test_empty_timeline(self):
+        """Test an empty timeline."""
+        timeline = WeekTimeline({})
+        assert len(timeline) == 0
+        assert timeline.slot_at(0) is None
+
+    def test_next_start_after(self, timeline):
+        """Test finding the next slot start, wrapping around the week."""
+        assert timeline.next_start_after(0) == 360
+        assert timeline.next_start_after(360) == 720
+        assert timeline.next_start_after(6 * MINUTES_PER_DAY) == 6 * MINUTES_PER_DAY + 1200
+        assert timeline.next_start_after(6 * MINUTES_PER_DAY + 1200) == 360 + 7 * MINUTES_PER_DAY
+        assert WeekTimeline({}).next_start_after(0) is None
@@ -1,4 +1,5 @@
 """Tests for upgrade manager functionality."""
+import asyncio
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -238,6 +239,174 @@ class TestUpgradeManager:
         assert result["current"] == VERSION
 
 
+class TestUpgradeCoordinator:
+    """Test concurrent startup upgrades across config entries."""
+    
+    @staticmethod
+    def _stores(data_by_key):
+        """Return a Store factory backed by per-key AsyncMocks."""
+        stores = {}
+        
+        def factory(hass, version, key):
+            if key not in stores:
+                store = AsyncMock()
+                store.async_load.return_value = data_by_key.get(key)
+                stores[key] = store
+            return stores[key]
+        
+        return factory, stores
+    
+    @pytest.mark.asyncio
+    async def test_upgrade_entries_loads_each_store_once(self, upgrade_manager):
+        """Test that each entry's store is loaded once and old entries are migrated."""
+        factory, stores = self._stores({
+            "roost_scheduler_old": {"version": "0.2.0", "entities_tracked": ["climate.a"]},
+            "roost_scheduler_current": {"version": VERSION, "entities_tracked": ["climate.b"]},
+            "roost_scheduler_upgrades": [],
+        })
+        migrated = {"version": VERSION, "entities_tracked": ["climate.a"]}
+        
+        with patch('custom_components.roost_scheduler.upgrade_manager.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.storage.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.upgrade_manager.MigrationManager') as mock_migration:
+            mock_migration.return_value.migrate_if_needed = AsyncMock(return_value=migrated)
+            
+            results = await upgrade_manager.async_upgrade_entries(
+                ["old", "current"], create_backup=False
+            )
+        
+        assert stores["roost_scheduler_old"].async_load.await_count == 1
+        assert stores["roost_scheduler_current"].async_load.await_count == 1
+        stores["roost_scheduler_old"].async_save.assert_awaited_once_with(migrated)
+        stores["roost_scheduler_current"].async_save.assert_not_called()
+        mock_migration.return_value.validate_migrated_data.assert_not_called()
+        
+        assert results["old"]["success"] is True
+        assert results["old"]["migration_applied"] is True
+        assert results["old"]["validation_passed"] is True
+        assert results["current"]["success"] is True
+        assert results["current"]["migration_applied"] is False
+        
+        # Only the entry that was actually migrated is recorded in the history
+        history = stores["roost_scheduler_upgrades"].async_save.call_args[0][0]
+        assert [record["from_version"] for record in history] == ["0.2.0"]
+    
+    @pytest.mark.asyncio
+    async def test_migrations_run_concurrently(self, upgrade_manager):
+        """Test that entries are migrated in parallel, not one after another."""
+        factory, _ = self._stores({
+            "roost_scheduler_a": {"version": "0.2.0"},
+            "roost_scheduler_b": {"version": "0.2.0"},
+        })
+        running = 0
+        peak = 0
+        
+        async def migrate(data):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return {**data, "version": VERSION}
+        
+        with patch('custom_components.roost_scheduler.upgrade_manager.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.storage.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.upgrade_manager.MigrationManager') as mock_migration:
+            mock_migration.return_value.migrate_if_needed = migrate
+            
+            results = await upgrade_manager.async_upgrade_entries(["a", "b"], create_backup=False)
+        
+        assert peak == 2
+        assert all(result["success"] for result in results.values())
+    
+    @pytest.mark.asyncio
+    async def test_single_backup_for_batch(self, upgrade_manager):
+        """Test that one storage backup covers every entry being migrated."""
+        factory, _ = self._stores({
+            "roost_scheduler_a": {"version": "0.2.0"},
+            "roost_scheduler_b": {"version": "0.2.0"},
+        })
+        
+        with patch('custom_components.roost_scheduler.upgrade_manager.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.storage.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.upgrade_manager.MigrationManager') as mock_migration, \
+             patch('custom_components.roost_scheduler.upgrade_manager.UninstallManager') as mock_uninstall:
+            mock_migration.return_value.migrate_if_needed = AsyncMock(return_value={"version": VERSION})
+            mock_uninstall.return_value._create_final_backup = AsyncMock(return_value=["/config/backup.json"])
+            
+            results = await upgrade_manager.async_upgrade_entries(["a", "b"])
+        
+        mock_uninstall.return_value._create_final_backup.assert_awaited_once()
+        assert results["a"]["backup_locations"] == ["/config/backup.json"]
+        assert results["b"]["backup_created"] is True
+    
+    @pytest.mark.asyncio
+    async def test_readiness_published_per_entry(self, upgrade_manager):
+        """Test that a current entry is ready while another is still migrating."""
+        factory, _ = self._stores({
+            "roost_scheduler_slow": {"version": "0.2.0"},
+            "roost_scheduler_fast": {"version": VERSION},
+        })
+        release = asyncio.Event()
+        
+        async def migrate(data):
+            await release.wait()
+            return {**data, "version": VERSION}
+        
+        upgrade_manager.hass.async_create_task = asyncio.ensure_future
+        
+        with patch('custom_components.roost_scheduler.upgrade_manager.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.storage.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.upgrade_manager.MigrationManager') as mock_migration:
+            mock_migration.return_value.migrate_if_needed = migrate
+            
+            task = upgrade_manager.async_schedule_upgrades(["slow", "fast"], create_backup=False)
+            
+            # Registered before the task has had a chance to run
+            assert not upgrade_manager.is_entry_ready("slow")
+            assert upgrade_manager.is_entry_ready("unknown")
+            
+            fast_result = await upgrade_manager.async_wait_ready("fast")
+            assert fast_result["success"] is True
+            assert not upgrade_manager.is_entry_ready("slow")
+            
+            release.set()
+            slow_result = await upgrade_manager.async_wait_ready("slow")
+            await task
+        
+        assert slow_result["migration_applied"] is True
+        assert await upgrade_manager.async_wait_ready("unknown") is None
+    
+    @pytest.mark.asyncio
+    async def test_failed_migration_still_publishes_ready(self, upgrade_manager):
+        """Test that a failing entry does not leave its waiters blocked."""
+        factory, stores = self._stores({
+            "roost_scheduler_broken": {"version": "0.2.0"},
+            "roost_scheduler_ok": {"version": "0.2.0"},
+        })
+        
+        async def migrate(data):
+            if data.get("broken"):
+                raise ValueError("bad data")
+            return {"version": VERSION}
+        
+        broken_store = factory(None, 1, "roost_scheduler_broken")
+        broken_store.async_load.return_value = {"version": "0.2.0", "broken": True}
+        
+        with patch('custom_components.roost_scheduler.upgrade_manager.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.storage.Store', side_effect=factory), \
+             patch('custom_components.roost_scheduler.upgrade_manager.MigrationManager') as mock_migration:
+            mock_migration.return_value.migrate_if_needed = migrate
+            
+            results = await upgrade_manager.async_upgrade_entries(["broken", "ok"], create_backup=False)
+        
+        assert upgrade_manager.is_entry_ready("broken")
+        assert results["broken"]["success"] is False
+        assert "Migration failed: bad data" in results["broken"]["errors"]
+        assert results["ok"]["success"] is True
+        stores["roost_scheduler_broken"].async_save.assert_not_called()
+
+
 class TestUpgradeIntegration:
     """Test upgrade manager integration with other components."""
     